@@ -0,0 +1,110 @@
+"""
+Compares single-verb template predictions made by concurrent threads with
+and without micro-batching (BatchingPredictor, see config.ml_batch_window_ms):
+  direct:  each thread calls predict on the predictor
+  batched: each thread calls predict on a BatchingPredictor in front of it
+
+Each of the threads predicts its share of the verbs of the language, one at
+a time, as a service handling one request per unknown verb would.
+Reported: throughput (verbs/s), p50 and p99 latency of a call and, for
+batched, the batch sizes and the time verbs waited in the queue.
+
+The trained (and for numpy, exported) models must exist, see train-verb-models.
+
+Usage:
+    python scripts/benchmark_batching.py [--engine numpy|sklearn]
+        [--window-ms MS] [--threads N ...] [--verbs N] [lang]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from verbecc.src.defs.constants import config
+from verbecc.src.mlconjug import evaluation, inference
+from verbecc.src.mlconjug.batching import BatchingPredictor
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+
+def load_predictor(engine: str, lang: str) -> Any:
+    if engine == "numpy":
+        return inference.load_inference_model(lang)
+    from verbecc.src.mlconjug import mlconjug
+
+    return mlconjug.TemplatePredictor([], lang)
+
+
+def run_threads(predictor: Any, verbs: List[str], n_threads: int) -> Dict[str, Any]:
+    seconds: List[float] = []
+    lock = threading.Lock()
+
+    def work(thread_verbs: List[str]) -> None:
+        thread_seconds = []
+        for verb in thread_verbs:
+            t = time.perf_counter()
+            predictor.predict(verb)
+            thread_seconds.append(time.perf_counter() - t)
+        with lock:
+            seconds.extend(thread_seconds)
+
+    threads = [
+        threading.Thread(target=work, args=(verbs[i::n_threads],))
+        for i in range(n_threads)
+    ]
+    t = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - t
+    ret: Dict[str, Any] = {"verbs_per_second": len(verbs) / total}
+    ret.update(evaluation.get_latency_percentiles(seconds, (50, 99)))
+    return ret
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog="benchmark_batching.py")
+    parser.add_argument("lang", nargs="?", default="fr")
+    parser.add_argument("--engine", choices=("numpy", "sklearn"), default="numpy")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--verbs", type=int, default=5000)
+    args = parser.parse_args(argv)
+    config.ml = False
+    config.missing_model = "raise"
+
+    verbs = [v.infinitive for v in VerbsParser(args.lang).parse()][: args.verbs]
+    predictor = load_predictor(args.engine, args.lang)
+    predictor.predict_many(verbs[:10])
+    print(
+        "{:<8}{:<9}{:>10}{:>10}{:>10}{:>12}{:>12}".format(
+            "threads", "mode", "verbs/s", "p50 us", "p99 us", "mean batch", "queue ms"
+        )
+    )
+    for n_threads in args.threads:
+        batching = BatchingPredictor(predictor, args.window_ms)
+        for mode, front_end in (("direct", predictor), ("batched", batching)):
+            r = run_threads(front_end, verbs, n_threads)
+            stats = batching.stats() if mode == "batched" else None
+            print(
+                "{:<8}{:<9}{:>10.0f}{:>10.0f}{:>10.0f}{:>12}{:>12}".format(
+                    n_threads,
+                    mode,
+                    r["verbs_per_second"],
+                    r["p50_us"],
+                    r["p99_us"],
+                    "{:.1f}".format(stats["mean_batch_size"]) if stats else "-",
+                    "{:.2f}".format(stats["mean_queue_ms"]) if stats else "-",
+                ),
+                flush=True,
+            )
+        batching.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,92 @@
+"""
+Benchmarks conjugating the full table (every mood and tense) of known verbs
+for each language, i.e. the cost of Conjugator.conjugate once the verbs and
+templates are loaded.
+
+Reported per language: verbs conjugated per second, mean time per verb and
+mean time per conjugated form, with include_alternates=True so that every
+ending of every template is applied. The conjugation cache is disabled and
+the fastest of --repeat rounds is reported.
+
+Usage:
+    python scripts/benchmark_conjugation.py [--verbs N] [--repeat N] [lang ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from verbecc.src.conjugator.conjugator import Conjugator
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+
+
+def count_forms(conjugation: Any) -> int:
+    if isinstance(conjugation, dict):
+        return sum(count_forms(v) for v in conjugation.values())
+    if isinstance(conjugation, list):
+        return sum(count_forms(v) for v in conjugation)
+    return 1
+
+
+def benchmark_lang(lang: str, n_verbs: int, repeat: int) -> Dict[str, float]:
+    cg = Conjugator(lang)
+    infinitives: List[str] = []
+    n_forms = 0
+    for verb in cg.get_verbs():
+        if len(infinitives) == n_verbs:
+            break
+        try:
+            conjugation = cg.conjugate(verb.infinitive, include_alternates=True)
+        except Exception:
+            continue  # a few it and ro verbs can't be conjugated
+        infinitives.append(verb.infinitive)
+        n_forms += count_forms(conjugation["moods"])
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for infinitive in infinitives:
+            cg.conjugate(infinitive, include_alternates=True)
+        best = min(best, time.perf_counter() - t)
+    return {
+        "verbs": len(infinitives),
+        "verbs_per_second": len(infinitives) / best,
+        "us_per_verb": best / len(infinitives) * 1e6,
+        "us_per_form": best / n_forms * 1e6,
+    }
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog="benchmark_conjugation.py")
+    parser.add_argument("langs", nargs="*", default=list(SUPPORTED_LANGUAGES))
+    parser.add_argument("--verbs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    config.ml = False
+    config.conjugation_cache_size = 0
+
+    print(
+        "{:<6}{:>8}{:>10}{:>10}{:>10}".format(
+            "lang", "verbs", "verbs/s", "us/verb", "us/form"
+        )
+    )
+    for lang in args.langs:
+        r = benchmark_lang(lang, args.verbs, args.repeat)
+        print(
+            "{:<6}{:>8}{:>10.0f}{:>10.1f}{:>10.2f}".format(
+                lang,
+                r["verbs"],
+                r["verbs_per_second"],
+                r["us_per_verb"],
+                r["us_per_form"],
+            ),
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,130 @@
+"""
+Benchmarks loading the verbs and conjugations XML files for each language.
+
+Reports the peak RSS increase and the time of parsing both XML files with:
+  dom:       the previous whole-document parse (etree.parse, then walking the tree)
+  iterparse: the streaming loader used by VerbsParser and ConjugationsParser
+  checksum:  the streaming loader with config.xml_validation="checksum",
+             i.e. no DTD validation for files matching their validated checksum
+Each measurement runs in a fresh subprocess so peaks don't carry over.
+
+Snapshots and ML are disabled so that only the XML parse is measured.
+
+Usage:
+    python scripts/benchmark_loading.py [lang ...]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lxml import etree
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.parsers.conjugation_template_parser import ConjugationTemplateParser
+from verbecc.src.parsers.conjugations_parser import ConjugationsParser
+from verbecc.src.parsers.verb_parser import VerbParser
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+XML_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "verbecc", "data", "xml"
+)
+
+MODES = ("dom", "iterparse", "checksum")
+REPEAT = 5  # the fastest of REPEAT loads is reported
+
+
+def get_peak_rss_kib() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # bytes on macOS, KiB on Linux
+    return peak
+
+
+def load_dom(lang: str) -> List[Any]:
+    """The previous loader: parse the whole document, then walk it"""
+    parser = etree.XMLParser(
+        encoding="utf-8", remove_blank_text=True, remove_comments=True
+    )
+    tree = etree.parse(os.path.join(XML_DIR, "verbs", f"verbs-{lang}.xml"), parser)
+    verbs = [VerbParser().parse(child) for child in tree.getroot() if child.tag == "v"]
+    parser = etree.XMLParser(
+        dtd_validation=True,
+        encoding="utf-8",
+        remove_blank_text=True,
+        remove_comments=True,
+    )
+    tree = etree.parse(
+        os.path.join(XML_DIR, "conjugations", f"conjugations-{lang}.xml"), parser
+    )
+    templates = [
+        ConjugationTemplateParser(lang).parse(child)
+        for child in tree.getroot()
+        if child.tag == "template"
+    ]
+    return [verbs, templates]
+
+
+def load_iterparse(lang: str) -> List[Any]:
+    return [VerbsParser(lang).parse(), ConjugationsParser(lang).parse()]
+
+
+def run_child(mode: str, lang: str) -> None:
+    config.ml = False
+    config.snapshots = False
+    if mode == "checksum":
+        config.xml_validation = "checksum"
+    load = load_dom if mode == "dom" else load_iterparse
+    before = get_peak_rss_kib()
+    elapsed = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        loaded = load(lang)
+        elapsed.append(time.perf_counter() - t)
+        del loaded
+    after = get_peak_rss_kib()
+    print(after - before, round(min(elapsed), 3))
+
+
+def measure(mode: str, lang: str) -> Dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, lang],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return {"peak_kib": int(out[0]), "seconds": float(out[1])}
+
+
+def main(langs: List[str]) -> None:
+    print(
+        "{:<6}{:<12}{:>12}{:>10}{:>10}".format(
+            "lang", "mode", "peak KiB", "seconds", "vs dom"
+        )
+    )
+    for lang in langs:
+        dom = measure("dom", lang)
+        for mode in MODES:
+            result = dom if mode == "dom" else measure(mode, lang)
+            print(
+                "{:<6}{:<12}{:>12}{:>10.3f}{:>10.2f}".format(
+                    lang,
+                    mode,
+                    result["peak_kib"],
+                    result["seconds"],
+                    result["seconds"] / dom["seconds"],
+                )
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:] or list(SUPPORTED_LANGUAGES.keys()))
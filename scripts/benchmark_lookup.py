@@ -0,0 +1,130 @@
+"""
+Benchmarks looking up known verbs and conjugation templates for each language.
+
+Reports the mean time per lookup, over --lookups lookups, of:
+  bisect: the previous lookup, i.e. bisect_left over the sorted infinitives,
+          then over the sorted infinitives without accents, and bisect_left
+          over the sorted template names
+  hash:   Verbs.find_verb_by_infinitive and Conjugations.find_template,
+          i.e. the infinitive, infinitive without accents and template name
+          indexes
+The queries cycle through every known infinitive, each with its accents
+stripped every other time so that both the exact and the accent-folded
+paths are measured. ML is disabled.
+
+Usage:
+    python scripts/benchmark_lookup.py [--lookups N] [lang ...]
+"""
+
+import argparse
+from bisect import bisect_left
+import itertools
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.defs.types.data.verb import Verb
+from verbecc.src.parsers.conjugations_parser import ConjugationsParser
+from verbecc.src.parsers.verbs_parser import VerbsParser
+from verbecc.src.utils.string_utils import strip_accents
+
+
+class BisectVerbs:
+    """The previous Verbs lookup"""
+
+    def __init__(self, verbs: List[Verb]) -> None:
+        self._verbs = verbs
+        self._verbs_no_accents = sorted(verbs, key=lambda v: v.infinitive_no_accents)
+        self.infinitives = [v.infinitive for v in verbs]
+        self.infinitives_no_accents = [
+            v.infinitive_no_accents for v in self._verbs_no_accents
+        ]
+
+    def find_verb_by_infinitive(self, infinitive: str) -> Optional[Verb]:
+        query = infinitive.lower()
+        i = bisect_left(self.infinitives, query)
+        if i != len(self.infinitives) and self.infinitives[i] == query:
+            return self._verbs[i]
+        query = strip_accents(infinitive.lower())
+        i = bisect_left(self.infinitives_no_accents, query)
+        if (
+            i != len(self.infinitives_no_accents)
+            and self.infinitives_no_accents[i] == query
+        ):
+            return self._verbs_no_accents[i]
+        return None
+
+
+def time_lookups(find: Callable[[str], object], queries: List[str], n: int) -> float:
+    """Returns the mean time per lookup in ns"""
+    it = itertools.islice(itertools.cycle(queries), n)
+    t = time.perf_counter()
+    for query in it:
+        find(query)
+    return (time.perf_counter() - t) / n * 1e9
+
+
+def benchmark_lang(lang: str, n: int) -> Dict[str, float]:
+    verbs = VerbsParser(lang).parse()
+    conjugations = ConjugationsParser(lang).parse()
+    bisect_verbs = BisectVerbs(list(verbs))
+    queries = [
+        v.infinitive_no_accents if i % 2 else v.infinitive
+        for i, v in enumerate(verbs)
+    ]
+    for query in queries:
+        assert verbs.find_verb_by_infinitive(
+            query
+        ) is bisect_verbs.find_verb_by_infinitive(query)
+    template_names = conjugations.get_template_names()
+
+    def bisect_find_template(name: str) -> object:
+        i = bisect_left(template_names, name)
+        if i != len(template_names) and template_names[i] == name:
+            return i
+        return None
+
+    return {
+        "verb_bisect": time_lookups(bisect_verbs.find_verb_by_infinitive, queries, n),
+        "verb_hash": time_lookups(verbs.find_verb_by_infinitive, queries, n),
+        "template_bisect": time_lookups(bisect_find_template, template_names, n),
+        "template_hash": time_lookups(conjugations.find_template, template_names, n),
+    }
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog="benchmark_lookup.py")
+    parser.add_argument("langs", nargs="*", default=list(SUPPORTED_LANGUAGES))
+    parser.add_argument("--lookups", type=int, default=1000000)
+    args = parser.parse_args(argv)
+    config.ml = False
+    config.mmap_verbs = False
+    config.lazy_templates = False
+
+    print("ns per lookup, {} lookups".format(args.lookups))
+    print(
+        "{:<6}{:>14}{:>12}{:>18}{:>16}".format(
+            "lang", "verb bisect", "verb hash", "template bisect", "template hash"
+        )
+    )
+    for lang in args.langs:
+        r = benchmark_lang(lang, args.lookups)
+        print(
+            "{:<6}{:>14.0f}{:>12.0f}{:>18.0f}{:>16.0f}".format(
+                lang,
+                r["verb_bisect"],
+                r["verb_hash"],
+                r["template_bisect"],
+                r["template_hash"],
+            ),
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,291 @@
+"""
+Evaluates and benchmarks the template prediction model of each language
+with one engine (see config.ml_engine):
+  numpy:   the exported InferenceModel
+  sklearn: the pickled scikit-learn pipeline (TemplatePredictor)
+
+For each language:
+  held_out: accuracy, top-k accuracy and calibration of pred_score (see
+            evaluation.evaluate) on the test split of the seeded DataSet
+            the saved model was trained with
+  latency:  p50/p90/p99 of single-verb predict over held-out verbs
+  batch:    predict_many throughput over the whole held-out split
+  load:     time and peak RSS increase of loading the model and making a
+            first prediction, in a fresh subprocess
+  k_fold:   the same metrics for models trained on k stratified folds
+            (evaluation.get_k_fold_splits), trained in parallel
+            (--folds 0 skips them, they take as long as train-verb-models
+            each)
+
+The held-out and timing measurements run one at a time, before the k-fold
+training, so that they are not slowed down by each other.
+The results are written to a JSON file (--output) so that model and engine
+variants can be compared, and summarized on stdout.
+
+The trained (and for numpy, exported) models must exist, see train-verb-models.
+
+Usage:
+    python scripts/benchmark_models.py [--engine numpy|sklearn] [--folds K]
+        [--jobs N] [--output FILE] [lang ...]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.defs.types.exceptions import ModelNotFoundError
+from verbecc.src.mlconjug import evaluation, inference
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+ENGINES = ("numpy", "sklearn")
+LATENCY_VERBS = 1000  # held-out verbs predicted one at a time
+BATCH_REPEAT = 3  # the fastest of BATCH_REPEAT predict_many is reported
+
+
+def get_peak_rss_kib() -> int:
+    # ru_maxrss starts at the peak of the parent process on Linux,
+    # the peak of this process is VmHWM
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # bytes on macOS, KiB on Linux
+    return peak
+
+
+def load_predictor(engine: str, lang: str) -> Any:
+    """
+    Loads the saved model of lang for engine. scikit-learn is only imported
+    for the sklearn engine, so that the load measurements include it.
+    """
+    if engine == "numpy":
+        model = inference.load_inference_model(lang)
+        if model is None:
+            raise ModelNotFoundError(
+                f"No exported model for lang={lang}, run train-verb-models"
+            )
+        return model
+    from verbecc.src.mlconjug import mlconjug
+
+    config.missing_model = "raise"
+    return mlconjug.TemplatePredictor([], lang)
+
+
+def get_verb_template_pairs(lang: str) -> List[Tuple[str, str]]:
+    return [(v.infinitive, v.template) for v in VerbsParser(lang).parse()]
+
+
+def run_child(engine: str, lang: str) -> None:
+    before = get_peak_rss_kib()
+    t = time.perf_counter()
+    predictor = load_predictor(engine, lang)
+    predictor.predict("parler")
+    seconds = time.perf_counter() - t
+    after = get_peak_rss_kib()
+    print(json.dumps({"seconds": seconds, "peak_kib": after - before}))
+
+
+def measure_load(engine: str, lang: str) -> Dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", engine, lang],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out)
+
+
+def benchmark_held_out(engine: str, lang: str) -> Dict[str, Any]:
+    from verbecc.src.mlconjug import mlconjug
+
+    predictor = load_predictor(engine, lang)
+    data_set = mlconjug.DataSet(
+        get_verb_template_pairs(lang),
+        seed=predictor.metadata.get("seed", mlconjug.MODEL_SEED),
+    )
+    verbs = data_set.test_input
+    expected = [data_set.templates[label] for label in data_set.test_labels]
+    ret = {
+        "metadata": predictor.metadata,
+        "held_out": evaluation.evaluate(
+            predictor.predict_proba(verbs), predictor.templates, expected
+        ),
+    }
+
+    latency_verbs = verbs[:LATENCY_VERBS]
+    predictor.predict(latency_verbs[0])
+    seconds = []
+    for verb in latency_verbs:
+        t = time.perf_counter()
+        predictor.predict(verb)
+        seconds.append(time.perf_counter() - t)
+    ret["latency"] = evaluation.get_latency_percentiles(seconds)
+
+    best = float("inf")
+    for _ in range(BATCH_REPEAT):
+        t = time.perf_counter()
+        predictor.predict_many(verbs)
+        best = min(best, time.perf_counter() - t)
+    ret["batch"] = {"n": len(verbs), "verbs_per_second": len(verbs) / best}
+    return ret
+
+
+def run_fold(engine: str, lang: str, k: int, fold: int) -> Dict[str, Any]:
+    """Trains a model on all the folds but fold and evaluates it on fold"""
+    from verbecc.src.mlconjug import mlconjug
+
+    train, test = evaluation.get_k_fold_splits(
+        get_verb_template_pairs(lang), k, mlconjug.MODEL_SEED
+    )[fold]
+    templates = sorted(set(t for _, t in train))
+    labels = {t: i for i, t in enumerate(templates)}
+    model = mlconjug.Model(
+        lang=lang, seed=mlconjug.MODEL_SEED, features=config.ml_features
+    )
+    t = time.perf_counter()
+    model.train([v for v, _ in train], [labels[t] for _, t in train])
+    train_seconds = time.perf_counter() - t
+    model.templates = templates
+    predictor: Any = mlconjug.TemplatePredictor.from_model(model)
+    if engine == "numpy":
+        predictor = mlconjug.export_model(model).slim(
+            config.ml_weights_dtype, config.ml_weights_sparse
+        )
+    verbs = [v for v, _ in test]
+    ret = evaluation.evaluate(
+        predictor.predict_proba(verbs), predictor.templates, [t for _, t in test]
+    )
+    ret["train_seconds"] = train_seconds
+    return ret
+
+
+def summarize_folds(folds: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def mean_std(values: List[float]) -> Dict[str, float]:
+        return {"mean": float(np.mean(values)), "std": float(np.std(values))}
+
+    return {
+        "k": len(folds),
+        "accuracy": mean_std([f["accuracy"] for f in folds]),
+        "top_k_accuracy": {
+            k: mean_std([f["top_k_accuracy"][k] for f in folds])
+            for k in folds[0]["top_k_accuracy"]
+        },
+        "ece": mean_std([f["calibration"]["ece"] for f in folds]),
+        "folds": folds,
+    }
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog="benchmark_models.py")
+    parser.add_argument("langs", nargs="*", default=list(SUPPORTED_LANGUAGES.keys()))
+    parser.add_argument("--engine", choices=ENGINES, default=config.ml_engine)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--output", default="benchmark-models.json")
+    args = parser.parse_args(argv)
+    config.ml = False
+
+    results: Dict[str, Any] = {
+        "engine": args.engine,
+        "config": {
+            "ml_features": config.ml_features,
+            "ml_weights_dtype": config.ml_weights_dtype,
+            "ml_weights_sparse": config.ml_weights_sparse,
+            "ml_weights_compress": config.ml_weights_compress,
+        },
+        "platform": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "langs": {},
+    }
+    for lang in args.langs:
+        result = benchmark_held_out(args.engine, lang)
+        result["load"] = measure_load(args.engine, lang)
+        results["langs"][str(lang)] = result
+
+    if args.folds > 1:
+        tasks = [(lang, fold) for lang in args.langs for fold in range(args.folds)]
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = {
+                task: executor.submit(
+                    run_fold, args.engine, task[0], args.folds, task[1]
+                )
+                for task in tasks
+            }
+            for lang in args.langs:
+                results["langs"][str(lang)]["k_fold"] = summarize_folds(
+                    [futures[(lang, fold)].result() for fold in range(args.folds)]
+                )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print_summary(results)
+    print(f"Results written to {args.output}")
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    print(
+        "{:<6}{:>10}{:>8}{:>8}{:>9}{:>9}{:>10}{:>9}{:>9}{:>14}".format(
+            "lang",
+            "accuracy",
+            "top3",
+            "ece",
+            "p50 us",
+            "p99 us",
+            "verbs/s",
+            "load ms",
+            "load MiB",
+            "k-fold acc",
+        )
+    )
+    for lang, r in results["langs"].items():
+        k_fold = r.get("k_fold")
+        print(
+            "{:<6}{:>10.4f}{:>8.4f}{:>8.4f}{:>9.0f}{:>9.0f}{:>10.0f}{:>9.0f}{:>9.1f}{:>14}".format(
+                lang,
+                r["held_out"]["accuracy"],
+                r["held_out"]["top_k_accuracy"]["3"],
+                r["held_out"]["calibration"]["ece"],
+                r["latency"]["p50_us"],
+                r["latency"]["p99_us"],
+                r["batch"]["verbs_per_second"],
+                r["load"]["seconds"] * 1000,
+                r["load"]["peak_kib"] / 1024,
+                (
+                    "{:.4f}±{:.4f}".format(
+                        k_fold["accuracy"]["mean"], k_fold["accuracy"]["std"]
+                    )
+                    if k_fold
+                    else "-"
+                ),
+            )
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,94 @@
+"""
+Compares the two feature vectorizers of the template prediction models:
+  count:   CountVectorizer over the feature strings of extract_verb_features
+  hashing: HashingFeatureVectorizer, the same features hashed into
+           HASH_N_FEATURES columns by hash_verb_features
+
+For each language, both models are trained on the same seeded split and
+compared on: test split accuracy, training time, vectorizing time per verb,
+size of the pickled vectorizer (the CountVectorizer vocabulary grows with the
+data, the hashing vectorizer has no state), number of selected features,
+and whether the exported NumPy model predicts the same templates.
+
+Training both models takes a few minutes per language.
+
+Usage:
+    python scripts/compare_feature_extractors.py [lang ...]
+"""
+
+import os
+import pickle
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.mlconjug import mlconjug
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+FEATURES = ("count", "hashing")
+
+
+def compare(lang: str, features: str) -> Dict[str, Any]:
+    verbs = VerbsParser(lang).parse()
+    pairs = [(v.infinitive, v.template) for v in verbs]
+    data_set = mlconjug.DataSet(list(pairs), seed=mlconjug.MODEL_SEED)
+    t = time.perf_counter()
+    model = mlconjug.train_model(lang, pairs, features=features)
+    train_seconds = time.perf_counter() - t
+
+    vectorizer = model.pipeline.named_steps["vectorizer"]
+    t = time.perf_counter()
+    vectorizer.transform(data_set.verbs)
+    vectorize_us = (time.perf_counter() - t) / len(data_set.verbs) * 1e6
+
+    inference_model = mlconjug.export_model(model)
+    expected = [model.templates[i] for i in model.predict(data_set.test_input)]
+    predicted = [t for t, _ in inference_model.predict_many(data_set.test_input)]
+    return {
+        "accuracy": model.metadata["accuracy"],
+        "train_seconds": train_seconds,
+        "vectorize_us": vectorize_us,
+        "vectorizer_kib": len(pickle.dumps(vectorizer)) / 1024,
+        "selected": len(inference_model.vocabulary),
+        "export_matches": predicted == expected,
+    }
+
+
+def main(langs: List[str]) -> None:
+    config.ml = False
+    print(
+        "{:<6}{:<9}{:>10}{:>10}{:>14}{:>16}{:>10}{:>8}".format(
+            "lang",
+            "features",
+            "accuracy",
+            "train s",
+            "vectorize us",
+            "vectorizer KiB",
+            "selected",
+            "export",
+        )
+    )
+    for lang in langs:
+        for features in FEATURES:
+            r = compare(lang, features)
+            print(
+                "{:<6}{:<9}{:>10.4f}{:>10.1f}{:>14.1f}{:>16.0f}{:>10}{:>8}".format(
+                    lang,
+                    features,
+                    r["accuracy"],
+                    r["train_seconds"],
+                    r["vectorize_us"],
+                    r["vectorizer_kib"],
+                    r["selected"],
+                    "ok" if r["export_matches"] else "DIFF",
+                ),
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(SUPPORTED_LANGUAGES.keys()))
@@ -0,0 +1,123 @@
+"""
+Compares the template predictors of each language (see config.ml_engine):
+  sklearn:     the pickled scikit-learn pipeline (Model, TemplatePredictor)
+  numpy:       the exported InferenceModel
+  suffix_trie: SuffixTriePredictor, no model
+  trie>=N:     SuffixTriePrefilter in front of numpy with min_support N
+               (see config.ml_suffix_trie_min_support)
+
+For a fair comparison the suffix trie is built from the train split of the
+seeded DataSet the saved models were trained with, and all the predictors
+are evaluated on its test split: accuracy, share of the verbs predicted by
+the suffix trie (trie), time to load or build the predictor, p50 latency
+of single-verb predict and predict_many throughput.
+
+The trained and exported models must exist, see train-verb-models.
+
+Usage:
+    python scripts/compare_template_predictors.py [lang ...]
+"""
+
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.mlconjug import evaluation, inference, mlconjug
+from verbecc.src.mlconjug.suffix_trie import SuffixTriePredictor, SuffixTriePrefilter
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+PREFILTER_MIN_SUPPORTS = (2, 5, 10)
+LATENCY_VERBS = 1000
+
+
+def time_load(load: Callable[[], Any]) -> Tuple[Any, float]:
+    t = time.perf_counter()
+    predictor = load()
+    return predictor, time.perf_counter() - t
+
+
+def measure(
+    predictor: Any,
+    verbs: List[str],
+    expected: List[str],
+    load_seconds: Optional[float],
+) -> Dict[str, Any]:
+    predictor.predict(verbs[0])
+    seconds = []
+    for verb in verbs[:LATENCY_VERBS]:
+        t = time.perf_counter()
+        predictor.predict(verb)
+        seconds.append(time.perf_counter() - t)
+    t = time.perf_counter()
+    predicted = [template for template, _ in predictor.predict_many(verbs)]
+    batch_seconds = time.perf_counter() - t
+    return {
+        "accuracy": sum(p == e for p, e in zip(predicted, expected)) / len(verbs),
+        "load_ms": None if load_seconds is None else load_seconds * 1000,
+        "p50_us": evaluation.get_latency_percentiles(seconds, (50,))["p50_us"],
+        "verbs_per_second": len(verbs) / batch_seconds,
+    }
+
+
+def compare(lang: str) -> List[Tuple[str, Dict[str, Any]]]:
+    data_set = mlconjug.DataSet(
+        [(v.infinitive, v.template) for v in VerbsParser(lang).parse()],
+        seed=mlconjug.MODEL_SEED,
+    )
+    verbs = data_set.test_input
+    expected = [data_set.templates[label] for label in data_set.test_labels]
+    train_pairs = [
+        (verb, data_set.templates[label])
+        for verb, label in zip(data_set.train_input, data_set.train_labels)
+    ]
+
+    rows = []
+    sklearn, seconds = time_load(lambda: mlconjug.TemplatePredictor([], lang))
+    rows.append(("sklearn", measure(sklearn, verbs, expected, seconds)))
+    numpy, seconds = time_load(lambda: inference.load_inference_model(lang))
+    rows.append(("numpy", measure(numpy, verbs, expected, seconds)))
+    trie, seconds = time_load(lambda: SuffixTriePredictor(train_pairs, lang))
+    rows.append(("suffix_trie", measure(trie, verbs, expected, seconds)))
+    for min_support in PREFILTER_MIN_SUPPORTS:
+        prefilter = SuffixTriePrefilter(trie, numpy, min_support)
+        row = measure(prefilter, verbs, expected, None)
+        matches = [trie.match(verb) for verb in verbs]
+        row["trie"] = sum(
+            m is not None and m.support >= min_support and m.score == 1.0
+            for m in matches
+        ) / len(verbs)
+        rows.append((f"trie>={min_support}", row))
+    return rows
+
+
+def main(langs: List[str]) -> None:
+    config.ml = False
+    config.missing_model = "raise"
+    print(
+        "{:<6}{:<13}{:>10}{:>7}{:>10}{:>9}{:>10}".format(
+            "lang", "predictor", "accuracy", "trie", "load ms", "p50 us", "verbs/s"
+        )
+    )
+    for lang in langs:
+        for name, r in compare(lang):
+            print(
+                "{:<6}{:<13}{:>10.4f}{:>7}{:>10}{:>9.1f}{:>10.0f}".format(
+                    lang,
+                    name,
+                    r["accuracy"],
+                    "{:.2f}".format(r["trie"]) if "trie" in r else "-",
+                    "-" if r["load_ms"] is None else "{:.1f}".format(r["load_ms"]),
+                    r["p50_us"],
+                    r["verbs_per_second"],
+                ),
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(SUPPORTED_LANGUAGES.keys()))
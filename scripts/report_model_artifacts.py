@@ -0,0 +1,136 @@
+"""
+Compares the stored forms of the template prediction model of each language:
+  pickle:        the trained scikit-learn pipeline, trained_model-{lang}.zip
+  float64 dense: the exported NumPy weights, memory-mapped .npy
+  float64 sparse, float16 sparse, int8 sparse:
+                 only the non-zero exported weights, compressed .npz
+                 (see config.ml_weights_dtype, ml_weights_sparse
+                 and ml_weights_compress)
+
+For each form: size on disk, time to load the model and make a first
+prediction, accuracy on the test split of the seeded DataSet and agreement
+with the pickled pipeline's predictions on all the verbs.
+
+The trained models must exist, see train-verb-models.
+
+Usage:
+    python scripts/report_model_artifacts.py [lang ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.defs.types.exceptions import ModelNotFoundError
+from verbecc.src.mlconjug import inference, mlconjug
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+# (name, dtype, sparse, compress)
+VARIANTS = [
+    ("float64 dense", "float64", False, False),
+    ("float64 sparse", "float64", True, True),
+    ("float16 sparse", "float16", True, True),
+    ("int8 sparse", "int8", True, True),
+]
+
+
+def get_dir_size(directory: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+    )
+
+
+def time_first_prediction(
+    load: Callable[[], Any], predict: Callable[[Any, List[str]], Any]
+) -> Tuple[Any, float]:
+    t = time.perf_counter()
+    model = load()
+    predict(model, ["parler"])
+    return model, time.perf_counter() - t
+
+
+def report(lang: str) -> List[Dict[str, Any]]:
+    verbs = VerbsParser(lang).parse()
+    pairs = [(v.infinitive, v.template) for v in verbs]
+    data_set = mlconjug.DataSet(list(pairs), seed=mlconjug.MODEL_SEED)
+    all_verbs = [v for v, _ in pairs]
+
+    zip_path = inference.find_model_file(mlconjug.get_model_zip_filename(lang))
+    if zip_path is None:
+        raise ModelNotFoundError(f"No trained model for lang={lang}")
+    pickle_size = os.path.getsize(zip_path)
+    model, load_seconds = time_first_prediction(
+        lambda: mlconjug.load_model(lang), lambda m, verbs: m.predict(verbs)
+    )
+    expected = [model.templates[i] for i in model.predict(all_verbs)]
+    test_expected = [model.templates[i] for i in model.predict(data_set.test_input)]
+    test_answers = [data_set.templates[i] for i in data_set.test_labels]
+    rows = [
+        {
+            "form": "pickle",
+            "kib": pickle_size / 1024,
+            "load_ms": load_seconds * 1000,
+            "accuracy": get_accuracy(test_expected, test_answers),
+            "agreement": 1.0,
+        }
+    ]
+
+    exported = mlconjug.export_model(model)
+    for name, dtype, sparse, compress in VARIANTS:
+        with tempfile.TemporaryDirectory() as directory:
+            inference.write_inference_model(
+                directory, exported.slim(dtype, sparse), compress
+            )
+            size = get_dir_size(directory)
+            slim, load_seconds = time_first_prediction(
+                lambda: inference.read_inference_model(directory, lang),
+                lambda m, verbs: m.predict_many(verbs),
+            )
+            predicted = [t for t, _ in slim.predict_many(all_verbs)]
+            test_predicted = [t for t, _ in slim.predict_many(data_set.test_input)]
+        rows.append(
+            {
+                "form": name,
+                "kib": size / 1024,
+                "load_ms": load_seconds * 1000,
+                "accuracy": get_accuracy(test_predicted, test_answers),
+                "agreement": get_accuracy(predicted, expected),
+            }
+        )
+    return rows
+
+
+def get_accuracy(predicted: List[str], expected: List[str]) -> float:
+    return sum(p == e for p, e in zip(predicted, expected)) / max(len(expected), 1)
+
+
+def main(langs: List[str]) -> None:
+    config.ml = False
+    print(
+        "{:<6}{:<16}{:>10}{:>10}{:>10}{:>11}".format(
+            "lang", "form", "KiB", "load ms", "accuracy", "agreement"
+        )
+    )
+    for lang in langs:
+        for r in report(lang):
+            print(
+                "{:<6}{:<16}{:>10.0f}{:>10.1f}{:>10.4f}{:>11.4f}".format(
+                    lang,
+                    r["form"],
+                    r["kib"],
+                    r["load_ms"],
+                    r["accuracy"],
+                    r["agreement"],
+                ),
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(SUPPORTED_LANGUAGES.keys()))
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from verbecc.src.defs.constants import config
+from verbecc.src.mlconjug.batching import BatchingPredictor
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+
+class FakeTemplatePredictor:
+    metadata = {"lang": "fr"}
+    templates = ["aim:er", "fin:ir"]
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+
+    def predict_many(self, verbs):
+        if "boom" in verbs:
+            raise ValueError("boom")
+        self.batches.append(list(verbs))
+        time.sleep(self.delay)
+        return [("fin:ir" if v.endswith("ir") else "aim:er", 0.5) for v in verbs]
+
+    def predict_topk_many(self, verbs, k):
+        return [[("aim:er", 0.5)] for _ in verbs]
+
+
+def test_batching_predictor_concurrent():
+    predictor = FakeTemplatePredictor(delay=0.01)
+    batching = BatchingPredictor(predictor, window_ms=20, max_batch_size=8)
+    verbs = [f"verb{i}ir" if i % 2 else f"verb{i}er" for i in range(20)]
+    results = {}
+    barrier = threading.Barrier(len(verbs))
+
+    def work(verb):
+        barrier.wait()
+        results[verb] = batching.predict(verb)
+
+    threads = [threading.Thread(target=work, args=(verb,)) for verb in verbs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batching.close()
+    assert results == {
+        v: ("fin:ir" if v.endswith("ir") else "aim:er", 0.5) for v in verbs
+    }
+    assert sorted(v for batch in predictor.batches for v in batch) == sorted(verbs)
+    stats = batching.stats()
+    assert stats["predictions"] == len(verbs)
+    assert stats["batches"] == len(predictor.batches)
+    assert stats["batches"] < len(verbs)
+    assert stats["max_batch_size"] <= 8
+    assert stats["mean_batch_size"] == len(verbs) / stats["batches"]
+    assert 0 < stats["mean_queue_ms"] <= stats["max_queue_ms"]
+
+
+def test_batching_predictor_predict_many():
+    predictor = FakeTemplatePredictor()
+    batching = BatchingPredictor(predictor, window_ms=1, max_batch_size=4)
+    assert batching.predict_many(["parler", "finir"]) == [
+        ("aim:er", 0.5),
+        ("fin:ir", 0.5),
+    ]
+    assert predictor.batches == [["parler", "finir"]]
+    # Large batches are predicted in the calling thread
+    assert len(batching.predict_many(["parler"] * 4)) == 4
+    assert batching.stats()["predictions"] == 2
+    assert batching.predict_topk_many(["parler"], 1) == [[("aim:er", 0.5)]]
+    assert batching.templates == predictor.templates
+    batching.close()
+
+
+def test_batching_predictor_async():
+    batching = BatchingPredictor(FakeTemplatePredictor(), window_ms=5)
+
+    async def predict_all():
+        return await asyncio.gather(
+            batching.predict_async("parler"), batching.predict_async("finir")
+        )
+
+    assert asyncio.run(predict_all()) == [("aim:er", 0.5), ("fin:ir", 0.5)]
+    assert batching.stats()["batches"] == 1
+    batching.close()
+
+
+def test_batching_predictor_errors():
+    with pytest.raises(ValueError):
+        BatchingPredictor(FakeTemplatePredictor(), max_batch_size=0)
+    batching = BatchingPredictor(FakeTemplatePredictor(), window_ms=5)
+    futures = [batching.submit("boom"), batching.submit("parler")]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+    assert batching.predict("parler") == ("aim:er", 0.5)
+    batching.close()
+    with pytest.raises(RuntimeError):
+        batching.predict("parler")
+
+
+def test_find_verb_batching(monkeypatch):
+    monkeypatch.setattr(config, "ml", True)
+    monkeypatch.setattr(config, "ml_batch_window_ms", 1.0)
+    monkeypatch.setattr(config, "prediction_cache_size", 0)
+    verbs = VerbsParser("fr").parse()
+    verb = verbs.find_verb_by_infinitive("ubériser")
+    assert verb.predicted and verb.template == "aim:er"
+    assert isinstance(verbs.template_predictor, BatchingPredictor)
+    assert verbs.template_predictor.stats()["predictions"] == 1
+    verbs.close()
+    assert not isinstance(verbs.template_predictor, BatchingPredictor)
+    assert verbs.find_verb_by_infinitive("googler").predicted
@@ -0,0 +1,57 @@
+import pytest
+
+from verbecc.src.utils.bounded_cache import BoundedCache
+
+
+def test_bounded_cache_lru():
+    cache = BoundedCache(2, "lru")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.items() == [("c", 3), ("a", 1)]
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "size": 2,
+        "maxsize": 2,
+    }
+
+
+def test_bounded_cache_fifo():
+    cache = BoundedCache(2, "fifo")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "a" not in cache
+    assert cache.items() == [("b", 2), ("c", 3)]
+
+
+def test_bounded_cache_put_existing():
+    cache = BoundedCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 3)
+    cache.put("c", 4)
+    assert cache.items() == [("a", 3), ("c", 4)]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_bounded_cache_clear():
+    cache = BoundedCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 0
+
+
+@pytest.mark.parametrize("maxsize,policy", [(0, "lru"), (1, "random")])
+def test_bounded_cache_invalid(maxsize, policy):
+    with pytest.raises(ValueError):
+        BoundedCache(maxsize, policy)
@@ -0,0 +1,126 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from verbecc import Conjugator
+from verbecc.src.conjugator import conjugation_cache
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.alternates_behavior import AlternatesBehavior
+from verbecc.src.defs.types.gender import Gender
+from verbecc.src.defs.types.lang.es.lang_specific_options_es import (
+    LangSpecificOptionsEs,
+)
+from verbecc.src.defs.types.lang.es.voseo_options import VoseoOptions
+from verbecc.src.defs.types.lang_specific_options import get_options_key
+from verbecc.src.utils.bounded_cache import BoundedCache
+
+
+@pytest.fixture
+def cache_config(monkeypatch):
+    monkeypatch.setattr(config, "conjugation_cache_size", 2)
+    monkeypatch.setattr(conjugation_cache, "_shared_cache", None)
+
+
+def test_conjugation_cache_hits_misses_evictions(cache_config):
+    cg = Conjugator("fr")
+    expected = Conjugator("fr", conjugation_cache=BoundedCache(1)).conjugate("être")
+    assert cg.conjugate("être") == expected
+    assert cg.conjugate("Être") is cg.conjugate("être")
+    cg.conjugate("être", gender=Gender.f)
+    cg.conjugate("avoir")
+    assert cg.conjugation_cache.stats() == {
+        "hits": 2,
+        "misses": 3,
+        "evictions": 1,
+        "size": 2,
+        "maxsize": 2,
+    }
+
+
+def test_conjugation_cache_frozen(cache_config):
+    cg = Conjugator("fr")
+    conjugation = cg.conjugate("manger")
+    present = conjugation["moods"]["indicatif"]["présent"]
+    with pytest.raises(TypeError):
+        conjugation["verb"]["infinitive"] = "boire"
+    with pytest.raises(TypeError):
+        present.append("nous mangeons")
+    with pytest.raises(TypeError):
+        present[0] = "je bois"
+    assert json.loads(json.dumps(conjugation)) == conjugation
+    mutable = copy.deepcopy(conjugation)
+    mutable["moods"]["indicatif"]["présent"][0] = "je bois"
+    assert type(mutable["moods"]) is dict
+    assert type(pickle.loads(pickle.dumps(present))) is list
+    assert cg.conjugate("manger")["moods"]["indicatif"]["présent"][0] == "je mange"
+
+
+def test_conjugation_cache_scope(cache_config, monkeypatch):
+    assert Conjugator("fr").conjugation_cache is Conjugator("es").conjugation_cache
+    monkeypatch.setattr(config, "conjugation_cache_scope", "instance")
+    cg1 = Conjugator("fr")
+    cg2 = Conjugator("fr")
+    assert cg1.conjugation_cache is not cg2.conjugation_cache
+    cg1.conjugate("être")
+    assert cg2.conjugation_cache.stats()["size"] == 0
+    monkeypatch.setattr(config, "conjugation_cache_size", 0)
+    assert Conjugator("fr").conjugation_cache is None
+
+
+def test_conjugation_cache_mood_tense(cache_config):
+    uncached = Conjugator("fr", conjugation_cache=BoundedCache(1))
+    uncached.conjugation_cache = None
+    cg = Conjugator("fr")
+    subjonctif = cg.conjugate_mood("aller", "subjonctif")
+    assert subjonctif == uncached.conjugate_mood("aller", "subjonctif")
+    assert cg.conjugate_mood("aller", "subjonctif") is subjonctif
+    passe = cg.conjugate_mood_tense("aller", "indicatif", "passé-composé")
+    assert passe == uncached.conjugate_mood_tense("aller", "indicatif", "passé-composé")
+    assert cg.conjugation_cache.stats()["misses"] == 2
+    # Served from the cached conjugate result
+    conjugation = cg.conjugate("aller")
+    assert cg.conjugate_mood("aller", "indicatif") is conjugation["moods"]["indicatif"]
+    assert (
+        cg.conjugate_mood_tense(
+            "aller", "subjonctif", "présent", AlternatesBehavior.FirstOnly
+        )
+        is conjugation["moods"]["subjonctif"]["présent"]
+    )
+    assert cg.conjugation_cache.stats()["misses"] == 3
+
+
+def test_conjugation_cache_lang_specific_options(cache_config):
+    cg = Conjugator("es")
+    voseo = LangSpecificOptionsEs(VoseoOptions.VoseoTipo3)
+    assert get_options_key(voseo) == get_options_key(
+        LangSpecificOptionsEs(VoseoOptions.VoseoTipo3)
+    )
+    assert get_options_key(voseo) != get_options_key(LangSpecificOptionsEs())
+    with_voseo = cg.conjugate("ser", lang_specific_options=voseo)
+    assert cg.conjugate("ser") != with_voseo
+    assert (
+        cg.conjugate(
+            "ser",
+            lang_specific_options=LangSpecificOptionsEs(VoseoOptions.VoseoTipo3),
+        )
+        is with_voseo
+    )
+
+
+def test_conjugation_cache_lang_specific_options_modified(cache_config):
+    cg = Conjugator("es")
+    options = LangSpecificOptionsEs(VoseoOptions.VoseoTipo3)
+    with_voseo = cg.conjugate("ser", lang_specific_options=options)
+    without_voseo = cg.conjugate("ser", lang_specific_options=LangSpecificOptionsEs())
+    options._voseo_options = VoseoOptions.NoVoseo
+    assert cg.conjugate("ser", lang_specific_options=options) is without_voseo
+    # the cached result is keyed by the option values it was conjugated with
+    assert (
+        cg.conjugate(
+            "ser",
+            lang_specific_options=LangSpecificOptionsEs(VoseoOptions.VoseoTipo3),
+        )
+        is with_voseo
+    )
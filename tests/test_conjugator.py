@@ -6,6 +6,11 @@ from verbecc.src.defs.types.exceptions import (
     TemplateNotFoundError,
 )
 from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.lang.es.lang_specific_options_es import (
+    LangSpecificOptionsEs,
+)
+from verbecc.src.defs.types.lang.es.voseo_options import VoseoOptions
+from verbecc.src.inflectors.inflector_registry import InflectorRegistry
 
 
 @pytest.fixture(scope="module")
@@ -740,3 +745,57 @@ def test_conjugator_get_verbs_that_start_with(cg, query, expected_resp):
     assert set(cg.get_verbs_that_start_with(query, max_results=10)) == set(
         expected_resp
     )
+
+
+def test_conjugator_aux_conjugations_memoized():
+    cg = Conjugator(lang="ro")
+    expected = ["eu să fi făcut", "tu să fi făcut", "el să fi făcut"]
+    assert cg.conjugate_mood_tense("face", "conjunctiv", "perfect")[:3] == expected
+    aux_conjugations = cg._inflector.aux_conjugations
+    assert len(aux_conjugations) > 0
+    size = len(aux_conjugations)
+    # The table is shared and isn't modified by the tenses rewriting aux_conj
+    assert (
+        Conjugator(lang="ro").conjugate_mood_tense("face", "conjunctiv", "perfect")[:3]
+        == expected
+    )
+    assert len(aux_conjugations) == size
+    assert cg.conjugate_mood_tense("lua", "conjunctiv", "perfect")[0] == (
+        "eu să fi luat"
+    )
+    assert len(aux_conjugations) == size
+
+
+def test_conjugator_aux_conjugations_options_modified():
+    cg = Conjugator(lang="es")
+    options = LangSpecificOptionsEs(VoseoOptions.VoseoTipo3)
+    mood, tense = "indicativo", "pretérito-perfecto-compuesto"
+    conj = cg.conjugate_mood_tense("hablar", mood, tense, lang_specific_options=options)
+    assert conj[1] == "vos has hablado"
+    aux_conjugations = cg._inflector.aux_conjugations
+    options._voseo_options = VoseoOptions.NoVoseo
+    conj = cg.conjugate_mood_tense("hablar", mood, tense, lang_specific_options=options)
+    assert conj[1] == "tú has hablado"
+    # the memoized entry is keyed by the option values it was conjugated with
+    size = len(aux_conjugations)
+    conj = cg.conjugate_mood_tense(
+        "hablar",
+        mood,
+        tense,
+        lang_specific_options=LangSpecificOptionsEs(VoseoOptions.VoseoTipo3),
+    )
+    assert conj[1] == "vos has hablado"
+    assert len(aux_conjugations) == size
+
+
+def test_conjugator_aux_conjugations_disabled(monkeypatch):
+    monkeypatch.setattr(config, "aux_conjugation_cache_size", 0)
+    InflectorRegistry.release("fr")
+    try:
+        cg = Conjugator(lang="fr")
+        assert cg._inflector.aux_conjugations is None
+        assert cg.conjugate_mood_tense("manger", "indicatif", "passé-composé")[0] == (
+            "j'ai mangé"
+        )
+    finally:
+        InflectorRegistry.release("fr")
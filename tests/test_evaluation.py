@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from verbecc.src.mlconjug import evaluation
+
+
+def test_evaluate():
+    proba = np.array(
+        [
+            [0.7, 0.2, 0.1],  # aim:er, correct
+            [0.5, 0.4, 0.1],  # aim:er, expected fin:ir (2nd)
+            [0.6, 0.1, 0.3],  # aim:er, expected ven:dre (2nd)
+            [0.9, 0.05, 0.05],  # aim:er, expected a template the model doesn't know
+        ]
+    )
+    result = evaluation.evaluate(
+        proba,
+        ["aim:er", "fin:ir", "ven:dre"],
+        ["aim:er", "fin:ir", "ven:dre", "all:er"],
+        top_k=(1, 2, 5),
+    )
+    assert result["n"] == 4
+    assert result["accuracy"] == 0.25
+    assert result["top_k_accuracy"] == {"1": 0.25, "2": 0.75, "5": 0.75}
+    bins = result["calibration"]["bins"]
+    assert [(b["min_score"], b["count"]) for b in bins] == [
+        (0.5, 1),
+        (0.6, 1),
+        (0.7, 1),
+        (0.9, 1),
+    ]
+
+
+def test_get_calibration():
+    scores = np.array([0.95, 0.95, 0.45, 0.45, 1.0])
+    correct = np.array([True, True, True, False, False])
+    calibration = evaluation.get_calibration(scores, correct, n_bins=2)
+    assert [b["count"] for b in calibration["bins"]] == [2, 3]
+    assert calibration["bins"][1]["accuracy"] == pytest.approx(2 / 3)
+    assert calibration["bins"][1]["mean_score"] == pytest.approx(2.9 / 3)
+    assert calibration["ece"] == pytest.approx(
+        2 / 5 * abs(0.5 - 0.45) + 3 / 5 * abs(2 / 3 - 2.9 / 3)
+    )
+
+
+def test_get_latency_percentiles():
+    percentiles = evaluation.get_latency_percentiles(
+        [i * 1e-6 for i in range(101)], (50, 99)
+    )
+    assert percentiles == {
+        "p50_us": pytest.approx(50),
+        "p99_us": pytest.approx(99),
+    }
+
+
+def test_get_k_fold_splits():
+    pairs = [(f"v{i}", "aim:er") for i in range(10)]
+    pairs += [(f"w{i}", "fin:ir") for i in range(5)] + [("x", "ven:dre")]
+    splits = evaluation.get_k_fold_splits(list(pairs), 5, seed=1)
+    assert splits == evaluation.get_k_fold_splits(list(pairs), 5, seed=1)
+    assert len(splits) == 5
+    assert sorted(p for _, test in splits for p in test) == sorted(pairs)
+    for train, test in splits:
+        assert sorted(train + test) == sorted(pairs)
+        assert [t for _, t in test].count("aim:er") == 2
+        assert [t for _, t in test].count("fin:ir") == 1
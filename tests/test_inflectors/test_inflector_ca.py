@@ -3302,3 +3302,15 @@ def test_inflector_conjugate_with_alternates_noconjpronouns(cg):
             },
         },
     }
+
+
+def test_inflector_ca_bind_verb(cg):
+    verb = cg._inflector.find_verb_by_infinitive("pertànyer")
+    assert cg._inflector.bind_verb(verb) is verb
+    assert verb.conjugation_template is cg.find_template(verb.template)
+    assert verb.verb_stem == "pertàny"
+    assert verb.inflected_verb_stem == "pertany"
+    co = cg._get_conj_obs("pertànyer")
+    assert co.verb is verb
+    assert co.template is verb.conjugation_template
+    assert co.inflected_verb_stem == "pertany"
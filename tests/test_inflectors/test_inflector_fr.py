@@ -317,3 +317,24 @@ def test_inflector_fr_conjugate_compound_parler_indicative_passé_composé(cg):
         ["vous avez parlé"],
         ["ils ont parlé"],
     ]
+
+
+@pytest.mark.parametrize(
+    "infinitive,verb_stem,impersonal,can_be_reflexive",
+    [
+        ("pleuvoir", "pl", True, False),
+        ("être", "", False, False),
+        ("lever", "l", False, True),
+    ],
+)
+def test_inflector_fr_bind_verb(
+    cg, infinitive, verb_stem, impersonal, can_be_reflexive
+):
+    verb = cg._inflector.bind_verb(cg._inflector.find_verb_by_infinitive(infinitive))
+    template = verb.conjugation_template
+    assert template is cg.find_template(verb.template)
+    assert verb.verb_stem == verb.inflected_verb_stem == verb_stem
+    assert verb.impersonal == impersonal
+    assert verb.can_be_reflexive == can_be_reflexive
+    # bound once
+    assert cg._inflector.bind_verb(verb).conjugation_template is template
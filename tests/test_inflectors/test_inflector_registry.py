@@ -0,0 +1,101 @@
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+
+from verbecc.src.conjugator.conjugator import Conjugator
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.exceptions import InvalidLangError
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
+from verbecc.src.inflectors.inflector_factory import InflectorFactory
+from verbecc.src.inflectors.inflector_registry import InflectorRegistry
+from verbecc.src.mlconjug.batching import BatchingPredictor
+
+
+class FakeInflector:
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def made_inflectors(monkeypatch):
+    """Isolates the registry and replaces inflector construction with a slow fake"""
+    monkeypatch.setattr(InflectorRegistry, "_inflectors", {})
+    made = []
+
+    def make_inflector(lang: Lang) -> object:
+        if lang not in ("fr", "es"):
+            raise InvalidLangError
+        time.sleep(0.05)
+        inflector = FakeInflector()
+        made.append((lang, inflector))
+        return inflector
+
+    monkeypatch.setattr(InflectorFactory, "make_inflector", make_inflector)
+    yield made
+
+
+def test_get_inflector_is_shared(made_inflectors):
+    inflector = InflectorRegistry.get_inflector(Lang.fr)
+    assert InflectorRegistry.get_inflector(Lang.fr) is inflector
+    assert InflectorRegistry.get_inflector(Lang.es) is not inflector
+    assert len(made_inflectors) == 2
+
+
+def test_get_inflector_concurrent(made_inflectors):
+    results = []
+
+    def get() -> None:
+        results.append(InflectorRegistry.get_inflector(Lang.fr))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(made_inflectors) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_preload_and_release(made_inflectors):
+    InflectorRegistry.preload([Lang.fr, Lang.es])
+    assert InflectorRegistry.is_loaded(Lang.fr)
+    assert InflectorRegistry.is_loaded(Lang.es)
+    InflectorRegistry.release(Lang.fr)
+    assert not InflectorRegistry.is_loaded(Lang.fr)
+    assert made_inflectors[0][1].closed
+    assert not made_inflectors[1][1].closed
+    InflectorRegistry.get_inflector(Lang.fr)
+    assert [lang for lang, _ in made_inflectors] == ["fr", "es", "fr"]
+
+
+def test_get_inflector_invalid_lang(made_inflectors):
+    with pytest.raises(InvalidLangError):
+        InflectorRegistry.get_inflector("xx")
+    assert not InflectorRegistry.is_loaded("xx")
+
+
+def test_conjugators_share_inflector():
+    assert Conjugator(Lang.fr)._inflector is Conjugator(Lang.fr)._inflector
+
+
+def test_release_batching_inflector_collected(monkeypatch):
+    monkeypatch.setattr(InflectorRegistry, "_inflectors", {})
+    monkeypatch.setattr(config, "ml", True)
+    monkeypatch.setattr(config, "ml_batch_window_ms", 1.0)
+    monkeypatch.setattr(config, "prediction_cache_size", 0)
+    cg = Conjugator(Lang.fr)
+    assert cg.conjugate("ubériser")["verb"]["predicted"]
+    batching = cg._inflector._verbs.template_predictor
+    assert isinstance(batching, BatchingPredictor)
+    inflector = weakref.ref(cg._inflector)
+    predictor = weakref.ref(batching.predictor)
+    del cg, batching
+    InflectorRegistry.release(Lang.fr)
+    gc.collect()
+    assert inflector() is None
+    assert predictor() is None
@@ -1,8 +1,26 @@
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
 import pytest
 
-from verbecc.src.mlconjug import mlconjug
+from verbecc.src.mlconjug import features, inference, mlconjug, prediction_cache
 from verbecc.src.inflectors.lang.inflector_fr import InflectorFr
 from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.defs.types.exceptions import ModelNotFoundError, VerbNotFoundError
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+
+def get_exported_metadata(inference_model):
+    """The metadata of the trained model inference_model was exported from"""
+    metadata = dict(inference_model.metadata)
+    del metadata["export"]
+    return metadata
 
 
 @pytest.fixture(scope="module")
@@ -70,3 +88,626 @@ def test_mlconjug_template_predictor(verb_template_pairs):
         template, prediction_score = predictor.predict("parler")
         assert template == "aim:er"
         assert prediction_score > 0.97
+
+
+def test_DataSet_seed(verb_template_pairs):
+    data_set_1 = mlconjug.DataSet(list(verb_template_pairs), seed=1)
+    data_set_2 = mlconjug.DataSet(list(verb_template_pairs), seed=1)
+    assert data_set_1.train_input == data_set_2.train_input
+    assert data_set_1.test_input == data_set_2.test_input
+
+
+def test_load_model_metadata(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path / "package")
+    monkeypatch.setattr(config, "model_dir", str(tmp_path / "models"))
+    assert mlconjug.load_model_metadata("fr") is None
+    model = mlconjug.train_model("fr", UPDATE_PAIRS)
+    mlconjug.save_model(model)
+    metadata = mlconjug.load_model_metadata("fr")
+    assert metadata == model.metadata
+    assert metadata["format_version"] == mlconjug.MODEL_FORMAT_VERSION
+    assert metadata["seed"] == mlconjug.MODEL_SEED
+    assert metadata["accuracy"] > 0.9
+
+
+def test_train_model():
+    pairs = [("parler", "aim:er"), ("aimer", "aim:er"), ("finir", "fin:ir")] * 4
+    model = mlconjug.train_model("fr", pairs, seed=1)
+    assert model.templates == ["aim:er", "fin:ir"]
+    assert model.metadata["n_templates"] == 2
+    assert model.metadata["seed"] == 1
+
+
+def test_template_predictor_from_model():
+    pairs = [("parler", "aim:er"), ("aimer", "aim:er"), ("finir", "fin:ir")] * 4
+    model = mlconjug.train_model("fr", pairs, seed=1)
+    predictor = mlconjug.TemplatePredictor.from_model(model)
+    assert predictor.templates == ["aim:er", "fin:ir"]
+    proba = predictor.predict_proba(["parler", "finir"])
+    assert proba.shape == (2, 2)
+    assert predictor.predict_many(["parler", "finir"]) == [
+        ("aim:er", float(proba[0, 0])),
+        ("fin:ir", float(proba[1, 1])),
+    ]
+
+
+def test_predict_topk():
+    pairs = [("parler", "aim:er"), ("finir", "fin:ir"), ("vendre", "ven:dre")] * 4
+    predictor = mlconjug.TemplatePredictor.from_model(
+        mlconjug.train_model("fr", pairs, seed=1)
+    )
+    top_k = predictor.predict_topk("parler", 2)
+    assert len(top_k) == 2
+    assert top_k[0] == predictor.predict("parler")
+    assert top_k[0][1] >= top_k[1][1]
+    assert predictor.predict_topk_many(["parler", "finir"], 5) == [
+        predictor.predict_topk("parler", 5),
+        predictor.predict_topk("finir", 5),
+    ]
+    assert len(predictor.predict_topk("finir", 5)) == 3
+    assert predictor.predict_topk_many([], 2) == []
+    inference_model = mlconjug.export_model(predictor.model)
+    for (template, score), (expected_template, expected_score) in zip(
+        inference_model.predict_topk("parler", 3), predictor.predict_topk("parler", 3)
+    ):
+        assert template == expected_template
+        assert score == pytest.approx(expected_score, abs=1e-12)
+
+
+def test_get_top_k():
+    proba = np.array([[0.2, 0.5, 0.2, 0.1], [0.3, 0.3, 0.3, 0.1]])
+    templates = ["a:a", "b:b", "c:c", "d:d"]
+    assert inference.get_top_k(proba, templates, 3) == [
+        [("b:b", 0.5), ("a:a", 0.2), ("c:c", 0.2)],
+        [("a:a", 0.3), ("b:b", 0.3), ("c:c", 0.3)],
+    ]
+    assert inference.get_top_k(proba, templates, 0) == [[], []]
+
+
+class FakeTemplatePredictor:
+    metadata = {}
+
+    def predict_many(self, verbs):
+        return [("ven:dre", 0.6) for _ in verbs]
+
+    def predict_topk_many(self, verbs, k):
+        top_k = [("ven:dre", 0.6), ("fin:ir", 0.2), ("aim:er", 0.1)]
+        return [top_k[:k] for _ in verbs]
+
+
+@pytest.mark.parametrize(
+    "top_k,min_score,expected",
+    [
+        (10, 0.001, ("aim:er", 0.1)),
+        (2, 0.001, ("ven:dre", 0.6)),
+        (10, 0.5, ("ven:dre", 0.6)),
+        (1, 0.001, ("ven:dre", 0.6)),
+    ],
+)
+def test_find_verbs_template_filter(monkeypatch, top_k, min_score, expected):
+    monkeypatch.setattr(config, "ml", True)
+    monkeypatch.setattr(config, "prediction_cache_size", 0)
+    monkeypatch.setattr(config, "ml_top_k", top_k)
+    monkeypatch.setattr(config, "ml_fallback_min_score", min_score)
+    verbs = VerbsParser("fr").parse()
+    verbs._template_predictor = FakeTemplatePredictor()
+    inflector = InflectorFr()
+    inflector._verbs = verbs
+    verb = inflector.find_verb_by_infinitive("Zouglater")
+    assert (verb.template, verb.pred_score) == expected
+    found = inflector.find_verbs_by_infinitives(["parler", "zouglater"])
+    assert found[0].template == "aim:er" and not found[0].predicted
+    assert (found[1].template, found[1].pred_score) == expected
+    # Without a filter the most probable template is kept
+    assert verbs.find_verb_by_infinitive("zouglater").template == "ven:dre"
+
+
+def test_find_verbs_template_filter_cached(monkeypatch):
+    monkeypatch.setattr(config, "ml", True)
+    monkeypatch.setattr(prediction_cache, "_cache", None)
+    monkeypatch.setattr(prediction_cache, "_fingerprints", {})
+    predictor = FakeTemplatePredictor()
+    topk_calls = []
+    predict_topk_many = predictor.predict_topk_many
+    monkeypatch.setattr(
+        predictor,
+        "predict_topk_many",
+        lambda verbs, k: topk_calls.append(verbs) or predict_topk_many(verbs, k),
+    )
+    verbs = VerbsParser("fr").parse()
+    verbs._template_predictor = predictor
+    inflector = InflectorFr()
+    inflector._verbs = verbs
+    for _ in range(3):
+        verb = inflector.find_verb_by_infinitive("Zouglater")
+        assert (verb.template, verb.pred_score) == ("aim:er", 0.1)
+    assert topk_calls == [["zouglater"]]
+    # The unfiltered prediction is cached separately
+    assert verbs.find_verb_by_infinitive("zouglater").template == "ven:dre"
+    monkeypatch.setattr(config, "ml_top_k", 2)
+    assert inflector.find_verb_by_infinitive("zouglater").template == "ven:dre"
+    assert len(topk_calls) == 2
+
+
+ER_VERBS = ["parler", "aimer", "chanter", "danser", "jouer", "manger", "porter"]
+ER_VERBS += ["donner", "fermer", "garder", "monter", "tomber", "laver", "passer"]
+IR_VERBS = ["finir", "choisir", "grandir", "remplir", "bâtir", "agir", "unir"]
+IR_VERBS += ["punir", "réussir", "rougir", "salir", "trahir", "nourrir", "mincir"]
+UPDATE_PAIRS = [(v, "aim:er") for v in ER_VERBS] + [(v, "fin:ir") for v in IR_VERBS]
+
+
+def test_update_model():
+    model = mlconjug.train_model("fr", UPDATE_PAIRS, seed=1)
+    assert model.trained_pairs == sorted(UPDATE_PAIRS)
+    new_pairs = [("blablater", "aim:er"), ("zigouillir", "fin:ir")]
+    pairs = UPDATE_PAIRS + new_pairs
+    assert mlconjug.get_new_verb_template_pairs(model, pairs) == new_pairs
+    mlconjug.update_model(model, new_pairs)
+    assert model.updated_pairs == new_pairs
+    assert mlconjug.get_new_verb_template_pairs(model, pairs) == []
+    assert model.metadata["n_updates"] == 1
+    assert model.metadata["n_verbs"] == len(pairs)
+    assert model.metadata["accuracy"] is not None
+    assert "update" in model.timings
+    assert [model.templates[label] for label in model.predict(["blablater"])] == [
+        "aim:er"
+    ]
+    # A verb whose template changed is updated too
+    changed = [("parler", "fin:ir")]
+    assert mlconjug.get_new_verb_template_pairs(model, changed) == changed
+    with pytest.raises(ValueError):
+        mlconjug.update_model(model, [("aller", "all:er")])
+
+
+def test_save_load_model_verbs(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path)
+    model = mlconjug.train_model("fr", UPDATE_PAIRS, seed=1)
+    mlconjug.update_model(model, [("blablater", "aim:er")])
+    mlconjug.save_model(model)
+    assert mlconjug.load_model_verbs("fr") == (
+        sorted(UPDATE_PAIRS),
+        [("blablater", "aim:er")],
+    )
+    assert mlconjug.load_model("fr").trained_pairs == []
+    assert mlconjug.load_model_verbs("es") is None
+
+
+def test_model_dir(tmp_path, monkeypatch):
+    package_dir = tmp_path / "package"
+    model_dir = tmp_path / "models"
+    monkeypatch.setattr(inference, "files", lambda package: package_dir)
+    model = mlconjug.train_model("fr", UPDATE_PAIRS, seed=1)
+    model_es = mlconjug.train_model(
+        "es", [("hablar", "cort:ar"), ("comer", "beb:er")] * 4, seed=1
+    )
+    mlconjug.save_model(model_es)
+    monkeypatch.setattr(config, "model_dir", str(model_dir))
+    assert inference.get_model_dirs() == [
+        str(model_dir),
+        str(package_dir / inference.MODELS_DIR),
+    ]
+    assert mlconjug.load_model("fr") is None
+    mlconjug.save_model(model)
+    inference.save_inference_model(mlconjug.export_model(model))
+    assert sorted(os.listdir(model_dir)) == [
+        "inference_model-fr.json",
+        "inference_model-fr.npz",
+        "trained_model-fr.zip",
+    ]
+    assert mlconjug.load_model("fr").metadata == model.metadata
+    assert get_exported_metadata(inference.load_inference_model("fr")) == (
+        model.metadata
+    )
+    # Models missing from model_dir are loaded from the package
+    assert mlconjug.load_model("es").metadata == model_es.metadata
+    assert inference.load_inference_model("es") is None
+
+
+def test_export_models_model_dir(tmp_path, monkeypatch, capsys):
+    from verbecc.src.utils import utils
+
+    model_dir = tmp_path / "models"
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path / "package")
+    monkeypatch.setattr(config, "model_dir", str(model_dir))
+    model = mlconjug.train_model("fr", UPDATE_PAIRS, seed=1)
+    mlconjug.save_model(model)
+    monkeypatch.setattr(config, "model_dir", None)
+    monkeypatch.setenv("VERBECC_MODEL_DIR", "")  # restored, _set_model_dir sets it
+    utils.export_models(["--model-dir", str(model_dir), "fr"])
+    assert capsys.readouterr().out == "Exported model lang=fr\n"
+    assert get_exported_metadata(inference.load_inference_model("fr")) == (
+        model.metadata
+    )
+    assert "inference_model-fr.npz" in os.listdir(model_dir)
+
+
+def test_missing_model_trained_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path / "package")
+    monkeypatch.setattr(config, "model_dir", str(tmp_path / "models"))
+    monkeypatch.setattr(config, "missing_model", "train")
+    model = mlconjug.train_model("fr", UPDATE_PAIRS, seed=1)
+    trained = []
+
+    def train_model(lang, pairs):
+        trained.append(lang)
+        time.sleep(0.2)
+        return model
+
+    monkeypatch.setattr(mlconjug, "train_model", train_model)
+    predictors = []
+    threads = [
+        threading.Thread(
+            target=lambda: predictors.append(
+                mlconjug.TemplatePredictor(UPDATE_PAIRS, "fr")
+            )
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert trained == ["fr"]
+    assert [p.metadata for p in predictors] == [model.metadata] * 3
+
+
+def test_file_lock(tmp_path):
+    lock_path = str(tmp_path / "models" / "test.lock")
+    log_path = tmp_path / "log.txt"
+    code = (
+        "import sys, time\n"
+        "from verbecc.src.utils.file_utils import file_lock\n"
+        "with file_lock(sys.argv[1]):\n"
+        "    with open(sys.argv[2], 'a') as f:\n"
+        "        f.write('start\\n'); f.flush(); time.sleep(0.2); f.write('end\\n')\n"
+    )
+    processes = [
+        subprocess.Popen([sys.executable, "-c", code, lock_path, str(log_path)])
+        for _ in range(3)
+    ]
+    for process in processes:
+        assert process.wait() == 0
+    assert log_path.read_text().split() == ["start", "end"] * 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_atomic_write_bytes_permissions(tmp_path):
+    from verbecc.src.utils.file_utils import atomic_write_bytes
+
+    umask = os.umask(0o027)
+    try:
+        atomic_write_bytes(str(tmp_path / "a"), b"data")
+        with open(tmp_path / "b", "wb") as f:
+            f.write(b"data")
+    finally:
+        os.umask(umask)
+    assert (tmp_path / "a").read_bytes() == b"data"
+    assert os.stat(tmp_path / "a").st_mode == os.stat(tmp_path / "b").st_mode
+    assert os.stat(tmp_path / "a").st_mode & 0o777 == 0o640
+    assert sorted(os.listdir(tmp_path)) == ["a", "b"]
+
+
+class FakeVerb:
+    def __init__(self, infinitive, template):
+        self.infinitive = infinitive
+        self.template = template
+
+
+class FakeVerbsParser:
+    pairs = []
+
+    def __init__(self, lang):
+        pass
+
+    def parse(self):
+        return [FakeVerb(*p) for p in self.pairs]
+
+
+@pytest.mark.parametrize(
+    "new_pairs,n_updates,expected",
+    [
+        ([], 0, "up to date"),
+        ([("blablater", "aim:er")], 0, "Updated"),
+        ([("blablater", "aim:er")], 3, "Rebuilt"),
+        ([("aller", "all:er")], 0, "Rebuilt"),
+    ],
+)
+def test_update_models(tmp_path, monkeypatch, new_pairs, n_updates, expected):
+    from verbecc.src.utils import utils
+
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path)
+    monkeypatch.setattr(utils, "VerbsParser", FakeVerbsParser)
+    monkeypatch.setattr(FakeVerbsParser, "pairs", UPDATE_PAIRS)
+    assert utils._update_model("fr", 3, 0.005).startswith("Rebuilt")
+    if n_updates:
+        model = mlconjug.load_model("fr")
+        model.trained_pairs, model.updated_pairs = mlconjug.load_model_verbs("fr")
+        model.metadata["n_updates"] = n_updates
+        mlconjug.save_model(model)
+    pairs = UPDATE_PAIRS + new_pairs
+    monkeypatch.setattr(FakeVerbsParser, "pairs", pairs)
+    assert expected in utils._update_model("fr", 3, 0.005)
+    model = mlconjug.load_model("fr")
+    model.trained_pairs, model.updated_pairs = mlconjug.load_model_verbs("fr")
+    assert mlconjug.get_new_verb_template_pairs(model, pairs) == []
+    assert get_exported_metadata(inference.load_inference_model("fr")) == (
+        model.metadata
+    )
+
+
+def test_build_langs_argument():
+    import argparse
+
+    from verbecc.src.utils import utils
+
+    parser = argparse.ArgumentParser()
+    utils._add_langs_argument(parser)
+    assert parser.parse_args([]).langs == list(SUPPORTED_LANGUAGES)
+    assert parser.parse_args(["fr", "es"]).langs == ["fr", "es"]
+    with pytest.raises(SystemExit):
+        parser.parse_args(["xx"])
+
+
+def test_DataSet_template_labels(verb_template_pairs):
+    data_set = mlconjug.DataSet(list(verb_template_pairs), seed=1)
+    templates = dict(verb_template_pairs)
+    for verbs, labels in (
+        (data_set.train_input, data_set.train_labels),
+        (data_set.test_input, data_set.test_labels),
+    ):
+        assert [data_set.templates[label] for label in labels] == [
+            templates[verb] for verb in verbs
+        ]
+
+
+def test_train_model_timings():
+    pairs = [("parler", "aim:er"), ("aimer", "aim:er"), ("finir", "fin:ir")] * 4
+    model = mlconjug.train_model("fr", pairs, seed=1)
+    assert list(model.timings) == ["vectorize", "select", "fit"]
+    assert pickle.loads(pickle.dumps(model)).timings == {}
+
+
+def test_model_files_reproducible():
+    code = (
+        "import hashlib, os, tempfile\n"
+        "from verbecc.src.mlconjug import inference, mlconjug\n"
+        "pairs = [(v, 'aim:er') for v in ('parler', 'aimer', 'chanter')] * 4\n"
+        "pairs += [(v, 'fin:ir') for v in ('finir', 'choisir')] * 4\n"
+        "model = mlconjug.train_model('fr', pairs)\n"
+        "print(hashlib.sha256(mlconjug.get_model_zip_bytes(model)).hexdigest())\n"
+        "with tempfile.TemporaryDirectory() as d:\n"
+        "    inference.write_inference_model(\n"
+        "        d, mlconjug.export_model(model).slim('float16', True), True\n"
+        "    )\n"
+        "    for name in sorted(os.listdir(d)):\n"
+        "        with open(os.path.join(d, name), 'rb') as f:\n"
+        "            print(name, hashlib.sha256(f.read()).hexdigest())\n"
+    )
+    outputs = [
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2")
+    ]
+    assert len(outputs[0].splitlines()) == 3
+    assert outputs[0] == outputs[1]
+
+
+def test_missing_model_raise(verb_template_pairs, monkeypatch):
+    monkeypatch.setattr(config, "missing_model", "raise")
+    monkeypatch.setattr(mlconjug, "load_model", lambda lang: None)
+    with pytest.raises(ModelNotFoundError):
+        mlconjug.TemplatePredictor(verb_template_pairs, lang="fr")
+
+
+def test_missing_model_raise_verb_not_found(monkeypatch):
+    monkeypatch.setattr(config, "ml", True)
+    monkeypatch.setattr(config, "missing_model", "raise")
+    monkeypatch.setattr(mlconjug, "load_model", lambda lang: None)
+    monkeypatch.setattr(inference, "load_inference_model", lambda lang: None)
+    verbs = VerbsParser("fr").parse()
+    with pytest.raises(VerbNotFoundError):
+        verbs.find_verb_by_infinitive("ubériser")
+
+
+def test_export_model(verb_template_pairs):
+    if config.ml:
+        model = mlconjug.load_model("fr")
+        inference_model = mlconjug.export_model(model)
+        verbs = [p[0] for p in verb_template_pairs[:500]] + ["ubériser", "zz", "a"]
+        templates = model.pipeline.predict(verbs)
+        proba = model.pipeline.predict_proba(verbs)
+        for i, verb in enumerate(verbs):
+            template, score = inference_model.predict(verb)
+            assert template == model.templates[templates[i]]
+            assert score == pytest.approx(proba[i][templates[i]], abs=1e-12)
+
+
+def test_export_model_binary():
+    pairs = [("parler", "aim:er"), ("aimer", "aim:er"), ("finir", "fin:ir")] * 4
+    model = mlconjug.train_model("fr", pairs, seed=1)
+    inference_model = mlconjug.export_model(model)
+    for verb in ("parler", "finir", "choisir", "x"):
+        label = model.pipeline.predict([verb])[0]
+        template, score = inference_model.predict(verb)
+        assert template == model.templates[label]
+        assert score == pytest.approx(
+            model.pipeline.predict_proba([verb])[0][label], abs=1e-12
+        )
+
+
+def test_save_load_inference_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path)
+    weights = np.arange(4, dtype=np.float64).reshape(2, 2)
+    inference.save_inference_model(
+        inference.InferenceModel(
+            "fr",
+            ["END=er", "END=ir"],
+            ["aim:er", "fin:ir"],
+            weights,
+            np.array([0.5, -0.5]),
+        ),
+        dtype="float64",
+        sparse=False,
+        compress=False,
+    )
+    model = inference.load_inference_model("fr")
+    assert model.vocabulary == ["END=er", "END=ir"]
+    assert model.templates == ["aim:er", "fin:ir"]
+    assert isinstance(model.weights, np.memmap)
+    assert np.array_equal(model.weights, weights)
+    assert list(model.intercept) == [0.5, -0.5]
+    assert inference.load_inference_model("es") is None
+
+
+@pytest.mark.parametrize("dtype", inference.WEIGHT_DTYPES)
+@pytest.mark.parametrize(
+    "sparse,compress", [(True, True), (True, False), (False, True)]
+)
+def test_save_load_slim_inference_model(tmp_path, monkeypatch, dtype, sparse, compress):
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path)
+    weights = np.array([[0.0, 1.5], [-2.0, 0.0], [0.0, 0.0]])
+    original = inference.InferenceModel(
+        "fr", ["END=er", "END=ir", "END=re"], ["aim:er", "fin:ir"], weights, np.zeros(2)
+    )
+    inference.save_inference_model(original, dtype, sparse, compress)
+    models_dir = tmp_path / inference.MODELS_DIR
+    assert sorted(p.suffix for p in models_dir.iterdir()) == [".json", ".npz"]
+    model = inference.load_inference_model("fr")
+    assert model.dtype == dtype
+    assert model.sparse == sparse
+    assert model.metadata["export"] == {
+        "engine": "numpy",
+        "dtype": dtype,
+        "sparse": sparse,
+    }
+    fingerprints = {
+        prediction_cache.get_model_fingerprint(m.metadata)
+        for m in (
+            original,
+            model,
+            original.slim("float16" if dtype == "int8" else "int8", sparse),
+        )
+    }
+    assert len(fingerprints) == 3
+    assert np.array_equal(model._get_float64_weights(), weights)
+    if sparse:
+        assert len(model.weights.data) == 2
+    verbs = ["parler", "finir", "prendre"]
+    assert np.array_equal(
+        model.decision_function(verbs), original.decision_function(verbs)
+    )
+    # Saving the dense model again replaces the .npz
+    inference.save_inference_model(original, "float64", False, False)
+    assert sorted(p.suffix for p in models_dir.iterdir()) == [".json", ".npy"]
+
+
+def test_slim_inference_model(verb_template_pairs):
+    pairs = verb_template_pairs[::10]
+    model = mlconjug.export_model(mlconjug.train_model("fr", pairs, seed=1))
+    verbs = [v for v, _ in pairs[:500]] + ["ubériser", "zz"]
+    expected = model.predict_many(verbs)
+    assert model.slim("float64", sparse=True).predict_many(verbs) == expected
+    for dtype in ("float16", "int8"):
+        slim = model.slim(dtype, sparse=True)
+        assert slim.dtype == dtype
+        assert slim.weights.data.nbytes < model.weights.nbytes / 8
+        agree = sum(
+            t == e for (t, _), (e, _) in zip(slim.predict_many(verbs), expected)
+        )
+        assert agree / len(verbs) > 0.99
+    int8 = model.slim("int8")
+    assert np.abs(int8.weights).max() == 127
+    assert np.allclose(
+        int8._get_float64_weights(),
+        model.weights,
+        atol=float(int8.scale.max()) / 2 + 1e-12,
+    )
+
+
+def test_slim_inference_model_invalid_dtype():
+    model = inference.InferenceModel(
+        "fr", ["END=er"], ["aim:er"], np.ones((1, 1)), np.zeros(1)
+    )
+    with pytest.raises(ValueError):
+        model.slim("float32")
+
+
+def test_inference_does_not_import_sklearn():
+    code = (
+        "import sys\n"
+        "from verbecc.src.mlconjug import inference\n"
+        "inference.load_inference_model('fr')\n"
+        "assert 'sklearn' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_predict_many(verb_template_pairs):
+    if config.ml:
+        verbs = ["parler", "ubériser", "finir", "zz"]
+        predictor = mlconjug.TemplatePredictor(verb_template_pairs, lang="fr")
+        predictions = predictor.predict_many(verbs)
+        assert predictions == [predictor.predict(verb) for verb in verbs]
+        assert predictions[0][0] == "aim:er"
+        assert predictor.predict_many([]) == []
+        inference_model = mlconjug.export_model(predictor.model)
+        inference_predictions = inference_model.predict_many(verbs)
+        assert inference_predictions == [
+            inference_model.predict(verb) for verb in verbs
+        ]
+        for (template, score), (expected_template, expected_score) in zip(
+            inference_predictions, predictions
+        ):
+            assert template == expected_template
+            assert score == pytest.approx(expected_score, abs=1e-12)
+
+
+@pytest.mark.parametrize(
+    "verb,lang",
+    [("parler", "fr"), ("Être  né", "fr"), ("a", "es"), ("", "it"), ("ţipa", "ro")],
+)
+def test_hash_verb_features(verb, lang):
+    indptr, indices = features.hash_verb_features([verb, verb], lang, (2, 7))
+    expected = sorted(
+        set(
+            features.hash_feature(f)
+            for f in features.extract_verb_features(verb, lang, (2, 7))
+        )
+    )
+    assert list(indptr) == [0, len(expected), 2 * len(expected)]
+    assert list(indices) == expected * 2
+
+
+def test_hashing_model():
+    pairs = [("parler", "aim:er"), ("aimer", "aim:er"), ("finir", "fin:ir")] * 4
+    pairs += [("vendre", "ven:dre"), ("rendre", "ven:dre")] * 4
+    model = mlconjug.train_model("fr", pairs, seed=1, features="hashing")
+    assert model.metadata["features"] == "hashing"
+    vectorizer = model.pipeline.named_steps["vectorizer"]
+    assert isinstance(vectorizer, mlconjug.HashingFeatureVectorizer)
+    assert vectorizer.transform(["parler"]).shape == (1, features.HASH_N_FEATURES)
+    inference_model = mlconjug.export_model(model)
+    assert inference_model.hash_n_features == features.HASH_N_FEATURES
+    verbs = ["parler", "finir", "prendre", "x"]
+    labels = model.pipeline.predict(verbs)
+    assert [t for t, _ in inference_model.predict_many(verbs)] == [
+        model.templates[label] for label in labels
+    ]
+
+
+def test_save_load_hashing_inference_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference, "files", lambda package: tmp_path)
+    weights = np.arange(4, dtype=np.float64).reshape(2, 2)
+    inference.save_inference_model(
+        inference.InferenceModel(
+            "fr", [3, 5], ["aim:er", "fin:ir"], weights, np.zeros(2), hash_n_features=8
+        )
+    )
+    model = inference.load_inference_model("fr")
+    assert model.hash_n_features == 8
+    assert model.vocabulary == [3, 5]
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
+from verbecc.src.parsers import conjugations_parser
+from verbecc.src.parsers.conjugations_parser import (
+    ConjugationsParser,
+    load_validated_checksums,
+)
+
+FR_XML = "verbecc/data/xml/conjugations/conjugations-fr.xml"
+
+
+@pytest.mark.parametrize("lang", SUPPORTED_LANGUAGES.keys())
+def test_validated_checksums_up_to_date(lang):
+    """If this fails, run validate-verb-xml after editing the XML files"""
+    checksums = load_validated_checksums()
+    assert checksums[f"conjugations-{lang}.xml"] == ConjugationsParser(lang).validate()
+
+
+def test_needs_dtd_validation_always(monkeypatch):
+    monkeypatch.setattr(config, "xml_validation", "always")
+    assert ConjugationsParser(Lang.fr)._needs_dtd_validation(FR_XML)
+
+
+def test_needs_dtd_validation_checksum_match(monkeypatch):
+    monkeypatch.setattr(config, "xml_validation", "checksum")
+    assert not ConjugationsParser(Lang.fr)._needs_dtd_validation(FR_XML)
+
+
+def test_needs_dtd_validation_checksum_mismatch(monkeypatch):
+    monkeypatch.setattr(config, "xml_validation", "checksum")
+    monkeypatch.setattr(
+        conjugations_parser,
+        "load_validated_checksums",
+        lambda: {"conjugations-fr.xml": "0" * 64},
+    )
+    assert ConjugationsParser(Lang.fr)._needs_dtd_validation(FR_XML)
+
+
+def test_parse_with_checksum_validation(monkeypatch):
+    monkeypatch.setattr(config, "snapshots", False)
+    monkeypatch.setattr(config, "xml_validation", "checksum")
+    conjugations = ConjugationsParser(Lang.fr).parse()
+    assert "aim:er" in conjugations.get_template_names()
+
+
+def test_validate_xml_output(tmp_path, capsys):
+    from verbecc.src.utils import utils
+
+    output = tmp_path / "validated-checksums.json"
+    output.write_text('{"conjugations-xx.xml": "0"}', encoding="utf-8")
+    utils.validate_xml(["--output", str(output), "fr"])
+    assert "Validated checksums saved" in capsys.readouterr().out
+    assert json.loads(output.read_text(encoding="utf-8")) == {
+        "conjugations-fr.xml": load_validated_checksums()["conjugations-fr.xml"],
+        "conjugations-xx.xml": "0",
+    }
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
+from verbecc.src.parsers import snapshot
+from verbecc.src.parsers.conjugations_parser import ConjugationsParser
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(config, "snapshots", True)
+    yield tmp_path
+
+
+@pytest.fixture
+def source_path(tmp_path):
+    path = tmp_path / "source.xml"
+    path.write_text("<verbs-fr/>")
+    yield str(path)
+
+
+def test_load_or_parse_saves_and_reuses_snapshot(cache_dir, source_path):
+    calls = []
+
+    def parse(path: str) -> list:
+        calls.append(path)
+        return ["parler", "finir"]
+
+    assert snapshot.load_or_parse("test", source_path, parse) == ["parler", "finir"]
+    assert snapshot.load_or_parse("test", source_path, parse) == ["parler", "finir"]
+    assert calls == [source_path]
+    assert len(os.listdir(cache_dir / "snapshots")) == 1
+
+
+def test_load_or_parse_source_changed(cache_dir, source_path):
+    snapshot.load_or_parse("test", source_path, lambda path: ["parler"])
+    with open(source_path, "w") as f:
+        f.write("<verbs-fr><v/></verbs-fr>")
+    assert snapshot.load_or_parse("test", source_path, lambda path: ["finir"]) == [
+        "finir"
+    ]
+
+
+def test_load_snapshot_ignores_corrupt_file(cache_dir):
+    path = snapshot.get_snapshot_path("test", "0" * 64)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(snapshot.SNAPSHOT_MAGIC + b"not a pickle")
+    assert snapshot.load_snapshot("test", "0" * 64) is None
+
+
+def test_snapshots_disabled(cache_dir, source_path, monkeypatch):
+    monkeypatch.setattr(config, "snapshots", False)
+    snapshot.load_or_parse("test", source_path, lambda path: ["parler"])
+    assert not os.path.exists(cache_dir / "snapshots")
+
+
+def test_parsers_load_from_snapshot(cache_dir, monkeypatch):
+    monkeypatch.setattr(config, "ml", False)
+    verbs = VerbsParser(Lang.fr).parse()
+    conjugations = ConjugationsParser(Lang.fr).parse()
+    assert len(os.listdir(cache_dir / "snapshots")) == 2
+
+    def fail(self: object, fp: str) -> None:
+        raise AssertionError("XML should not be parsed again")
+
+    monkeypatch.setattr(VerbsParser, "_parse_xml", fail)
+    monkeypatch.setattr(ConjugationsParser, "_parse_xml", fail)
+    verbs_from_snapshot = VerbsParser(Lang.fr).parse()
+    conjugations_from_snapshot = ConjugationsParser(Lang.fr).parse()
+    assert verbs_from_snapshot.infinitives == verbs.infinitives
+    assert verbs_from_snapshot.find_verb_by_infinitive("manger").template == "man:ger"
+    assert [t.name for t in conjugations_from_snapshot] == [
+        t.name for t in conjugations
+    ]
+    template = conjugations_from_snapshot.find_template("aim:er")
+    assert (
+        template.mood_templates["indicatif"]
+        .tense_templates["présent"]
+        .person_endings[4]
+        .get_ending()
+        == "ez"
+    )
+
+
+@pytest.mark.parametrize("mmap_verbs", [False, True])
+def test_unusable_cache_dir(tmp_path, monkeypatch, mmap_verbs):
+    # the parent of the cache directory is a file, so it can't be created
+    (tmp_path / "afile").write_text("")
+    monkeypatch.setattr(config, "cache_dir", str(tmp_path / "afile" / "sub"))
+    monkeypatch.setattr(config, "snapshots", True)
+    monkeypatch.setattr(config, "mmap_verbs", mmap_verbs)
+    verbs = VerbsParser(Lang.fr).parse()
+    assert verbs.find_verb_by_infinitive("manger").template == "man:ger"
+    conjugations = ConjugationsParser(Lang.fr).parse()
+    assert conjugations.find_template("aim:er").name == "aim:er"
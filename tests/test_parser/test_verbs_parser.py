@@ -1,3 +1,6 @@
+import pytest
+
+from verbecc.src.defs.types.exceptions import VerbsParserError
 from verbecc.src.parsers.verbs_parser import VerbsParser
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
 
@@ -6,3 +9,25 @@ def test_verbs_parser():
     vp = VerbsParser(Lang.fr)
     verbs = vp.parse()
     assert len(verbs) >= 7000
+
+
+def test_verbs_parser_wrong_root_tag(tmp_path):
+    path = tmp_path / "verbs-fr.xml"
+    path.write_text(
+        "<verbs-es><v><i>hablar</i><t>habl:ar</t></v></verbs-es>", encoding="utf-8"
+    )
+    with pytest.raises(VerbsParserError):
+        VerbsParser(Lang.fr)._parse_xml(str(path))
+
+
+def test_verbs_parser_streams_verbs(tmp_path):
+    path = tmp_path / "verbs-fr.xml"
+    path.write_text(
+        "<verbs-fr><v><i>parler</i><t>aim:er</t></v><v><i>finir</i><t>fin:ir</t></v></verbs-fr>",
+        encoding="utf-8",
+    )
+    verbs = VerbsParser(Lang.fr)._parse_xml(str(path))
+    assert [(v.infinitive, v.template) for v in verbs] == [
+        ("finir", "fin:ir"),
+        ("parler", "aim:er"),
+    ]
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from verbecc.src.defs.constants import config
+from verbecc.src.mlconjug import prediction_cache
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    """A fresh prediction cache saved to a file in tmp_path"""
+    path = tmp_path / "predictions.json"
+    monkeypatch.setattr(config, "ml", True)
+    monkeypatch.setattr(config, "prediction_cache_file", str(path))
+    monkeypatch.setattr(prediction_cache, "_cache", None)
+    monkeypatch.setattr(prediction_cache, "_fingerprints", {})
+    yield path
+
+
+def test_prediction_cache_hit(cache_file):
+    verbs = VerbsParser("fr").parse()
+    verb = verbs.find_verb_by_infinitive("ubériser")
+    cache = prediction_cache.get_prediction_cache()
+    key = ("fr", verbs._model_fingerprint, "uberiser", "")
+    assert cache.get(key) == (verb.template, verb.pred_score)
+    hits = cache.stats()["hits"]
+    again = verbs.find_verb_by_infinitive("Ubériser")
+    assert (again.template, again.pred_score) == (verb.template, verb.pred_score)
+    assert cache.stats()["hits"] == hits + 1
+
+
+def test_prediction_cache_other_model(cache_file, monkeypatch):
+    verbs = VerbsParser("fr").parse()
+    verb = verbs.find_verb_by_infinitive("ubériser")
+    cache = prediction_cache.get_prediction_cache()
+    cache.put(("fr", verbs._model_fingerprint, "uberiser", ""), ("stale:er", 1.0))
+    assert verbs.find_verb_by_infinitive("ubériser").template == "stale:er"
+    # e.g. the model was updated and the verbs reloaded
+    monkeypatch.setattr(
+        prediction_cache, "get_model_fingerprint", lambda metadata: "model-2"
+    )
+    reloaded = VerbsParser("fr").parse()
+    assert reloaded.find_verb_by_infinitive("ubériser").template == verb.template
+    assert cache.get(("fr", "model-2", "uberiser", "")) == (
+        verb.template,
+        verb.pred_score,
+    )
+
+
+def test_prediction_cache_disabled(cache_file, monkeypatch):
+    monkeypatch.setattr(config, "prediction_cache_size", 0)
+    verbs = VerbsParser("fr").parse()
+    assert verbs.find_verb_by_infinitive("ubériser").predicted
+    assert prediction_cache.get_prediction_cache() is None
+
+
+def test_prediction_cache_persistence(cache_file, monkeypatch):
+    prediction_cache.load_persisted_predictions("fr", "model-1")
+    prediction_cache.get_prediction_cache().put(
+        ("fr", "model-1", "uberiser", ""), ("aim:er", 0.9)
+    )
+    prediction_cache.save_prediction_cache()
+    saved = json.loads(cache_file.read_text())
+    assert saved["langs"]["fr"] == {
+        "model": "model-1",
+        "predictions": [["uberiser", "", "aim:er", 0.9]],
+    }
+
+    monkeypatch.setattr(prediction_cache, "_cache", None)
+    monkeypatch.setattr(prediction_cache, "_fingerprints", {})
+    assert prediction_cache.load_persisted_predictions("fr", "model-2") == 0
+    assert prediction_cache.load_persisted_predictions("fr", "model-1") == 1
+    cache = prediction_cache.get_prediction_cache()
+    assert cache.get(("fr", "model-1", "uberiser", "")) == ("aim:er", 0.9)
+
+
+def test_prediction_cache_save_keeps_other_langs(cache_file, monkeypatch):
+    cache_file.write_text(
+        json.dumps(
+            {
+                "format_version": prediction_cache.PREDICTION_CACHE_FORMAT_VERSION,
+                "langs": {"es": {"model": "m", "predictions": [["x", "", "y", 0.5]]}},
+            }
+        )
+    )
+    prediction_cache.load_persisted_predictions("fr", "model-1")
+    prediction_cache.save_prediction_cache()
+    saved = json.loads(cache_file.read_text())
+    assert set(saved["langs"]) == {"es", "fr"}
@@ -0,0 +1,127 @@
+import subprocess
+import sys
+
+import pytest
+
+from verbecc.src.defs.constants import config
+from verbecc.src.mlconjug import prediction_cache
+from verbecc.src.mlconjug.suffix_trie import SuffixTriePredictor, SuffixTriePrefilter
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+PAIRS = [
+    ("parler", "aim:er"),
+    ("aimer", "aim:er"),
+    ("manger", "man:ger"),
+    ("ranger", "man:ger"),
+    ("changer", "man:ger"),
+    ("songer", "aim:er"),
+    ("finir", "fin:ir"),
+    ("tenir", "t:enir"),
+    ("venir", "t:enir"),
+    ("vendre", "ven:dre"),
+    ("rendre", "ven:dre"),
+    ("prendre", "pr:endre"),
+]
+
+
+@pytest.fixture(scope="module")
+def trie():
+    yield SuffixTriePredictor(PAIRS, "fr")
+
+
+@pytest.mark.parametrize(
+    "verb,suffix,template,support,count",
+    [
+        ("déranger", "ranger", "man:ger", 1, 1),
+        ("zzger", "ger", "man:ger", 3, 4),
+        ("zzer", "er", "aim:er", 3, 6),  # tie broken by name
+        ("revenir", "venir", "t:enir", 1, 1),
+        ("zzenir", "enir", "t:enir", 2, 2),
+        ("apprendre", "prendre", "pr:endre", 1, 1),
+        ("zzendre", "endre", "ven:dre", 2, 3),
+        ("zzrendre", "rendre", "pr:endre", 1, 2),
+        ("xyz", "", "aim:er", 3, 12),
+    ],
+)
+def test_suffix_trie_match(trie, verb, suffix, template, support, count):
+    m = trie.match(verb)
+    assert (m.suffix, m.template, m.support, m.count) == (
+        suffix,
+        template,
+        support,
+        count,
+    )
+    assert trie.predict(verb) == (template, support / count)
+
+
+def test_suffix_trie_predict_topk(trie):
+    # The templates of shorter suffixes come after those of the longest
+    assert trie.predict_topk("zzger", 3) == [
+        ("man:ger", 0.75),
+        ("aim:er", 0.25),
+        ("t:enir", 2 / 9),
+    ]
+    assert trie.predict_topk_many(["zzenir"], 2) == [
+        [("t:enir", 1.0), ("fin:ir", 1 / 3)]
+    ]
+    assert trie.predict_many(["parler", "tenir"]) == [
+        ("aim:er", 1.0),
+        ("t:enir", 1.0),
+    ]
+    assert trie.metadata["n_verbs"] == len(PAIRS)
+
+
+class FakeTemplatePredictor:
+    metadata = {"lang": "fr"}
+    templates = ["aim:er"]
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_many(self, verbs):
+        self.calls.append(verbs)
+        return [("aim:er", 0.5) for _ in verbs]
+
+
+def test_suffix_trie_prefilter(trie):
+    predictor = FakeTemplatePredictor()
+    prefilter = SuffixTriePrefilter(trie, predictor, 2)
+    assert prefilter.predict_many(["zzenir", "zzger", "déranger", "zzir"]) == [
+        ("t:enir", 1.0),
+        ("aim:er", 0.5),
+        ("aim:er", 0.5),
+        ("aim:er", 0.5),
+    ]
+    assert predictor.calls == [["zzger", "déranger", "zzir"]]
+    assert prefilter.metadata["prefilter"]["min_support"] == 2
+
+
+@pytest.mark.parametrize("engine,min_support", [("suffix_trie", 0), ("numpy", 5)])
+def test_find_verb_suffix_trie(monkeypatch, engine, min_support):
+    monkeypatch.setattr(config, "ml", True)
+    monkeypatch.setattr(config, "ml_engine", engine)
+    monkeypatch.setattr(config, "ml_suffix_trie_min_support", min_support)
+    monkeypatch.setattr(config, "prediction_cache_size", 0)
+    monkeypatch.setattr(prediction_cache, "_fingerprints", {})
+    verbs = VerbsParser("fr").parse()
+    verb = verbs.find_verb_by_infinitive("ubériser")
+    assert verb.predicted
+    assert verb.template == "aim:er"
+    assert (
+        type(verbs.template_predictor).__name__
+        == {
+            "suffix_trie": "SuffixTriePredictor",
+            "numpy": "SuffixTriePrefilter",
+        }[engine]
+    )
+
+
+def test_suffix_trie_does_not_import_numpy():
+    code = (
+        "import sys\n"
+        "from verbecc.src.mlconjug.suffix_trie import SuffixTriePredictor\n"
+        "SuffixTriePredictor([('parler', 'aim:er')], 'fr').predict('zzer')\n"
+        "assert 'numpy' not in sys.modules\n"
+        "assert 'sklearn' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,52 @@
+import pytest
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.data.conjugations import LazyConjugations
+from verbecc.src.defs.types.exceptions import TemplateNotFoundError
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
+from verbecc.src.parsers.conjugations_parser import ConjugationsParser
+
+
+@pytest.fixture(scope="module")
+def conjugations():
+    yield ConjugationsParser(Lang.fr).parse()
+
+
+@pytest.fixture
+def lazy_conjugations(monkeypatch):
+    monkeypatch.setattr(config, "lazy_templates", True)
+    yield ConjugationsParser(Lang.fr).parse()
+
+
+def test_lazy_conjugations_index_only(lazy_conjugations, conjugations):
+    assert isinstance(lazy_conjugations, LazyConjugations)
+    assert len(lazy_conjugations) == len(conjugations)
+    assert lazy_conjugations.get_template_names() == conjugations.get_template_names()
+    assert lazy_conjugations.get_materialized_count() == 0
+
+
+def test_lazy_conjugations_find_template(lazy_conjugations, conjugations):
+    template = lazy_conjugations.find_template("aim:er")
+    assert lazy_conjugations.get_materialized_count() == 1
+    assert lazy_conjugations.find_template("aim:er") is template
+    assert repr(template) == repr(conjugations.find_template("aim:er"))
+
+
+def test_lazy_conjugations_iter(lazy_conjugations, conjugations):
+    assert repr(list(lazy_conjugations)) == repr(list(conjugations))
+    assert lazy_conjugations.get_materialized_count() == len(conjugations)
+
+
+def test_lazy_conjugations_template_not_found(lazy_conjugations):
+    with pytest.raises(TemplateNotFoundError):
+        lazy_conjugations.find_template("not:found")
+
+
+def test_conjugations_find_template(conjugations):
+    for template in conjugations:
+        assert conjugations.find_template(template.name) is template
+
+
+def test_conjugations_template_not_found(conjugations):
+    with pytest.raises(TemplateNotFoundError):
+        conjugations.find_template("not:found")
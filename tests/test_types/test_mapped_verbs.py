@@ -0,0 +1,108 @@
+import pytest
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.data.mapped_verbs import MappedVerbs, write_verb_table
+from verbecc.src.defs.types.exceptions import VerbNotFoundError, VerbsParserError
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+
+@pytest.fixture(scope="module")
+def verbs():
+    yield VerbsParser(Lang.es).parse()
+
+
+@pytest.fixture
+def mapped_verbs(verbs, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ml", False)
+    path = str(tmp_path / "verbs-es.table")
+    write_verb_table(path, list(verbs))
+    yield MappedVerbs(Lang.es, path)
+
+
+def test_mapped_verbs_same_verbs(mapped_verbs, verbs):
+    assert len(mapped_verbs) == len(verbs)
+    assert mapped_verbs.infinitives == verbs.infinitives
+    assert [repr(v) for v in mapped_verbs] == [repr(v) for v in verbs]
+
+
+@pytest.mark.parametrize(
+    "infinitive,expected_infinitive",
+    [
+        ("hablar", "hablar"),
+        ("Hablar", "hablar"),
+        ("abañar", "abañar"),
+        ("abaranar", "abarañar"),
+        ("freir", "freír"),
+    ],
+)
+def test_mapped_verbs_find_verb_by_infinitive(
+    mapped_verbs, verbs, infinitive, expected_infinitive
+):
+    verb = mapped_verbs.find_verb_by_infinitive(infinitive)
+    assert verb.infinitive == expected_infinitive
+    assert repr(verb) == repr(verbs.find_verb_by_infinitive(infinitive))
+
+
+@pytest.mark.parametrize("infinitive", ["abanar", "Abañar", "hablar", "zzzzar"])
+def test_mapped_verbs_find_verbs_by_infinitive_no_accents(
+    mapped_verbs, verbs, infinitive
+):
+    assert [
+        repr(v) for v in mapped_verbs.find_verbs_by_infinitive_no_accents(infinitive)
+    ] == [repr(v) for v in verbs.find_verbs_by_infinitive_no_accents(infinitive)]
+
+
+def test_mapped_verbs_looked_up_verbs_kept(mapped_verbs):
+    verb = mapped_verbs.find_verb_by_infinitive("hablar")
+    assert mapped_verbs.find_verb_by_infinitive("Hablar") is verb
+    assert mapped_verbs.find_verb_by_infinitive("abaranar") is (
+        mapped_verbs.find_verb_by_infinitive("abarañar")
+    )
+
+
+def test_mapped_verbs_looked_up_verbs_bounded(verbs, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ml", False)
+    monkeypatch.setattr(config, "mapped_verbs_cache_size", 2)
+    path = str(tmp_path / "verbs-es.table")
+    write_verb_table(path, list(verbs))
+    mapped_verbs = MappedVerbs(Lang.es, path)
+    verb = mapped_verbs.find_verb_by_infinitive("hablar")
+    for infinitive in ["comer", "vivir", "hablar"]:
+        mapped_verbs.find_verb_by_infinitive(infinitive)
+    assert len(mapped_verbs._looked_up) == 2
+    assert mapped_verbs.find_verb_by_infinitive("hablar") is not verb
+    monkeypatch.setattr(config, "mapped_verbs_cache_size", 0)
+    mapped_verbs = MappedVerbs(Lang.es, path)
+    assert mapped_verbs.find_verb_by_infinitive("hablar").template == verb.template
+
+
+def test_mapped_verbs_verb_not_found(mapped_verbs):
+    with pytest.raises(VerbNotFoundError):
+        mapped_verbs.find_verb_by_infinitive("zzzzar")
+
+
+@pytest.mark.parametrize("query,max_results", [("hab", 10), ("a", 1000), ("é", 10)])
+def test_mapped_verbs_get_verbs_that_start_with(
+    mapped_verbs, verbs, query, max_results
+):
+    assert mapped_verbs.get_verbs_that_start_with(
+        query, max_results
+    ) == verbs.get_verbs_that_start_with(query, max_results)
+
+
+def test_mapped_verbs_invalid_file(tmp_path):
+    path = tmp_path / "invalid.table"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(VerbsParserError):
+        MappedVerbs(Lang.es, str(path))
+
+
+def test_verbs_parser_mmap_verbs(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ml", False)
+    monkeypatch.setattr(config, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(config, "mmap_verbs", True)
+    verbs = VerbsParser(Lang.fr).parse()
+    assert isinstance(verbs, MappedVerbs)
+    assert verbs.find_verb_by_infinitive("manger").template == "man:ger"
+    assert len(list((tmp_path / "tables").iterdir())) == 1
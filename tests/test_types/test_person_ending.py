@@ -0,0 +1,37 @@
+import pytest
+
+from verbecc.src.defs.types.data.person_ending import (
+    PersonEnding,
+    apply_ending_edit,
+    compile_ending,
+)
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
+from verbecc.src.defs.types.person import Person
+from verbecc.src.inflectors.inflector_registry import InflectorRegistry
+
+
+@pytest.mark.parametrize(
+    "ending,edit,conj",
+    [
+        ("ez", (0, "ez", False), "pertanyez"),
+        ("", (0, "", False), "pertany"),
+        ("-guí", (1, "guí", False), "pertanguí"),
+        ("--a", (2, "a", False), "pertaa"),
+        ("-", (0, "-", True), "pertany-"),
+        ("--", (1, "-", False), "pertan-"),
+    ],
+)
+def test_compile_ending(ending, edit, conj):
+    assert compile_ending(ending) == edit
+    assert apply_ending_edit("pertany", edit) == conj
+    inflector = InflectorRegistry.get_inflector(Lang.ca)
+    assert inflector.combine_verb_stem_and_ending("pertany", ending) == conj
+
+
+def test_person_ending_edits():
+    pe = PersonEnding(Person.FirstPersonSingular, ["ie", "-ye"])
+    assert pe.get_edits() == [(0, "ie", False), (1, "ye", False)]
+    assert pe.get_edit() == (0, "ie", False)
+    assert pe.get_alternate_edit_if_available() == (1, "ye", False)
+    pe = PersonEnding(Person.FirstPersonSingular, ["-"])
+    assert pe.get_alternate_edit_if_available() == (0, "-", True)
@@ -1,7 +1,12 @@
+import subprocess
+import sys
 from unittest.mock import patch
 
 import pytest
 
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.exceptions import VerbNotFoundError
+
 from verbecc.src.parsers.verbs_parser import VerbsParser
 from verbecc.src.defs.types.data.verbs import Verbs
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1 as Lang
@@ -38,3 +43,64 @@ def test_verb_two(verbs):
 def test_get_verbs_that_start_with(query, expected_matches, verbs):
     matches = verbs.get_verbs_that_start_with(query)
     assert matches == expected_matches
+
+
+def test_verbs_import_does_not_load_ml():
+    code = (
+        "import sys\n"
+        "from verbecc import Conjugator\n"
+        "Conjugator('fr').conjugate('manger')\n"
+        "assert 'sklearn' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_template_predictor_loaded_on_first_unknown_verb(monkeypatch):
+    monkeypatch.setattr(config, "ml", True)
+    verbs = VerbsParser(Lang.fr).parse()
+    verbs.find_verb_by_infinitive("manger")
+    assert not verbs.is_template_predictor_loaded()
+    verb = verbs.find_verb_by_infinitive("ubériser")
+    assert verb.predicted
+    assert verbs.is_template_predictor_loaded()
+
+
+def test_find_verbs_by_infinitives(verbs):
+    infinitives = ["manger", "ubériser", "Etre", "googler"]
+    found = verbs.find_verbs_by_infinitives(infinitives)
+    assert [v.infinitive for v in found] == ["manger", "ubériser", "être", "googler"]
+    assert [v.predicted for v in found] == [False, True, False, True]
+    for verb, infinitive in zip(found, infinitives):
+        expected = verbs.find_verb_by_infinitive(infinitive)
+        assert verb.template == expected.template
+        assert verb.pred_score == expected.pred_score
+
+
+def test_find_verbs_by_infinitives_without_ml(verbs, monkeypatch):
+    monkeypatch.setattr(config, "ml", False)
+    assert [v.infinitive for v in verbs.find_verbs_by_infinitives(["manger"])] == [
+        "manger"
+    ]
+    with pytest.raises(VerbNotFoundError):
+        verbs.find_verbs_by_infinitives(["manger", "ubériser"])
+
+
+@pytest.mark.parametrize(
+    "query,expected_infinitives",
+    [
+        ("breler", ["bréler", "brêler"]),
+        ("Brêler", ["bréler", "brêler"]),
+        ("manger", ["manger"]),
+        ("zzzzer", []),
+    ],
+)
+def test_find_verbs_by_infinitive_no_accents(verbs, query, expected_infinitives):
+    found = verbs.find_verbs_by_infinitive_no_accents(query)
+    assert [v.infinitive for v in found] == expected_infinitives
+
+
+def test_find_verb_by_infinitive_accent_collision(verbs):
+    # an exact match wins, otherwise the first verb in infinitive order
+    assert verbs.find_verb_by_infinitive("brêler").infinitive == "brêler"
+    assert verbs.find_verb_by_infinitive("breler").infinitive == "bréler"
+    assert verbs.find_verb_by_infinitive("Bailler").infinitive == "bailler"
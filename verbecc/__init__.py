@@ -1,4 +1,5 @@
 from verbecc.src.conjugator.conjugator import Conjugator
+from verbecc.src.inflectors.inflector_registry import InflectorRegistry
 from verbecc.src.defs.types.alternates_behavior import AlternatesBehavior
 from verbecc.src.defs.types.conjugation import (
     MoodsConjugation,
@@ -54,4 +55,5 @@ from verbecc.src.defs.types.exceptions import (
     InvalidLangError,
     InvalidMoodError,
     InvalidTenseError,
+    ModelNotFoundError,
 )
@@ -0,0 +1,85 @@
+"""
+Cache of the results of Conjugator.conjugate, conjugate_mood and
+conjugate_mood_tense (see config.conjugation_cache_size), so that the
+conjugations of the most requested verbs are only computed once.
+
+The cached results are frozen: their dicts and lists raise TypeError when
+modified, as they are returned to every caller. They compare equal to and
+serialize like plain dicts and lists, and copy.deepcopy gives mutable ones.
+"""
+
+import threading
+from typing import Any, Dict, Hashable, List, NoReturn, Optional, Tuple, TypeVar
+
+from verbecc.src.defs.constants import config
+from verbecc.src.utils.bounded_cache import BoundedCache
+
+T = TypeVar("T")
+
+ConjugationCacheKey = Tuple[Hashable, ...]
+ConjugationCache = BoundedCache[ConjugationCacheKey, Any]
+
+_shared_cache: Optional[ConjugationCache] = None
+_lock = threading.Lock()
+
+
+def _readonly(self: Any, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError("Cached conjugations are read-only, copy.deepcopy them first")
+
+
+class FrozenDict(dict):
+    """A dict that can't be modified"""
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[Any, Any]]]:
+        # copy.deepcopy and pickle give a plain dict
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """A list that can't be modified"""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce__(self) -> Tuple[type, Tuple[List[Any]]]:
+        return list, (list(self),)
+
+
+def freeze(value: T) -> T:
+    """A copy of value with its dicts and lists frozen, recursively"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())  # type: ignore
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)  # type: ignore
+    return value
+
+
+def get_conjugation_cache() -> Optional[ConjugationCache]:
+    """
+    Returns the conjugation cache of a new Conjugator: None if it is disabled
+    (config.conjugation_cache_size = 0), a new cache if
+    config.conjugation_cache_scope is "instance", otherwise the cache shared by
+    all Conjugators
+    """
+    global _shared_cache
+    if config.conjugation_cache_size <= 0:
+        return None
+    if config.conjugation_cache_scope == "instance":
+        return BoundedCache(
+            config.conjugation_cache_size, config.conjugation_cache_policy
+        )
+    if config.conjugation_cache_scope != "shared":
+        raise ValueError(
+            f"Invalid conjugation cache scope {config.conjugation_cache_scope}"
+        )
+    if _shared_cache is None:
+        with _lock:
+            if _shared_cache is None:
+                _shared_cache = BoundedCache(
+                    config.conjugation_cache_size, config.conjugation_cache_policy
+                )
+    return _shared_cache
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from verbecc.src.defs.types.data.verb import Verb
 from verbecc.src.defs.types.data.conjugation_template import ConjugationTemplate
+from verbecc.src.utils.string_utils import strip_accents
 
 
 class ConjugationObjects:
@@ -10,16 +13,26 @@ class ConjugationObjects:
         template: ConjugationTemplate,
         verb_stem: str,
         is_reflexive: bool,
+        inflected_verb_stem: Optional[str] = None,
     ) -> None:
         """
-        :param verb_stem: the verb stem after applicable template
-                            stem modifications i.e. modify-stem="strip-accents"
+        :param verb_stem: the verb stem of the infinitive
         :type verb_stem: str
+
+        :param inflected_verb_stem: the verb stem of the inflected
+                            (non-infinitive) forms, after applicable template
+                            stem modifications i.e. modify-stem="strip-accents".
+                            Derived from verb_stem if not given.
         """
         self.infinitive = infinitive
         self.verb = verb
         self.template = template
         self.verb_stem = verb_stem
+        if inflected_verb_stem is None:
+            inflected_verb_stem = verb_stem
+            if template.modify_stem == "strip-accents":
+                inflected_verb_stem = strip_accents(verb_stem)
+        self.inflected_verb_stem = inflected_verb_stem
         self.is_reflexive = is_reflexive
 
     def __repr__(self) -> str:
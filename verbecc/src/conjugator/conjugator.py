@@ -14,9 +14,14 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-import copy
-from typing import cast, List
+from typing import Callable, Hashable, Optional, Tuple, TypeVar, cast, List
 
+from verbecc.src.conjugator.conjugation_cache import (
+    ConjugationCache,
+    ConjugationCacheKey,
+    freeze,
+    get_conjugation_cache,
+)
 from verbecc.src.conjugator.conjugation_object import ConjugationObjects
 from verbecc.src.defs.types.gender import Gender
 from verbecc.src.defs.types.mood import Mood
@@ -38,13 +43,17 @@ from verbecc.src.defs.types.conjugation import (
 )
 from verbecc.src.defs.types.lang_specific_options import (
     LangSpecificOptions,
+    get_options_key,
 )
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1
 from verbecc.src.defs.types.alternates_behavior import AlternatesBehavior
 from verbecc.src.defs.types.data.tense_template import TenseTemplate
 from verbecc.src.defs.types.data.conjugation_template import ConjugationTemplate
-from verbecc.src.inflectors.inflector_factory import InflectorFactory
-from verbecc.src.utils.string_utils import strip_accents
+from verbecc.src.inflectors.inflector import AuxConjugation
+from verbecc.src.inflectors.inflector_registry import InflectorRegistry
+from verbecc.src.defs.types.data.person_ending import EndingEdit
+
+T = TypeVar("T")
 
 
 class Conjugator:
@@ -54,8 +63,30 @@ class Conjugator:
     conjugation logic.
     """
 
-    def __init__(self, lang: LangCodeISO639_1) -> None:
-        self._inflector = InflectorFactory.make_inflector(lang)
+    def __init__(
+        self,
+        lang: LangCodeISO639_1,
+        conjugation_cache: Optional[ConjugationCache] = None,
+    ) -> None:
+        """
+        Conjugators for the same language share a single Inflector,
+        see InflectorRegistry
+
+        :param lang: two-letter language code (ISO 639-1 Code)
+        :type lang: LangCodeISO639_1
+
+        :param conjugation_cache: cache of the conjugations, defaults to the one
+        set by config.conjugation_cache_size and conjugation_cache_scope, if any.
+        Its stats() count the hits, misses and evictions.
+        :type conjugation_cache: BoundedCache
+        """
+        self._inflector = InflectorRegistry.get_inflector(lang)
+        self.lang = lang
+        self.conjugation_cache = (
+            conjugation_cache
+            if conjugation_cache is not None
+            else get_conjugation_cache()
+        )
 
     def conjugate(
         self,
@@ -89,6 +120,34 @@ class Conjugator:
         alternates_behavior = AlternatesBehavior.FirstOnly
         if include_alternates:
             alternates_behavior = AlternatesBehavior.All
+        return self._cached(
+            self._get_cache_key(
+                "conjugate",
+                infinitive,
+                None,
+                None,
+                alternates_behavior,
+                gender,
+                conjugate_pronouns,
+                lang_specific_options,
+            ),
+            lambda: self._conjugate(
+                infinitive,
+                alternates_behavior,
+                gender,
+                conjugate_pronouns,
+                lang_specific_options,
+            ),
+        )
+
+    def _conjugate(
+        self,
+        infinitive: str,
+        alternates_behavior: AlternatesBehavior,
+        gender: Gender,
+        conjugate_pronouns: bool,
+        lang_specific_options: LangSpecificOptions,
+    ) -> Conjugation:
         co = self._get_conj_obs(infinitive)
         moods: MoodsConjugation = {}
         for mood, _ in co.template.mood_templates.items():
@@ -121,22 +180,129 @@ class Conjugator:
         conjugate_pronouns: bool = True,
         lang_specific_options: LangSpecificOptions = None,
     ) -> MoodConjugation:
-        co = self._get_conj_obs(infinitive)
-        return self._conjugate_mood(
-            co, mood, alternates_behavior, gender, conjugate_pronouns
+        moods = self._get_cached_moods(
+            infinitive,
+            alternates_behavior,
+            gender,
+            conjugate_pronouns,
+            lang_specific_options,
+        )
+        if moods is not None and mood in moods:
+            return moods[mood]
+        return self._cached(
+            self._get_cache_key(
+                "conjugate_mood",
+                infinitive,
+                mood,
+                None,
+                alternates_behavior,
+                gender,
+                conjugate_pronouns,
+                lang_specific_options,
+            ),
+            lambda: self._conjugate_mood(
+                self._get_conj_obs(infinitive),
+                mood,
+                alternates_behavior,
+                gender,
+                conjugate_pronouns,
+                lang_specific_options,
+            ),
         )
 
+    def _get_cache_key(
+        self,
+        method: str,
+        infinitive: str,
+        mood: Optional[Mood],
+        tense: Optional[Tense],
+        alternates_behavior: AlternatesBehavior,
+        gender: Gender,
+        conjugate_pronouns: bool,
+        lang_specific_options: LangSpecificOptions,
+    ) -> Optional[ConjugationCacheKey]:
+        """None if the arguments can't be a key, in which case they aren't cached"""
+        key = (
+            str(self.lang),
+            method,
+            infinitive.lower(),
+            mood,
+            tense,
+            alternates_behavior,
+            gender,
+            conjugate_pronouns,
+            get_options_key(lang_specific_options),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _cached(
+        self, key: Optional[ConjugationCacheKey], conjugate: Callable[[], T]
+    ) -> T:
+        """
+        The cached result of key, or the frozen result of conjugate, which
+        is cached
+        """
+        cache = self.conjugation_cache
+        if cache is None or key is None:
+            return conjugate()
+        ret = cache.get(key)
+        if ret is None:
+            ret = freeze(conjugate())
+            cache.put(key, ret)
+        return cast(T, ret)
+
+    def _get_cached_moods(
+        self,
+        infinitive: str,
+        alternates_behavior: AlternatesBehavior,
+        gender: Gender,
+        conjugate_pronouns: bool,
+        lang_specific_options: LangSpecificOptions,
+    ) -> Optional[MoodsConjugation]:
+        """
+        The moods of the cached conjugate result with the same arguments,
+        if any, from which conjugate_mood and conjugate_mood_tense are served
+        """
+        cache = self.conjugation_cache
+        if cache is None:
+            return None
+        key = self._get_cache_key(
+            "conjugate",
+            infinitive,
+            None,
+            None,
+            alternates_behavior,
+            gender,
+            conjugate_pronouns,
+            lang_specific_options,
+        )
+        # Not cache.get, which would count a miss
+        if key is None or key not in cache:
+            return None
+        conjugation = cache.get(key)
+        if conjugation is None:
+            return None
+        return cast(MoodsConjugation, conjugation["moods"])
+
     def _get_conj_obs(self, infinitive: str) -> ConjugationObjects:
         infinitive = infinitive.lower()
         is_reflexive, infinitive = self._inflector.split_reflexive(infinitive)
-        if is_reflexive and not self._inflector.verb_can_be_reflexive(infinitive):
+        # the template, stems and flags are resolved once per known verb
+        verb = self._inflector.bind_verb(self.find_verb_by_infinitive(infinitive))
+        if is_reflexive and not verb.can_be_reflexive:
             raise VerbNotFoundError("Verb cannot be reflexive")
-        verb = self.find_verb_by_infinitive(infinitive)
-        template = self.find_template(verb.template)
-        verb_stem = self._inflector.get_verb_stem_from_template_name(
-            verb.infinitive, template.name
+        return ConjugationObjects(
+            infinitive,
+            verb,
+            cast(ConjugationTemplate, verb.conjugation_template),
+            verb.verb_stem,
+            is_reflexive,
+            verb.inflected_verb_stem,
         )
-        return ConjugationObjects(infinitive, verb, template, verb_stem, is_reflexive)
 
     def get_verbs(self) -> List[Verb]:
         return self._inflector.get_verbs()
@@ -153,6 +319,13 @@ class Conjugator:
     def find_verb_by_infinitive(self, infinitive: str) -> Verb:
         return self._inflector.find_verb_by_infinitive(infinitive)
 
+    def find_verbs_by_infinitives(self, infinitives: List[str]) -> List[Verb]:
+        """
+        Finds or predicts the verb of each infinitive, predicting the templates
+        of all the unknown verbs in one batch (see Verbs.find_verbs_by_infinitives)
+        """
+        return self._inflector.find_verbs_by_infinitives(infinitives)
+
     def find_template(self, name: str) -> ConjugationTemplate:
         return self._inflector.find_template(name)
 
@@ -169,15 +342,35 @@ class Conjugator:
         conjugate_pronouns: bool = True,
         lang_specific_options: LangSpecificOptions = None,
     ) -> TenseConjugation:
-        co = self._get_conj_obs(infinitive)
-        return self._conjugate_mood_tense(
-            co,
-            mood,
-            tense,
-            alternates_behavior=alternates_behavior,
-            gender=gender,
-            conjugate_pronouns=conjugate_pronouns,
-            lang_specific_options=lang_specific_options,
+        moods = self._get_cached_moods(
+            infinitive,
+            alternates_behavior,
+            gender,
+            conjugate_pronouns,
+            lang_specific_options,
+        )
+        if moods is not None and mood in moods and tense in moods[mood]:
+            return moods[mood][tense]
+        return self._cached(
+            self._get_cache_key(
+                "conjugate_mood_tense",
+                infinitive,
+                mood,
+                tense,
+                alternates_behavior,
+                gender,
+                conjugate_pronouns,
+                lang_specific_options,
+            ),
+            lambda: self._conjugate_mood_tense(
+                self._get_conj_obs(infinitive),
+                mood,
+                tense,
+                alternates_behavior=alternates_behavior,
+                gender=gender,
+                conjugate_pronouns=conjugate_pronouns,
+                lang_specific_options=lang_specific_options,
+            ),
         )
 
     def _conjugate_mood(
@@ -248,17 +441,17 @@ class Conjugator:
             if tense not in mood_template.tense_templates:
                 raise InvalidTenseError
             tense_template = mood_template.tense_templates[tense]
+            verb_stem = co.inflected_verb_stem
+            if mood == self._inflector.get_infinitive_mood():
+                verb_stem = co.verb_stem
             return self._conjugate_simple_mood_tense(
-                co.verb_stem,
+                verb_stem,
                 mood,
                 tense,
                 tense_template,
                 is_reflexive=co.is_reflexive,
                 alternates_behavior=alternates_behavior,
                 gender=gender,
-                modify_stem_strip_accents=bool(
-                    co.template.modify_stem == "strip-accents"
-                ),
                 conjugate_pronouns=conjugate_pronouns,
                 lang_specific_options=lang_specific_options,
             )
@@ -342,31 +535,23 @@ class Conjugator:
             .person_endings
         ]
         aux_verb = self._inflector.get_auxiliary_verb(co, mood, tense)
-        aux_co = self._get_conj_obs(aux_verb)
-        aux_tense_template = copy.deepcopy(
-            aux_co.template.mood_templates[aux_mood].tense_templates[aux_tense]
-        )
-        aux_person_endings = []
-        for pe in aux_tense_template.person_endings:
-            if pe.person in persons:
-                aux_person_endings.append(pe)
-        aux_tense_template.person_endings = aux_person_endings
         aux_alternates_behavior = AlternatesBehavior.FirstOnly
         if aux_uses_alternate:
             aux_alternates_behavior = AlternatesBehavior.SecondOnly
-        aux_conj = self._conjugate_simple_mood_tense(
-            aux_co.verb_stem,
-            "",
-            aux_tense,
-            aux_tense_template,
-            co.is_reflexive,
-            aux_alternates_behavior,
-            gender=gender,
-            conjugate_pronouns=conjugate_pronouns,
-            lang_specific_options=lang_specific_options,
-        )
-        # cast below is safe because we're not using AlternatesBehavior.All
-        aux_conj_scalar_list = cast(List[str], aux_conj)
+        aux_conj_scalar_list = [
+            conj
+            for person, conj in self._get_aux_conjugation(
+                aux_verb,
+                aux_mood,
+                aux_tense,
+                co.is_reflexive,
+                aux_alternates_behavior,
+                gender=gender,
+                conjugate_pronouns=conjugate_pronouns,
+                lang_specific_options=lang_specific_options,
+            )
+            if person in persons
+        ]
         # need to skip conjugating primary verb for certain tenses e.g. romanian viitor-1
         ret = self._conjugate_compound_primary_verb(
             co,
@@ -396,6 +581,70 @@ class Conjugator:
                 ]
         return cast(TenseConjugation, ret)
 
+    def _get_aux_conjugation(
+        self,
+        aux_verb: str,
+        aux_mood: Mood,
+        aux_tense: Tense,
+        is_reflexive: bool,
+        aux_alternates_behavior: AlternatesBehavior,
+        gender: Gender = Gender.m,
+        conjugate_pronouns: bool = True,
+        lang_specific_options: LangSpecificOptions = None,
+    ) -> AuxConjugation:
+        """
+        The conjugation of each person of the auxiliary verb in aux_mood
+        aux_tense, conjugated once per combination of arguments and then
+        looked up in Inflector.aux_conjugations
+
+        :param aux_alternates_behavior: FirstOnly or SecondOnly
+        """
+        aux_conjugations = self._inflector.aux_conjugations
+        key: Optional[Tuple[Hashable, ...]] = None
+        if aux_conjugations is not None:
+            key = (
+                aux_verb,
+                aux_mood,
+                aux_tense,
+                is_reflexive,
+                aux_alternates_behavior,
+                gender,
+                conjugate_pronouns,
+                get_options_key(lang_specific_options),
+            )
+            try:
+                ret = aux_conjugations.get(key)
+            except TypeError:
+                key = None  # unhashable argument, not memoized
+            else:
+                if ret is not None:
+                    return ret
+        aux_co = self._get_conj_obs(aux_verb)
+        aux_tense_template = aux_co.template.mood_templates[aux_mood].tense_templates[
+            aux_tense
+        ]
+        aux_conj = self._conjugate_simple_mood_tense(
+            aux_co.verb_stem,
+            "",
+            aux_tense,
+            aux_tense_template,
+            is_reflexive,
+            aux_alternates_behavior,
+            gender=gender,
+            conjugate_pronouns=conjugate_pronouns,
+            lang_specific_options=lang_specific_options,
+        )
+        # cast below is safe because we're not using AlternatesBehavior.All
+        ret = tuple(
+            zip(
+                [pe.person for pe in aux_tense_template.person_endings],
+                cast(List[str], aux_conj),
+            )
+        )
+        if aux_conjugations is not None and key is not None:
+            aux_conjugations.put(key, ret)
+        return ret
+
     def _conjugate_compound_primary_verb(
         self,
         co: ConjugationObjects,
@@ -563,15 +812,16 @@ class Conjugator:
         alternates_behavior: AlternatesBehavior = AlternatesBehavior.FirstOnly,
         gender: Gender = Gender.m,
         conjugate_pronouns: bool = True,
-        modify_stem_strip_accents: bool = False,
         lang_specific_options: LangSpecificOptions = None,
     ) -> TenseConjugation:
         """
+        Applies the compiled endings (PersonEnding.edits) of tense_template to
+        verb_stem, which must already have the template's stem modifications
+        applied (see ConjugationObjects.inflected_verb_stem)
+
         :param gender: controls gender of third-person singular and plural
         pronouns, if conjugate_pronouns is enabled. Otherwise ignored.
         """
-        if modify_stem_strip_accents and mood != self._inflector.get_infinitive_mood():
-            verb_stem = strip_accents(verb_stem)
         ret: TenseConjugation = []
         tense = tense_template.tense
         compound = True
@@ -580,6 +830,13 @@ class Conjugator:
             or not conjugate_pronouns
         ):
             compound = False
+        is_subjunctive = mood == self._inflector.get_subjunctive_mood()
+        # "" unless the inflector adds a present participle e.g. Italian gerundio
+        simple_prefix = ""
+        if not compound:
+            simple_prefix = self._inflector.add_present_participle_if_applicable(
+                "", is_reflexive, tense
+            )
 
         for person_ending in tense_template.person_endings:
             person_ending = self._inflector.modify_person_ending_if_applicable(
@@ -592,54 +849,46 @@ class Conjugator:
             # There will be at least one conjugation per person-ending and
             # potentially one or more alternate conjugations
             person_conjugation: PersonConjugation = []
-            endings: List[str] = []
+            edits: List[EndingEdit]
             if alternates_behavior == AlternatesBehavior.FirstOnly:
-                endings.append(person_ending.get_ending())
+                edits = [person_ending.get_edit()]
             elif alternates_behavior == AlternatesBehavior.SecondOnly:
-                endings.append(person_ending.get_alternate_ending_if_available())
+                edits = [person_ending.get_alternate_edit_if_available()]
             else:  # default: AlternatesBehavior.All
-                endings.extend(person_ending.get_endings())
+                edits = person_ending.get_edits()
+            pronoun = ""
+            if compound:
+                pronoun = self._inflector.get_default_pronoun(
+                    person=person_ending.get_person(),
+                    gender=gender,
+                    is_reflexive=is_reflexive,
+                    lang_specific_options=lang_specific_options,
+                )
             # there may be one or more alternate endings
-            for ending in endings:
+            for delete_count, suffix, is_placeholder in edits:
+                if is_placeholder:
+                    # tense not conjugated for this verb
+                    person_conjugation.append("-" if compound else simple_prefix + "-")
+                    continue
+                if delete_count:
+                    conj = verb_stem[:-delete_count] + suffix
+                else:
+                    conj = verb_stem + suffix
                 if compound:
                     # compound conjugation
-                    pronoun = self._inflector.get_default_pronoun(
-                        person=person_ending.get_person(),
-                        gender=gender,
-                        is_reflexive=is_reflexive,
-                        lang_specific_options=lang_specific_options,
-                    )
-                    s = "-"
-                    if ending != "-":
-                        conj = self._inflector.combine_verb_stem_and_ending(
-                            verb_stem, ending
-                        )
-                        s = self._inflector.combine_pronoun_and_conj(pronoun, conj)
-                        if mood == self._inflector.get_subjunctive_mood():
-                            s = self._inflector.add_subjunctive_relative_pronoun(
-                                s, tense
-                            )
+                    s = self._inflector.combine_pronoun_and_conj(pronoun, conj)
+                    if is_subjunctive:
+                        s = self._inflector.add_subjunctive_relative_pronoun(s, tense)
                 else:
                     # simple conjugation
-                    s = self._inflector.add_present_participle_if_applicable(
-                        "", is_reflexive, tense
+                    s = self._inflector.add_reflexive_pronoun_or_pronoun_suffix_if_applicable(
+                        simple_prefix + conj,
+                        is_reflexive,
+                        mood,
+                        tense,
+                        person_ending.get_person(),
                     )
-                    if ending != "-":
-                        s += self._inflector.combine_verb_stem_and_ending(
-                            verb_stem, ending
-                        )
-                    else:
-                        s += ending
-                    if ending != "-":
-                        s = self._inflector.add_reflexive_pronoun_or_pronoun_suffix_if_applicable(
-                            s,
-                            is_reflexive,
-                            mood,
-                            tense,
-                            person_ending.get_person(),
-                        )
-                    if ending != "-":
-                        s = self._inflector.add_adverb_if_applicable(s, mood, tense)
+                    s = self._inflector.add_adverb_if_applicable(s, mood, tense)
                 person_conjugation.append(s)
             if alternates_behavior == AlternatesBehavior.All:
                 ret.append(list(person_conjugation))
@@ -1,2 +1,141 @@
+import os
+from typing import Optional
+
 DEVEL_MODE = False
 ml = True
+
+# What happens when the ML template prediction model of a language is missing
+# or was built for another model format version:
+# "train": train the model in-process and save it (this can take minutes)
+# "raise": strict mode, never train at runtime; TemplatePredictor raises
+#   ModelNotFoundError and unknown verbs raise VerbNotFoundError.
+#   Models are built ahead of time with train-verb-models.
+missing_model = "train"
+
+# Engine of the ML template prediction:
+# "numpy": the exported weights of the model (see export-verb-models), with
+#   NumPy only, much faster and without importing scikit-learn. Falls back
+#   to "sklearn" if the model hasn't been exported.
+# "sklearn": the scikit-learn pipeline of the trained model
+# "suffix_trie": no model, the most common template of the known verbs with
+#   the longest ending in common with the verb (SuffixTriePredictor), pure
+#   Python and built in a fraction of a second, but less accurate
+#   (see scripts/compare_template_predictors.py)
+ml_engine = "numpy"
+
+# If > 0, the "numpy" and "sklearn" engines are only used for the verbs that
+# the SuffixTriePredictor can't predict reliably: it is used when at least
+# ml_suffix_trie_min_support known verbs share the verb's longest known ending
+# and all have the same template (SuffixTriePrefilter)
+ml_suffix_trie_min_support = 0
+
+# Features the ML models are trained with by train-verb-models:
+# "count": the feature strings of each verb and a vocabulary (CountVectorizer)
+# "hashing": the same features hashed into a fixed number of columns,
+#   so that memory doesn't grow with the number of verbs
+#   (HashingFeatureVectorizer, see scripts/compare_feature_extractors.py)
+ml_features = "count"
+
+# How the weights of the NumPy models are stored by train-verb-models and
+# export-verb-models (see scripts/report_model_artifacts.py):
+# "float64": exact, predictions are the same as the scikit-learn pipeline's
+# "float16": half the size of float64's
+# "int8": an eighth of the size, scaled per template
+ml_weights_dtype = "float64"
+
+# Directory the ML models are saved to, by train-verb-models (--model-dir),
+# update-verb-models, export-verb-models and when a missing model is trained
+# at runtime, and loaded from first, e.g. a writable directory shared by worker
+# processes. The models that aren't there are loaded from the data/models
+# directory of the package, where they are saved if model_dir isn't set.
+# Can be set with the VERBECC_MODEL_DIR environment variable.
+model_dir: Optional[str] = os.environ.get("VERBECC_MODEL_DIR") or None
+
+# If True, only the non-zero weights of the NumPy models are stored
+# (most weights are zero), otherwise the dense weight matrix
+ml_weights_sparse = True
+
+# If True, the weights files of the NumPy models are compressed.
+# Dense uncompressed weights are memory-mapped instead of read into memory.
+ml_weights_compress = True
+
+# If > 0, the template predictions of concurrent threads are collected for up
+# to ml_batch_window_ms milliseconds, or ml_batch_max_size verbs, and predicted
+# in one batch by a background thread (BatchingPredictor), e.g. 2.0 for
+# services predicting many unknown verbs at once. 0 predicts in the caller.
+ml_batch_window_ms = 0.0
+ml_batch_max_size = 256
+
+# When the predicted template of an unknown verb can't conjugate it (its
+# ending doesn't match the infinitive), the next of the ml_top_k most probable
+# templates that can is used instead, if its probability is at least
+# ml_fallback_min_score. ml_top_k < 2 disables the fallback.
+ml_top_k = 10
+ml_fallback_min_score = 0.001
+
+# Maximum number of ML template predictions kept in the prediction cache,
+# shared by all languages and keyed by (lang, model, infinitive); 0 disables it
+prediction_cache_size = 4096
+
+# Entry evicted when the prediction cache is full:
+# "lru": the least recently used one
+# "fifo": the oldest one
+prediction_cache_policy = "lru"
+
+# If set, the prediction cache is saved to this JSON file at exit and
+# reloaded from it, so that predictions survive restarts
+prediction_cache_file: Optional[str] = None
+
+# Maximum number of results of Conjugator.conjugate, conjugate_mood and
+# conjugate_mood_tense kept in the conjugation cache, keyed by their arguments;
+# 0 disables it. The cached results are read-only (see conjugation_cache).
+conjugation_cache_size = 0
+
+# Entry evicted when the conjugation cache is full, see prediction_cache_policy
+conjugation_cache_policy = "lru"
+
+# Maximum number of auxiliary verb conjugations of the compound tenses
+# memoized per language (see Inflector.aux_conjugations); 0 disables it
+aux_conjugation_cache_size = 1024
+
+# "shared": one conjugation cache for all the Conjugators
+# "instance": one conjugation cache per Conjugator
+conjugation_cache_scope = "shared"
+
+# Directory for on-disk caches, e.g. the parsed XML snapshots.
+# Can be overridden with the VERBECC_CACHE_DIR environment variable.
+cache_dir = os.environ.get(
+    "VERBECC_CACHE_DIR",
+    os.path.join(
+        os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        ),
+        "verbecc",
+    ),
+)
+
+# If True, the parsed verbs and conjugation templates are stored in
+# a binary snapshot in cache_dir after the first XML parse and subsequent
+# loads read the snapshot instead of re-parsing the XML.
+snapshots = True
+
+# If True, conjugation templates are only indexed at load time and each
+# ConjugationTemplate is built the first time it is used.
+lazy_templates = False
+
+# How the conjugations XML files are validated against their DTD when parsed:
+# "always": full DTD validation on every parse
+# "checksum": skip DTD validation if the file's SHA-256 matches the checksum
+#   recorded when it was validated at build time (see validate-verb-xml),
+#   otherwise fall back to full DTD validation
+xml_validation = "always"
+
+# If True, the verbs of each language are stored in a compact binary table
+# in cache_dir which is memory-mapped, so that all processes on a host
+# share a single copy of it (see MappedVerbs).
+mmap_verbs = False
+
+# Maximum number of Verb objects of the looked up verbs kept per language by
+# MappedVerbs, which keep their bindings (see Inflector.bind_verb) so that
+# verbs looked up again aren't bound again; 0 disables it
+mapped_verbs_cache_size = 1024
@@ -1,5 +1,5 @@
-from bisect import bisect_left
-from typing import List, Iterator
+import threading
+from typing import Callable, Dict, List, Iterator, Optional, Tuple
 
 from verbecc.src.defs.types.data.conjugation_template import ConjugationTemplate
 from verbecc.src.defs.types.exceptions import TemplateNotFoundError
@@ -13,6 +13,9 @@ class Conjugations:
         self.lang = lang
         self._templates: List[ConjugationTemplate] = templates
         self._keys = [template.name for template in self._templates]
+        self._templates_by_name: Dict[str, ConjugationTemplate] = {}
+        for template in self._templates:
+            self._templates_by_name.setdefault(template.name, template)
 
     def __len__(self) -> int:
         """
@@ -23,9 +26,66 @@ class Conjugations:
     def __iter__(self) -> Iterator[ConjugationTemplate]:
         return iter(self._templates)
 
+    def get_template_names(self) -> List[str]:
+        return list(self._keys)
+
     def find_template(self, name: str) -> ConjugationTemplate:
-        """Assumes templates are already sorted by name"""
-        i = bisect_left(self._keys, name)
-        if i != len(self._keys) and self._keys[i] == name:
-            return self._templates[i]
-        raise TemplateNotFoundError
+        template = self._templates_by_name.get(name)
+        if template is None:
+            raise TemplateNotFoundError
+        return template
+
+
+class LazyConjugations(Conjugations):
+    """
+    Conjugations which only holds an index of template name to the
+    template's serialized source (e.g. the <template> XML element)
+    and materializes each ConjugationTemplate the first time it is
+    requested. Startup time and memory then scale with the number of
+    templates actually used rather than the number of templates defined.
+    See config.lazy_templates
+    """
+
+    def __init__(
+        self,
+        lang: LangCodeISO639_1,
+        sources: List[Tuple[str, bytes]],
+        materialize: Callable[[bytes], ConjugationTemplate],
+    ) -> None:
+        """
+        :param sources: list of (template name, template source) in document order
+        :param materialize: function which builds a ConjugationTemplate from its source
+        """
+        self.lang = lang
+        sources = sorted(sources, key=lambda x: x[0])
+        self._keys = [name for name, _ in sources]
+        self._sources = [source for _, source in sources]
+        self._indexes_by_name: Dict[str, int] = {}
+        for i, name in enumerate(self._keys):
+            self._indexes_by_name.setdefault(name, i)
+        self._templates: List[Optional[ConjugationTemplate]] = [None] * len(sources)
+        self._materialize = materialize
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[ConjugationTemplate]:
+        return (self._get_template(i) for i in range(len(self._keys)))
+
+    def get_materialized_count(self) -> int:
+        return sum(1 for t in self._templates if t is not None)
+
+    def find_template(self, name: str) -> ConjugationTemplate:
+        i = self._indexes_by_name.get(name)
+        if i is None:
+            raise TemplateNotFoundError
+        return self._get_template(i)
+
+    def _get_template(self, i: int) -> ConjugationTemplate:
+        template = self._templates[i]
+        if template is None:
+            template = self._materialize(self._sources[i])
+            with self._lock:
+                # another thread may have materialized it in the meantime
+                if self._templates[i] is None:
+                    self._templates[i] = template
+                template = self._templates[i]
+        return template
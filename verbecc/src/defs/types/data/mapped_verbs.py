@@ -0,0 +1,223 @@
+"""
+Compact, memory-mapped verb table.
+
+A Verbs collection keeps a Verb object plus several strings per verb in
+each process. The verb table stores the same data in a binary file made of
+fixed-width arrays (string offsets and template ids) and one UTF-8
+string blob. MappedVerbs opens the file with mmap, so every process on a
+host (e.g. gunicorn/uvicorn workers) shares the same physical pages, and
+looks verbs up by binary search directly over the mapped arrays.
+Verb objects are only created for the verbs that are looked up.
+
+Binary search compares UTF-8 bytes, which sort in the same order as
+the code points Python uses to sort str, so the table has exactly
+the same order as the sorted lists in Verbs.
+
+File layout (native byte order, the file is a host-local cache):
+    header: magic, format version, verb count, template count
+            and the byte offset of each of the following sections
+    infinitive_offsets  uint32[n+1]  infinitives, sorted
+    folded_offsets      uint32[n+1]  infinitives without accents, sorted
+    folded_order        uint32[n]    verb index of each folded_offsets entry
+    translation_offsets uint32[n+1]  English translations, by verb index
+    template_offsets    uint32[t+1]  template names
+    template_ids        uint16[n]    template of each verb
+    strings             UTF-8 blob that all *_offsets point into
+"""
+
+from array import array
+import mmap
+import struct
+from typing import Iterable, Iterator, List, Optional
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.data.verb import Verb
+from verbecc.src.defs.types.data.verbs import Verbs
+from verbecc.src.defs.types.exceptions import VerbsParserError
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+from verbecc.src.utils import string_utils
+from verbecc.src.utils.bounded_cache import BoundedCache
+from verbecc.src.utils.file_utils import atomic_write_bytes
+
+VERB_TABLE_MAGIC = b"VBCTABLE"
+VERB_TABLE_FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("=8s10I")
+_SECTIONS = (
+    "infinitive_offsets",
+    "folded_offsets",
+    "folded_order",
+    "translation_offsets",
+    "template_offsets",
+    "template_ids",
+    "strings",
+)
+
+
+def write_verb_table(path: str, verbs: List[Verb]) -> None:
+    verbs = sorted(verbs, key=lambda v: v.infinitive)
+    templates = sorted(set(v.template for v in verbs))
+    template_ids = {name: i for i, name in enumerate(templates)}
+    folded_order = sorted(
+        range(len(verbs)), key=lambda i: verbs[i].infinitive_no_accents
+    )
+    strings = bytearray()
+
+    def add_strings(values: Iterable[str]) -> bytes:
+        offsets = array("I", [len(strings)])
+        for value in values:
+            strings.extend(value.encode("utf-8"))
+            offsets.append(len(strings))
+        return offsets.tobytes()
+
+    sections = {
+        "infinitive_offsets": add_strings(v.infinitive for v in verbs),
+        "folded_offsets": add_strings(
+            verbs[i].infinitive_no_accents for i in folded_order
+        ),
+        "folded_order": array("I", folded_order).tobytes(),
+        "translation_offsets": add_strings(v.translation_en for v in verbs),
+        "template_offsets": add_strings(templates),
+        "template_ids": array("H", [template_ids[v.template] for v in verbs]).tobytes(),
+    }
+    sections["strings"] = bytes(strings)
+    buf = bytearray(_HEADER.size)
+    offsets = []
+    for name in _SECTIONS:
+        buf.extend(b"\0" * (-len(buf) % 4))  # align each section to 4 bytes
+        offsets.append(len(buf))
+        buf.extend(sections[name])
+    _HEADER.pack_into(
+        buf,
+        0,
+        VERB_TABLE_MAGIC,
+        VERB_TABLE_FORMAT_VERSION,
+        len(verbs),
+        len(templates),
+        *offsets,
+    )
+    atomic_write_bytes(path, bytes(buf))
+
+
+class MappedVerbs(Verbs):
+    """
+    Verbs backed by a memory-mapped verb table, see write_verb_table
+    and config.mmap_verbs
+    """
+
+    def __init__(self, lang: LangCodeISO639_1, path: str) -> None:
+        self.lang = lang
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mm, 0)
+        magic, version, n_verbs, n_templates = header[:4]
+        if magic != VERB_TABLE_MAGIC or version != VERB_TABLE_FORMAT_VERSION:
+            raise VerbsParserError("Invalid verb table {}".format(path))
+        offsets = dict(zip(_SECTIONS, header[4:]))
+        view = memoryview(self._mm)
+
+        def section(name: str, fmt: str, count: int) -> memoryview:
+            start = offsets[name]
+            return view[start : start + count * struct.calcsize(fmt)].cast(fmt)
+
+        self._n_verbs = n_verbs
+        self._infinitive_offsets = section("infinitive_offsets", "I", n_verbs + 1)
+        self._folded_offsets = section("folded_offsets", "I", n_verbs + 1)
+        self._folded_order = section("folded_order", "I", n_verbs)
+        self._translation_offsets = section("translation_offsets", "I", n_verbs + 1)
+        self._template_offsets = section("template_offsets", "I", n_templates + 1)
+        self._template_ids = section("template_ids", "H", n_verbs)
+        self._strings = offsets["strings"]
+        # Verb objects of the most recently looked up verbs, which keep their
+        # bindings (see Inflector.bind_verb).
+        # None if disabled, see config.mapped_verbs_cache_size
+        self._looked_up: Optional[BoundedCache[int, Verb]] = None
+        if config.mapped_verbs_cache_size > 0:
+            self._looked_up = BoundedCache(config.mapped_verbs_cache_size)
+        self._init_template_predictor()
+
+    def __len__(self) -> int:
+        return self._n_verbs
+
+    def __iter__(self) -> Iterator[Verb]:
+        return (self._get_verb(i) for i in range(self._n_verbs))
+
+    @property
+    def infinitives(self) -> List[str]:
+        return [
+            self._get_str(self._infinitive_offsets, i) for i in range(self._n_verbs)
+        ]
+
+    def _find_known_verb(self, infinitive: str) -> Optional[Verb]:
+        """See Verbs._find_known_verb"""
+        query = infinitive.lower()
+        key = query.encode("utf-8")
+        i = self._bisect_left(self._infinitive_offsets, key)
+        if i != self._n_verbs and self._get_bytes(self._infinitive_offsets, i) == key:
+            return self._get_looked_up_verb(i)
+        key = string_utils.strip_accents(query).encode("utf-8")
+        i = self._bisect_left(self._folded_offsets, key)
+        if i != self._n_verbs and self._get_bytes(self._folded_offsets, i) == key:
+            return self._get_looked_up_verb(self._folded_order[i])
+        return None
+
+    def find_verbs_by_infinitive_no_accents(self, infinitive: str) -> List[Verb]:
+        """See Verbs.find_verbs_by_infinitive_no_accents"""
+        key = string_utils.strip_accents(infinitive.lower()).encode("utf-8")
+        verbs = []
+        i = self._bisect_left(self._folded_offsets, key)
+        while i < self._n_verbs and self._get_bytes(self._folded_offsets, i) == key:
+            verbs.append(self._get_looked_up_verb(self._folded_order[i]))
+            i += 1
+        return verbs
+
+    def get_verbs_that_start_with(self, pre: str, max_results: int = 10) -> List[str]:
+        """
+        Same results as Verbs.get_verbs_that_start_with (i.e. in infinitive order),
+        but the matches are found by binary search over the folded infinitives
+        instead of scanning every verb.
+        """
+        prefix = string_utils.strip_accents(pre.lower()).encode("utf-8")
+        matches = []
+        i = self._bisect_left(self._folded_offsets, prefix)
+        while i < self._n_verbs and self._get_bytes(self._folded_offsets, i).startswith(
+            prefix
+        ):
+            matches.append(self._folded_order[i])
+            i += 1
+        return [
+            self._get_str(self._infinitive_offsets, j)
+            for j in sorted(matches)[:max_results]
+        ]
+
+    def _bisect_left(self, offsets: memoryview, key: bytes) -> int:
+        lo, hi = 0, self._n_verbs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get_bytes(offsets, mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _get_bytes(self, offsets: memoryview, i: int) -> bytes:
+        return self._mm[self._strings + offsets[i] : self._strings + offsets[i + 1]]
+
+    def _get_str(self, offsets: memoryview, i: int) -> str:
+        return self._get_bytes(offsets, i).decode("utf-8")
+
+    def _get_looked_up_verb(self, i: int) -> Verb:
+        if self._looked_up is None:
+            return self._get_verb(i)
+        verb = self._looked_up.get(i)
+        if verb is None:
+            verb = self._get_verb(i)
+            self._looked_up.put(i, verb)
+        return verb
+
+    def _get_verb(self, i: int) -> Verb:
+        return Verb(
+            self._get_str(self._infinitive_offsets, i),
+            self._get_str(self._template_offsets, self._template_ids[i]),
+            self._get_str(self._translation_offsets, i),
+        )
@@ -1,8 +1,38 @@
-from typing import List
+from typing import List, Tuple
 
 from verbecc.src.defs.types.data.element import Element
 from verbecc.src.defs.types.person import Person
 
+# (delete_count, suffix, is_placeholder): the compiled form of an ending, see
+# compile_ending
+EndingEdit = Tuple[int, str, bool]
+
+
+def compile_ending(ending: str) -> EndingEdit:
+    """
+    Compiles a template ending into the edit it makes to the verb stem:
+    delete_count letters are deleted from the end of the stem, then suffix
+    is appended. E.g. "-guí" -> (1, "guí", False), "ez" -> (0, "ez", False)
+
+    A single "-" is the placeholder for tenses that are not conjugated in
+    some verbs -> (0, "-", True)
+    """
+    if ending == "-":
+        return (0, ending, True)
+    delete_count = 0
+    while ending != "-" and ending.startswith("-"):
+        ending = ending[1:]
+        delete_count += 1
+    return (delete_count, ending, False)
+
+
+def apply_ending_edit(verb_stem: str, edit: EndingEdit) -> str:
+    """Applies an edit compiled by compile_ending to verb_stem"""
+    delete_count, suffix, _ = edit
+    if delete_count:
+        return verb_stem[:-delete_count] + suffix
+    return verb_stem + suffix
+
 
 class PersonEnding(Element):
     """
@@ -20,6 +50,8 @@ class PersonEnding(Element):
     def __init__(self, person: Person, endings: List[str]) -> None:
         self.person = person
         self.endings = endings
+        # endings compiled once, so that conjugating is slice-and-concatenate
+        self.edits = [compile_ending(ending) for ending in endings]
 
     def get_person(self) -> Person:
         return self.person
@@ -35,5 +67,16 @@ class PersonEnding(Element):
             return self.endings[1]
         return self.endings[0]
 
+    def get_edits(self) -> List[EndingEdit]:
+        return self.edits
+
+    def get_edit(self) -> EndingEdit:
+        return self.edits[0]
+
+    def get_alternate_edit_if_available(self) -> EndingEdit:
+        if len(self.edits) > 1:
+            return self.edits[1]
+        return self.edits[0]
+
     def __repr__(self) -> str:
         return "person={} endings={}".format(self.person, self.endings)
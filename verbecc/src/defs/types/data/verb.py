@@ -1,4 +1,7 @@
+from typing import Optional
+
 from verbecc.src.utils.string_utils import strip_accents
+from verbecc.src.defs.types.data.conjugation_template import ConjugationTemplate
 from verbecc.src.defs.types.data.element import Element
 
 
@@ -13,6 +16,14 @@ class Verb(Element):
         self.template = template
         self.translation_en = translation_en
         self.impersonal = False
+        # Resolved once by Inflector.bind_verb:
+        # the template named by self.template, None until bound
+        self.conjugation_template: Optional[ConjugationTemplate] = None
+        # the stem of the infinitive and of the inflected forms
+        # (i.e. after the template's modify-stem)
+        self.verb_stem = ""
+        self.inflected_verb_stem = ""
+        self.can_be_reflexive = True
 
     def __repr__(self) -> str:
         return "infinitive={} infinitive_no_accents={} template={} translation_en={} impersonal={} predicted={} pred_score={}".format(
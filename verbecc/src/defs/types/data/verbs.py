@@ -1,31 +1,61 @@
-from bisect import bisect_left
-from typing import Iterator, List
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 from verbecc.src.defs.constants import config
 from verbecc.src.defs.types.data.verb import Verb
-from verbecc.src.defs.types.exceptions import VerbNotFoundError
+from verbecc.src.defs.types.exceptions import ModelNotFoundError, VerbNotFoundError
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1
-from verbecc.src.mlconjug import mlconjug
+from verbecc.src.mlconjug import prediction_cache
 from verbecc.src.utils import string_utils
 
+if TYPE_CHECKING:
+    from verbecc.src.mlconjug.batching import BatchingPredictor
+    from verbecc.src.mlconjug.inference import InferenceModel
+    from verbecc.src.mlconjug.mlconjug import TemplatePredictor
+    from verbecc.src.mlconjug.suffix_trie import (
+        SuffixTriePredictor,
+        SuffixTriePrefilter,
+    )
+
+# (infinitive, template name) -> whether the template can conjugate the
+# infinitive, see Inflector.is_template_compatible
+TemplateFilter = Callable[[str, str], bool]
+
+AnyTemplatePredictor = Union[
+    "InferenceModel",
+    "TemplatePredictor",
+    "SuffixTriePredictor",
+    "SuffixTriePrefilter",
+    "BatchingPredictor",
+]
+
 
 class Verbs:
     def __init__(self, lang: LangCodeISO639_1, verbs: List[Verb]) -> None:
         self.lang = lang
         self._verbs = verbs
-        self._verbs_no_accents = sorted(
-            self._verbs, key=lambda v: v.infinitive_no_accents
-        )
         self.infinitives = [v.infinitive for v in verbs]
-
-        self.infinitives_no_accents = [
-            v.infinitive_no_accents for v in self._verbs_no_accents
-        ]
-        self.template_predictor = None
-        if config.ml:
-            self.template_predictor = mlconjug.TemplatePredictor(
-                [(v.infinitive, v.template) for v in verbs], self.lang
-            )
+        # infinitive -> verb
+        self._verbs_by_infinitive: Dict[str, Verb] = {}
+        # infinitive without accents -> verbs, in infinitive order, e.g.
+        # 'abanar' -> [abanar, abañar] in es
+        self._verbs_by_infinitive_no_accents: Dict[str, List[Verb]] = {}
+        for verb in verbs:
+            self._verbs_by_infinitive.setdefault(verb.infinitive, verb)
+            self._verbs_by_infinitive_no_accents.setdefault(
+                verb.infinitive_no_accents, []
+            ).append(verb)
+        self._init_template_predictor()
 
     def __len__(self) -> int:
         """
@@ -36,34 +66,309 @@ class Verbs:
     def __iter__(self) -> Iterator[Verb]:
         return iter(self._verbs)
 
-    def find_verb_by_infinitive(self, infinitive: str) -> Verb:
+    def find_verb_by_infinitive(
+        self, infinitive: str, template_filter: Optional[TemplateFilter] = None
+    ) -> Verb:
         """First try to find with accents, e.g. if infinitive is 'Abañar',
         search for 'abañar' and not 'abanar'.
         If not found then try searching with accents stripped.
         If all else fails, use machine-learning magic to predict
         which conjugation template should be used.
+        :param template_filter: if given, a predicted template it rejects is
+            replaced by the next most probable one it accepts, see
+            _resolve_incompatible_templates
         """
+        verb = self._find_known_verb(infinitive)
+        if verb is None:
+            verb = self._predict_verbs([infinitive], template_filter)[0]
+        return verb
+
+    def find_verbs_by_infinitives(
+        self, infinitives: List[str], template_filter: Optional[TemplateFilter] = None
+    ) -> List[Verb]:
+        """
+        Same as find_verb_by_infinitive for each infinitive, but the templates
+        of all the verbs that aren't found are predicted in a single batch.
+        """
+        verbs = [self._find_known_verb(infinitive) for infinitive in infinitives]
+        unknown = [i for i, verb in enumerate(verbs) if verb is None]
+        if unknown:
+            predicted = self._predict_verbs(
+                [infinitives[i] for i in unknown], template_filter
+            )
+            for i, verb in zip(unknown, predicted):
+                verbs[i] = verb
+        return cast(List[Verb], verbs)
+
+    def find_verbs_by_infinitive_no_accents(self, infinitive: str) -> List[Verb]:
+        """
+        Returns the known verbs whose infinitive is the same as infinitive
+        once accents are stripped, in infinitive order, e.g. 'abanar' ->
+        [abanar, abañar] in es. find_verb_by_infinitive returns the first one
+        when there is no exact match.
+        """
+        return list(
+            self._verbs_by_infinitive_no_accents.get(
+                string_utils.strip_accents(infinitive.lower()), []
+            )
+        )
+
+    def _find_known_verb(self, infinitive: str) -> Optional[Verb]:
+        """Finds the verb with or without accents, see find_verb_by_infinitive"""
         query = infinitive.lower()
-        i = bisect_left(self.infinitives, query)
-        if i != len(self.infinitives) and self.infinitives[i] == query:
-            return self._verbs[i]
-        query = string_utils.strip_accents(infinitive.lower())
-
-        i = bisect_left(self.infinitives_no_accents, query)
-        if (
-            i != len(self.infinitives_no_accents)
-            and self.infinitives_no_accents[i] == query
-        ):
-            return self._verbs_no_accents[i]
+        verb = self._verbs_by_infinitive.get(query)
+        if verb is None:
+            candidates = self._verbs_by_infinitive_no_accents.get(
+                string_utils.strip_accents(query)
+            )
+            if candidates:
+                verb = candidates[0]
+        return verb
+
+    def _init_template_predictor(self) -> None:
+        self._template_predictor: Optional[AnyTemplatePredictor] = None
+        # fingerprint of the model of the template predictor, part of the
+        # keys of its predictions in the prediction cache
+        self._model_fingerprint = ""
+        self._template_predictor_lock = threading.Lock()
+
+    @property
+    def template_predictor(self) -> AnyTemplatePredictor:
+        """
+        Built on first use, i.e. the first time a verb isn't found, so that
+        the ML dependencies are only imported and the model only loaded when
+        needed. See config.ml_engine.
+        """
+        if self._template_predictor is None:
+            with self._template_predictor_lock:
+                if self._template_predictor is None:
+                    template_predictor = self._load_template_predictor()
+                    if config.ml_batch_window_ms > 0:
+                        from verbecc.src.mlconjug.batching import BatchingPredictor
+
+                        template_predictor = BatchingPredictor(
+                            template_predictor,
+                            config.ml_batch_window_ms,
+                            config.ml_batch_max_size,
+                        )
+                    self._model_fingerprint = prediction_cache.get_model_fingerprint(
+                        template_predictor.metadata
+                    )
+                    prediction_cache.load_persisted_predictions(
+                        self.lang, self._model_fingerprint
+                    )
+                    self._template_predictor = template_predictor
+        return self._template_predictor
+
+    def _load_template_predictor(self) -> AnyTemplatePredictor:
+        if config.ml_engine == "suffix_trie":
+            return self._build_suffix_trie()
+        predictor = self._load_model()
+        if config.ml_suffix_trie_min_support > 0:
+            from verbecc.src.mlconjug.suffix_trie import SuffixTriePrefilter
+
+            return SuffixTriePrefilter(
+                self._build_suffix_trie(),
+                predictor,
+                config.ml_suffix_trie_min_support,
+            )
+        return predictor
+
+    def _build_suffix_trie(self) -> "SuffixTriePredictor":
+        from verbecc.src.mlconjug.suffix_trie import SuffixTriePredictor
+
+        return SuffixTriePredictor(
+            [(v.infinitive, v.template) for v in self], self.lang
+        )
+
+    def _load_model(self) -> Union["InferenceModel", "TemplatePredictor"]:
+        if config.ml_engine == "numpy":
+            from verbecc.src.mlconjug import inference
+
+            model = inference.load_inference_model(self.lang)
+            if model is not None:
+                return model
+        from verbecc.src.mlconjug import mlconjug
+
+        return mlconjug.TemplatePredictor(
+            [(v.infinitive, v.template) for v in self], self.lang
+        )
+
+    def is_template_predictor_loaded(self) -> bool:
+        return self._template_predictor is not None
+
+    def close(self) -> None:
+        """
+        Stops the background thread of the template predictor's
+        BatchingPredictor, if any, which would otherwise keep the predictor
+        (and this collection) alive for the life of the process.
+        The verbs predicted afterwards aren't batched.
+        """
+        from verbecc.src.mlconjug.batching import BatchingPredictor
+
+        with self._template_predictor_lock:
+            template_predictor = self._template_predictor
+            if isinstance(template_predictor, BatchingPredictor):
+                template_predictor.close()
+                self._template_predictor = template_predictor.predictor
+
+    def _predict_verbs(
+        self,
+        infinitives: List[str],
+        template_filter: Optional[TemplateFilter] = None,
+    ) -> List[Verb]:
+        """
+        Fallback for verbs that aren't in the collection: use machine-learning
+        magic to predict which conjugation template should be used.
+        Raises VerbNotFoundError if ML is disabled or, in strict mode
+        (config.missing_model = "raise"), if the model hasn't been built.
+        """
         if config.ml:
-            template, pred_score = self.template_predictor.predict(query)
-            ret = Verb(infinitive.lower(), template, translation_en="")
-            ret.predicted = True
-            ret.pred_score = pred_score
+            try:
+                template_predictor = self.template_predictor
+            except ModelNotFoundError as e:
+                raise VerbNotFoundError(infinitives[0]) from e
+            queries = [
+                string_utils.strip_accents(infinitive.lower())
+                for infinitive in infinitives
+            ]
+            if template_filter is None:
+                predictions = self._predict_templates(template_predictor, queries)
+            else:
+                predictions = self._predict_compatible_templates(
+                    template_predictor,
+                    [infinitive.lower() for infinitive in infinitives],
+                    queries,
+                    template_filter,
+                )
+            ret = []
+            for infinitive, (template, pred_score) in zip(infinitives, predictions):
+                verb = Verb(infinitive.lower(), template, translation_en="")
+                verb.predicted = True
+                verb.pred_score = pred_score
+                ret.append(verb)
             return ret
         else:
             raise VerbNotFoundError
 
+    def _predict_templates(
+        self,
+        template_predictor: AnyTemplatePredictor,
+        queries: List[str],
+    ) -> List[Tuple[str, float]]:
+        """
+        Predicts the template of each query, going through the prediction
+        cache (see config.prediction_cache_size). The cached predictions are
+        keyed by model, so a retrained or updated model doesn't get the
+        predictions of the one it replaces.
+        """
+        return self._get_cached_predictions(
+            queries,
+            "",
+            lambda misses: template_predictor.predict_many(
+                [queries[i] for i in misses]
+            ),
+        )
+
+    def _predict_compatible_templates(
+        self,
+        template_predictor: AnyTemplatePredictor,
+        infinitives: List[str],
+        queries: List[str],
+        template_filter: TemplateFilter,
+    ) -> List[Tuple[str, float]]:
+        """
+        Same as _predict_templates, followed by _resolve_incompatible_templates.
+        The resolved predictions are cached too, by infinitive, which the
+        filter sees, and by the filter's name and config.ml_top_k and
+        ml_fallback_min_score, so that the top-k of a verb whose most probable
+        template is rejected are only predicted once.
+        """
+
+        def predict(misses: List[int]) -> List[Tuple[str, float]]:
+            predictions = self._predict_templates(
+                template_predictor, [queries[i] for i in misses]
+            )
+            self._resolve_incompatible_templates(
+                template_predictor,
+                [infinitives[i] for i in misses],
+                [queries[i] for i in misses],
+                predictions,
+                template_filter,
+            )
+            return predictions
+
+        return self._get_cached_predictions(
+            infinitives,
+            "{}:{}:{}".format(
+                getattr(template_filter, "__qualname__", repr(template_filter)),
+                config.ml_top_k,
+                config.ml_fallback_min_score,
+            ),
+            predict,
+        )
+
+    def _get_cached_predictions(
+        self,
+        queries: List[str],
+        variant: str,
+        predict: Callable[[List[int]], List[Tuple[str, float]]],
+    ) -> List[Tuple[str, float]]:
+        """
+        The cached prediction of each query, see prediction_cache, with
+        predict(indexes of the queries that aren't cached) for the others
+        :param variant: "" for the predictions of the model, otherwise what
+            was applied to them
+        """
+        cache = prediction_cache.get_prediction_cache()
+        if cache is None:
+            return predict(list(range(len(queries))))
+        keys = [
+            (str(self.lang), self._model_fingerprint, query, variant)
+            for query in queries
+        ]
+        predictions = [cache.get(key) for key in keys]
+        misses = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if misses:
+            for i, prediction in zip(misses, predict(misses)):
+                predictions[i] = prediction
+                cache.put(keys[i], prediction)
+        return cast(List[Tuple[str, float]], predictions)
+
+    def _resolve_incompatible_templates(
+        self,
+        template_predictor: AnyTemplatePredictor,
+        infinitives: List[str],
+        queries: List[str],
+        predictions: List[Tuple[str, float]],
+        template_filter: TemplateFilter,
+    ) -> None:
+        """
+        Replaces, in place, each predicted template that template_filter
+        rejects by the most probable of the next config.ml_top_k templates
+        that it accepts and that scores at least config.ml_fallback_min_score.
+        The top-k of all the rejected verbs are predicted in one batch.
+        If there is no such template the prediction is kept, and conjugating
+        the verb raises ConjugatorError as before.
+        """
+        rejected = [
+            i
+            for i, (template, _) in enumerate(predictions)
+            if not template_filter(infinitives[i], template)
+        ]
+        if not rejected or config.ml_top_k < 2:
+            return
+        candidates = template_predictor.predict_topk_many(
+            [queries[i] for i in rejected], config.ml_top_k
+        )
+        for i, top_k in zip(rejected, candidates):
+            for template, pred_score in top_k:
+                if pred_score < config.ml_fallback_min_score:
+                    break
+                if template_filter(infinitives[i], template):
+                    predictions[i] = (template, pred_score)
+                    break
+
     def get_verbs_that_start_with(self, pre: str, max_results: int = 10) -> List[str]:
         ret: List[str] = []
         pre_no_accents = string_utils.strip_accents(pre.lower())
@@ -22,6 +22,10 @@ class InvalidTenseError(Exception):
     pass
 
 
+class ModelNotFoundError(Exception):
+    pass
+
+
 class TemplateNotFoundError(Exception):
     pass
 
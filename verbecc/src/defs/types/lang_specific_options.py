@@ -1,10 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Hashable, Optional
 
 
 class LangSpecificOptions(ABC):
     """
     Options specific to certain languages (e.g. Spanish Voseo).
+    They can be modified, so caches key them by get_options_key.
     """
 
     pass
+
+
+def get_options_key(options: Optional[LangSpecificOptions]) -> Hashable:
+    """
+    A snapshot of the type and attribute values of options, for cache keys,
+    so that options modified after being used don't alias their cached entries
+    """
+    if options is None:
+        return None
+    return (type(options), tuple(sorted(vars(options).items())))
@@ -15,12 +15,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple
 
 from verbecc.src.conjugator.conjugation_object import ConjugationObjects
+from verbecc.src.defs.constants import config
 from verbecc.src.defs.constants.grammar_defines import PARTICIPLE_INFLECTIONS
 from verbecc.src.defs.types.data.conjugation_template import ConjugationTemplate
-from verbecc.src.defs.types.data.person_ending import PersonEnding
+from verbecc.src.defs.types.data.person_ending import (
+    PersonEnding,
+    apply_ending_edit,
+    compile_ending,
+)
 from verbecc.src.defs.types.data.tense_template import TenseTemplate
 from verbecc.src.defs.types.data.verb import Verb
 from verbecc.src.defs.types.data.verbs import Verbs
@@ -34,6 +39,12 @@ from verbecc.src.defs.types.person import Person, is_singular
 from verbecc.src.defs.types.tense import TenseEn as Tense
 from verbecc.src.parsers.conjugations_parser import ConjugationsParser
 from verbecc.src.parsers.verbs_parser import VerbsParser
+from verbecc.src.utils.bounded_cache import BoundedCache
+from verbecc.src.utils.string_utils import strip_accents
+
+# The conjugation of each person of an auxiliary verb tense, see
+# Inflector.aux_conjugations
+AuxConjugation = Tuple[Tuple[Person, str], ...]
 
 
 class Inflector(ABC):
@@ -47,6 +58,15 @@ class Inflector(ABC):
     def __init__(self) -> None:
         self._verbs: Verbs = VerbsParser(self.lang).parse()
         self._conjugations = ConjugationsParser(self.lang).parse()
+        # Auxiliary verb conjugations of the compound tenses, memoized by
+        # Conjugator._get_aux_conjugation per (aux verb, mood, tense, options)
+        # and shared by the Conjugators of the language.
+        # None if disabled, see config.aux_conjugation_cache_size
+        self.aux_conjugations: Optional[
+            BoundedCache[Tuple[Hashable, ...], AuxConjugation]
+        ] = None
+        if config.aux_conjugation_cache_size > 0:
+            self.aux_conjugations = BoundedCache(config.aux_conjugation_cache_size)
 
     @property
     @abstractmethod
@@ -56,6 +76,10 @@ class Inflector(ABC):
     def get_verbs(self) -> List[Verb]:
         return list(self._verbs)
 
+    def close(self) -> None:
+        """Stops the background threads of the verbs, see Verbs.close"""
+        self._verbs.close()
+
     def get_infinitives(self) -> List[str]:
         return self._verbs.infinitives
 
@@ -63,10 +87,21 @@ class Inflector(ABC):
         return list(self._conjugations)
 
     def get_template_names(self) -> List[str]:
-        return [t.name for t in self._conjugations]
+        return self._conjugations.get_template_names()
 
     def find_verb_by_infinitive(self, infinitive: str) -> Verb:
-        return self._verbs.find_verb_by_infinitive(infinitive)
+        """
+        Finds the verb, or predicts its template, skipping predicted templates
+        whose ending doesn't fit the infinitive (see is_template_compatible)
+        """
+        return self._verbs.find_verb_by_infinitive(
+            infinitive, self.is_template_compatible
+        )
+
+    def find_verbs_by_infinitives(self, infinitives: List[str]) -> List[Verb]:
+        return self._verbs.find_verbs_by_infinitives(
+            infinitives, self.is_template_compatible
+        )
 
     def find_template(self, name: str) -> ConjugationTemplate:
         return self._conjugations.find_template(name)
@@ -83,15 +118,44 @@ class Inflector(ABC):
         (only requires the last n-1 chars of template ending to match infinitive ending)
         """
         _, template_ending = template_name.split(":")
-        if not infinitive.endswith(template_ending):
+        if not self.is_template_compatible(infinitive, template_name):
             raise ConjugatorError(
                 "Template {} ending doesn't "
                 "match infinitive {}".format(template_name, infinitive)
             )
         return infinitive[: len(infinitive) - len(template_ending)]
 
+    def is_template_compatible(self, infinitive: str, template_name: str) -> bool:
+        """Whether get_verb_stem_from_template_name accepts the template"""
+        return infinitive.endswith(template_name.split(":")[1])
+
+    def bind_verb(self, verb: Verb) -> Verb:
+        """
+        Resolves, the first time verb is conjugated, everything conjugating it
+        needs: its ConjugationTemplate, its stems (with the template's
+        modify-stem applied to inflected_verb_stem) and its impersonal and
+        can_be_reflexive flags, so that later lookups of a known verb are a
+        single index hit. Verbs are bound on first use rather than when they
+        are loaded so that lazy templates (config.lazy_templates) and the
+        mapped verb table (config.mmap_verbs) stay lazy.
+        Returns verb.
+        """
+        if verb.conjugation_template is None:
+            template = self.find_template(verb.template)
+            verb.verb_stem = self.get_verb_stem_from_template_name(
+                verb.infinitive, template.name
+            )
+            verb.inflected_verb_stem = verb.verb_stem
+            if template.modify_stem == "strip-accents":
+                verb.inflected_verb_stem = strip_accents(verb.verb_stem)
+            verb.impersonal = self._is_impersonal_template(template)
+            verb.can_be_reflexive = self._verb_can_be_reflexive(verb)
+            # set last, a verb is bound once this is set
+            verb.conjugation_template = template
+        return verb
+
     def verb_can_be_reflexive(self, infinitive: str) -> bool:
-        return not self._is_impersonal_verb(infinitive)
+        return self.bind_verb(self.find_verb_by_infinitive(infinitive)).can_be_reflexive
 
     def split_reflexive(self, infinitive: str) -> Tuple[bool, str]:
         """
@@ -230,11 +294,11 @@ class Inflector(ABC):
         Caution: A single "-" is also used as the placeholder for tenses that are
         not conjugated, in some verbs. "-" should only delete from the stem if it
         is followed by one or more characters.
+
+        The Conjugator applies the endings compiled when the templates are
+        parsed instead (PersonEnding.edits, see compile_ending).
         """
-        while ending != "-" and ending.startswith("-"):
-            ending = ending[1:]
-            verb_stem = verb_stem[:-1]
-        return verb_stem + ending
+        return apply_ending_edit(verb_stem, compile_ending(ending))
 
     def add_adverb_if_applicable(self, s: str, mood: Mood, tense: Tense) -> str:
         return s
@@ -317,3 +381,11 @@ class Inflector(ABC):
 
     def _is_impersonal_verb(self, infinitive: str) -> bool:
         return False
+
+    def _is_impersonal_template(self, template: ConjugationTemplate) -> bool:
+        """Whether the verbs of template are impersonal, see bind_verb"""
+        return False
+
+    def _verb_can_be_reflexive(self, verb: Verb) -> bool:
+        """verb.can_be_reflexive, see bind_verb"""
+        return not verb.impersonal
@@ -0,0 +1,90 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+from verbecc.src.inflectors.inflector import Inflector
+from verbecc.src.inflectors.inflector_factory import InflectorFactory
+
+
+class InflectorRegistry:
+    """
+    Process-wide registry of shared Inflector instances, one per language.
+
+    Constructing an Inflector parses the verbs and conjugation templates
+    for its language, which is expensive, so all Conjugators for the same
+    language share one instance, even across threads. The parsed data isn't
+    modified after construction, only added to, and each part that is
+    filled in on use is safe to share:
+    - lazy templates (LazyConjugations) and the template predictor are
+      created under a lock, so every thread gets the same instance
+    - the prediction cache, Inflector.aux_conjugations and the verb objects
+      of MappedVerbs are BoundedCaches, which are locked
+    - Inflector.bind_verb sets the bindings of a Verb without a lock: threads
+      binding the same verb compute the same values, and a verb is only used
+      as bound once its conjugation_template, set last, is
+
+    Inflectors are constructed lazily on first use. Construction is
+    serialized per language, so concurrent callers asking for the same
+    language wait for a single construction rather than each parsing
+    the data, while different languages can be loaded in parallel.
+    """
+
+    _inflectors: Dict[LangCodeISO639_1, Inflector] = {}
+    _lang_locks: Dict[LangCodeISO639_1, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_inflector(cls, lang: LangCodeISO639_1) -> Inflector:
+        """
+        Returns the shared Inflector for lang, constructing it if necessary.
+
+        :param lang: two-letter language code (ISO 639-1 Code)
+        :type lang: LangCodeISO639_1
+        """
+        inflector = cls._inflectors.get(lang)
+        if inflector is not None:
+            return inflector
+        with cls._get_lang_lock(lang):
+            inflector = cls._inflectors.get(lang)
+            if inflector is None:
+                inflector = InflectorFactory.make_inflector(lang)
+                cls._inflectors[lang] = inflector
+            return inflector
+
+    @classmethod
+    def preload(cls, langs: Optional[Iterable[LangCodeISO639_1]] = None) -> None:
+        """
+        Constructs the Inflectors for langs ahead of time,
+        e.g. at application startup before serving requests.
+
+        :param langs: languages to load, default is all supported languages
+        """
+        if langs is None:
+            langs = SUPPORTED_LANGUAGES.keys()
+        for lang in langs:
+            cls.get_inflector(lang)
+
+    @classmethod
+    def release(cls, lang: LangCodeISO639_1) -> None:
+        """
+        Drops the registry's reference to the Inflector for lang and closes
+        it, stopping its background threads (see Verbs.close).
+        The memory is reclaimed once no Conjugator uses it any longer.
+        The next get_inflector call for lang constructs a new Inflector.
+        """
+        with cls._get_lang_lock(lang):
+            inflector = cls._inflectors.pop(lang, None)
+        if inflector is not None:
+            inflector.close()
+
+    @classmethod
+    def is_loaded(cls, lang: LangCodeISO639_1) -> bool:
+        return lang in cls._inflectors
+
+    @classmethod
+    def _get_lang_lock(cls, lang: LangCodeISO639_1) -> threading.Lock:
+        with cls._lock:
+            if lang not in cls._lang_locks:
+                cls._lang_locks[lang] = threading.Lock()
+            return cls._lang_locks[lang]
@@ -150,20 +150,25 @@ class InflectorCa(inflector.Inflector):
         "aure" and "eure" have 3 characters in common which is at least 4-1
         """
         _, template_ending = template_name.split(":")
+        if not self.is_template_compatible(infinitive, template_name):
+            raise exceptions.ConjugatorError(
+                "Template '{}' ending doesn't "
+                "match infinitive '{}', "
+                "not even a little bit".format(template_name, infinitive)
+            )
+        return infinitive[: len(infinitive) - len(template_ending)]
+
+    def is_template_compatible(self, infinitive: str, template_name: str) -> bool:
+        """See get_verb_stem_from_template_name"""
+        _, template_ending = template_name.split(":")
         infinitive_no_accents = strip_accents(infinitive)
         template_ending_no_accents = strip_accents(infinitive)
         infinitive_ending_no_accents = infinitive_no_accents[-len(template_ending) :]
-        if (
+        return not (
             not infinitive_ending_no_accents == template_ending_no_accents
             and not infinitive_no_accents[1:] == template_ending_no_accents[1:]
             and get_common_letter_count(
                 infinitive_ending_no_accents, template_ending_no_accents
             )
             < len(template_ending) - 1
-        ):
-            raise exceptions.ConjugatorError(
-                "Template '{}' ending doesn't "
-                "match infinitive '{}', "
-                "not even a little bit".format(template_name, infinitive)
-            )
-        return infinitive[: len(infinitive) - len(template_ending)]
+        )
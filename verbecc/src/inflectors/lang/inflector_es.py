@@ -1,4 +1,3 @@
-import copy
 from typing import cast, Dict, List, Tuple
 
 from verbecc.src.defs.types.gender import Gender
@@ -220,14 +219,13 @@ class InflectorEs(Inflector):
                 ):
                     # first replace with given SecondPersonSingular (tú) ending(s)
                     # with the SecondPersonPlural (vosotros) ending(s)
-                    replacement_person_ending = copy.deepcopy(
-                        tense_template.get_person_ending(Person.SecondPersonPlural)
-                    )
-                    # change replacement PersonEnding Person from second person plural to singular
-                    replacement_person_ending.person = Person.SecondPersonSingular
+                    vosotros_endings = tense_template.get_person_ending(
+                        Person.SecondPersonPlural
+                    ).get_endings()
 
                     # modify the endings for voseo to form the vos endings
-                    for i, ending in enumerate(replacement_person_ending.get_endings()):
+                    vos_endings: List[str] = []
+                    for ending in vosotros_endings:
 
                         if mood in (Mood.Indicativo, Mood.Subjuntivo):
                             # step one for indicativo and subjuntivo presente:
@@ -259,7 +257,7 @@ class InflectorEs(Inflector):
                             if ending[-1] in VOWEL_ACCENT_MAP:
                                 ending = ending[:-1] + VOWEL_ACCENT_MAP[ending[-1]]
 
-                        # update the replacement person ending with the modified ending
-                        replacement_person_ending.endings[i] = ending
-                    return replacement_person_ending
+                        vos_endings.append(ending)
+                    # a new PersonEnding, so that its endings are compiled
+                    return PersonEnding(Person.SecondPersonSingular, vos_endings)
         return person_ending
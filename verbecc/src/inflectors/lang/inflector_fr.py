@@ -1,6 +1,8 @@
 from typing import Dict, List, Tuple
 
 from verbecc.src.conjugator.conjugation_object import ConjugationObjects
+from verbecc.src.defs.types.data.conjugation_template import ConjugationTemplate
+from verbecc.src.defs.types.data.verb import Verb
 from verbecc.src.defs.types.gender import Gender
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1
 from verbecc.src.defs.types.mood import MoodFr as Mood
@@ -69,13 +71,6 @@ class InflectorFr(Inflector):
             ]
         return matches
 
-    def verb_can_be_reflexive(self, infinitive: str) -> bool:
-        return (
-            not self._is_impersonal_verb(infinitive)
-            and infinitive
-            not in VERBS_THAT_CANNOT_BE_REFLEXIVE_OTHER_THAN_IMPERSONAL_VERBS
-        )
-
     def split_reflexive(self, infinitive: str) -> Tuple[bool, str]:
         """
         "se raser" => (True, "raser")
@@ -254,13 +249,18 @@ class InflectorFr(Inflector):
         return "-" + self.get_default_pronoun(person, gender).replace("tu", "toi")
 
     def _is_impersonal_verb(self, infinitive: str) -> bool:
-        ret = False
-        verb = self.find_verb_by_infinitive(infinitive)
-        template = self.find_template(verb.template)
-        if len(
+        return self.bind_verb(self.find_verb_by_infinitive(infinitive)).impersonal
+
+    def _is_impersonal_template(self, template: ConjugationTemplate) -> bool:
+        return len(
             template.mood_templates[Mood.Indicatif]
             .tense_templates[Tense.Présent]
             .person_endings
-        ) < len(PERSONS):
-            ret = True
-        return ret
+        ) < len(PERSONS)
+
+    def _verb_can_be_reflexive(self, verb: Verb) -> bool:
+        return (
+            not verb.impersonal
+            and verb.infinitive
+            not in VERBS_THAT_CANNOT_BE_REFLEXIVE_OTHER_THAN_IMPERSONAL_VERBS
+        )
@@ -0,0 +1,167 @@
+"""
+Micro-batching of concurrent template predictions (see
+config.ml_batch_window_ms): the verbs predicted by concurrent threads or
+coroutines are queued and predicted together, so that the cost of a burst of
+single-verb predictions is that of one vectorized predict_many.
+"""
+
+import asyncio
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# A verb waiting to be predicted, its future and when it was queued
+_Request = Tuple[str, "Future[Tuple[str, float]]", float]
+
+
+class BatchingPredictor:
+    """
+    Front-end of a template predictor (any ML engine) that predicts the verbs
+    of concurrent calls in batches: a background thread waits for a verb,
+    collects the verbs queued in the next window_ms milliseconds, up to
+    max_batch_size, predicts them with one predict_many and resolves the
+    future of each. Batch sizes and queueing delays are counted, see stats().
+
+    predict, predict_many and predict_async go through the batches,
+    the other methods are those of the predictor.
+    """
+
+    def __init__(
+        self, predictor: Any, window_ms: float = 2.0, max_batch_size: int = 256
+    ) -> None:
+        if window_ms < 0:
+            raise ValueError(f"Invalid batch window {window_ms}")
+        if max_batch_size <= 0:
+            raise ValueError(f"Invalid max batch size {max_batch_size}")
+        self.predictor = predictor
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.SimpleQueue[Optional[_Request]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._predictions = 0
+        self._max_batch_size_seen = 0
+        self._queue_seconds = 0.0
+        self._max_queue_seconds = 0.0
+        self._predict_seconds = 0.0
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.predictor.metadata
+
+    @property
+    def templates(self) -> List[str]:
+        return self.predictor.templates
+
+    def submit(self, verb: str) -> "Future[Tuple[str, float]]":
+        """Queues verb, the future's result is its (template, score)"""
+        future: "Future[Tuple[str, float]]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingPredictor is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="verbecc-batching", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((verb, future, time.perf_counter()))
+        return future
+
+    def predict(self, verb: str) -> Tuple[str, float]:
+        return self.submit(verb).result()
+
+    def predict_many(self, verbs: List[str]) -> List[Tuple[str, float]]:
+        """
+        Batches of max_batch_size verbs or more are already vectorized and are
+        predicted in the calling thread, smaller ones join the queue
+        """
+        if len(verbs) >= self.max_batch_size:
+            return self.predictor.predict_many(verbs)
+        futures = [self.submit(verb) for verb in verbs]
+        return [future.result() for future in futures]
+
+    async def predict_async(self, verb: str) -> Tuple[str, float]:
+        return await asyncio.wrap_future(self.submit(verb))
+
+    def predict_topk(self, verb: str, k: int) -> List[Tuple[str, float]]:
+        return self.predictor.predict_topk(verb, k)
+
+    def predict_topk_many(
+        self, verbs: List[str], k: int
+    ) -> List[List[Tuple[str, float]]]:
+        return self.predictor.predict_topk_many(verbs, k)
+
+    def close(self) -> None:
+        """Predicts the queued verbs and stops the background thread"""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Number of batches and predictions, mean and max batch size, mean and
+        max time the verbs waited in the queue before their batch was
+        predicted, and mean time to predict a batch
+        """
+        with self._lock:
+            batches = max(self._batches, 1)
+            predictions = max(self._predictions, 1)
+            return {
+                "batches": self._batches,
+                "predictions": self._predictions,
+                "mean_batch_size": self._predictions / batches,
+                "max_batch_size": self._max_batch_size_seen,
+                "mean_queue_ms": self._queue_seconds / predictions * 1000,
+                "max_queue_ms": self._max_queue_seconds * 1000,
+                "mean_predict_ms": self._predict_seconds / batches * 1000,
+            }
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = time.perf_counter() + self.window_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout > 0:
+                        request = self._queue.get(timeout=timeout)
+                    else:
+                        request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            self._predict_batch(batch)
+
+    def _predict_batch(self, batch: List[_Request]) -> None:
+        start = time.perf_counter()
+        try:
+            predictions = self.predictor.predict_many([verb for verb, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        end = time.perf_counter()
+        for (_, future, _), prediction in zip(batch, predictions):
+            future.set_result(prediction)
+        queue_seconds = [start - queued for _, _, queued in batch]
+        with self._lock:
+            self._batches += 1
+            self._predictions += len(batch)
+            self._max_batch_size_seen = max(self._max_batch_size_seen, len(batch))
+            self._queue_seconds += sum(queue_seconds)
+            self._max_queue_seconds = max(self._max_queue_seconds, *queue_seconds)
+            self._predict_seconds += end - start
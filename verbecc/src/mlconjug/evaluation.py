@@ -0,0 +1,124 @@
+"""
+Evaluation metrics of the template prediction models, shared by the
+TemplatePredictor (scikit-learn) and InferenceModel (NumPy) engines through
+their predict_proba and templates, see scripts/benchmark_models.py.
+"""
+
+from collections import defaultdict
+import random
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+VerbTemplatePair = Tuple[str, str]
+
+TOP_K = (1, 3, 5)
+CALIBRATION_BINS = 10
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def evaluate(
+    proba: np.ndarray,
+    templates: Sequence[str],
+    expected: Sequence[str],
+    top_k: Sequence[int] = TOP_K,
+    n_bins: int = CALIBRATION_BINS,
+) -> Dict[str, Any]:
+    """
+    Evaluates the predictions of a model against the expected templates
+    :param proba: the model's predict_proba of the evaluated verbs
+    :param templates: the template of each column of proba
+    :param expected: the expected template of each evaluated verb
+    """
+    columns = {t: j for j, t in enumerate(templates)}
+    # Column of the expected template, -1 if the model doesn't know it
+    expected_columns = np.array([columns.get(t, -1) for t in expected], dtype=np.intp)
+    predicted = proba.argmax(axis=1)
+    correct = predicted == expected_columns
+    return {
+        "n": len(expected),
+        "accuracy": float(correct.mean()) if len(expected) else None,
+        "top_k_accuracy": {
+            str(k): get_top_k_accuracy(proba, expected_columns, k) for k in top_k
+        },
+        "calibration": get_calibration(
+            proba[np.arange(len(predicted)), predicted], correct, n_bins
+        ),
+    }
+
+
+def get_top_k_accuracy(
+    proba: np.ndarray, expected_columns: np.ndarray, k: int
+) -> float:
+    """The share of rows whose expected column is one of its k most probable"""
+    if not len(expected_columns):
+        return 0.0
+    k = min(k, proba.shape[1])
+    top_k = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    return float((top_k == expected_columns[:, np.newaxis]).any(axis=1).mean())
+
+
+def get_calibration(
+    scores: np.ndarray, correct: np.ndarray, n_bins: int = CALIBRATION_BINS
+) -> Dict[str, Any]:
+    """
+    How well the score of each prediction (pred_score) matches the share of
+    correct predictions: the predictions are binned by score and
+    ece (expected calibration error) is the mean |accuracy - mean score| of
+    the bins weighted by their number of predictions
+    """
+    bins = np.minimum((scores * n_bins).astype(np.intp), n_bins - 1)
+    ret: Dict[str, Any] = {"ece": 0.0, "bins": []}
+    for b in range(n_bins):
+        in_bin = bins == b
+        count = int(in_bin.sum())
+        if not count:
+            continue
+        accuracy = float(correct[in_bin].mean())
+        mean_score = float(scores[in_bin].mean())
+        ret["ece"] += abs(accuracy - mean_score) * count / len(scores)
+        ret["bins"].append(
+            {
+                "min_score": b / n_bins,
+                "max_score": (b + 1) / n_bins,
+                "count": count,
+                "mean_score": mean_score,
+                "accuracy": accuracy,
+            }
+        )
+    return ret
+
+
+def get_latency_percentiles(
+    seconds: Sequence[float], percentiles: Sequence[int] = LATENCY_PERCENTILES
+) -> Dict[str, float]:
+    """The given percentiles of seconds, in microseconds"""
+    return {
+        f"p{p}_us": float(np.percentile(np.array(seconds), p) * 1e6)
+        for p in percentiles
+    }
+
+
+def get_k_fold_splits(
+    verb_template_pairs: List[VerbTemplatePair], k: int, seed: int
+) -> List[Tuple[List[VerbTemplatePair], List[VerbTemplatePair]]]:
+    """
+    Splits verb_template_pairs into k folds, stratified by template: the verbs
+    of each template, shuffled, are dealt to the folds in turn, starting at
+    a random fold. Returns (train pairs, test pairs) for each fold.
+    """
+    rand = random.Random(seed)
+    by_template: Dict[str, List[str]] = defaultdict(list)
+    for verb, template in verb_template_pairs:
+        by_template[template].append(verb)
+    folds: List[List[VerbTemplatePair]] = [[] for _ in range(k)]
+    for template in sorted(by_template):
+        verbs = by_template[template]
+        rand.shuffle(verbs)
+        start = rand.randrange(k)
+        for i, verb in enumerate(verbs):
+            folds[(start + i) % k].append((verb, template))
+    return [
+        ([pair for j, fold in enumerate(folds) if j != i for pair in fold], folds[i])
+        for i in range(k)
+    ]
@@ -0,0 +1,153 @@
+"""
+Feature extraction shared by the scikit-learn pipeline (mlconjug) and
+the NumPy inference engine (inference), kept free of scikit-learn imports.
+
+extract_verb_features returns the features of a verb as strings, for
+CountVectorizer. hash_verb_features hashes the same features of a whole
+batch of verbs straight into column indices, for HashingFeatureVectorizer,
+which needs no vocabulary, so its memory doesn't grow with the data.
+"""
+
+from collections import Counter
+import re
+from typing import Dict, List, Tuple
+from zlib import crc32
+
+import numpy as np
+
+from verbecc.src.defs.constants.grammar_defines import ALPHABET
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+
+# ngram_range of the features the models are trained with
+NGRAM_RANGE = (2, 7)
+
+# Number of columns the features are hashed into by hash_verb_features
+HASH_N_FEATURES = 2**16
+
+_WHITE_SPACES = re.compile(r"\s\s+")
+_END_CRC = crc32(b"END=")
+_START_CRC = crc32(b"START=")
+_LEN_CRC = crc32(b"LEN=")
+_VOW_NUM_CRC = crc32(b"VOW_NUM=")
+_CONS_NUM_CRC = crc32(b"CONS_NUM=")
+_VOW_CONS_RATIO_CRC = crc32(b"V/C=")
+_letter_counts: Dict[str, Tuple[Dict[str, int], Dict[str, int]]] = {}
+
+
+def extract_verb_features(
+    verb: str, lang: LangCodeISO639_1, ngram_range: Tuple[int, int]
+) -> List[str]:
+    """
+    | Custom Vectorizer optimized for extracting verbs features.
+    | The Vectorizer subclasses sklearn.feature_extraction.text.CountVectorizer .
+    | As in Indo-European languages verbs are inflected by adding a morphological suffix,
+     the vectorizer extracts verb endings and produces a vector representation of the verb with binary features.
+
+    | To enhance the results of the feature extration, several other features have been included:
+
+    | The features are the verb's ending n-grams, starting n-grams, length of the verb, number of vowels,
+     number of consonants and the ratio of vowels over consonants.
+
+    :param verb: string.
+        Verb to vectorize.
+    :param lang: LangCodeISO639_1.
+        Language to analyze.
+    :param ngram_range: tuple.
+        The range of the ngram sliding window.
+    :return: list[str].
+        List of the most salient features of the verb for the task of finding it's conjugation's class.
+
+    """
+    verb, ngram_sizes, vowels, consonants = _analyze_verb(verb, lang, ngram_range)
+    features = ["END=" + verb[-n:] for n in ngram_sizes]
+    features.extend(["START=" + verb[:n] for n in ngram_sizes])
+    features.append("LEN=" + str(len(verb)))
+    features.append("VOW_NUM=" + str(vowels))
+    features.append("CONS_NUM=" + str(consonants))
+    features.append("V/C=" + _get_vowel_consonant_ratio(vowels, consonants))
+    return features
+
+
+def hash_verb_features(
+    verbs: List[str],
+    lang: LangCodeISO639_1,
+    ngram_range: Tuple[int, int],
+    n_features: int = HASH_N_FEATURES,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hashes the features of a batch of verbs (the same features as
+    extract_verb_features) into n_features columns, without building the
+    feature strings: the CRC-32 of each feature's prefix is computed once
+    and extended with the feature's value, which gives the same hash as
+    hash_feature of the whole feature string. Unlike hash(), CRC-32 is
+    stable across processes and platforms.
+
+    :return: the indptr and indices of the batch as a CSR matrix of binary
+        features, i.e. each row's columns sorted and without duplicates.
+    """
+    indptr = np.empty(len(verbs) + 1, dtype=np.int64)
+    indptr[0] = 0
+    indices: List[int] = []
+    for i, verb in enumerate(verbs):
+        verb, ngram_sizes, vowels, consonants = _analyze_verb(verb, lang, ngram_range)
+        ratio = _get_vowel_consonant_ratio(vowels, consonants)
+        hashes = [crc32(verb[-n:].encode("utf-8"), _END_CRC) for n in ngram_sizes]
+        hashes.extend(
+            [crc32(verb[:n].encode("utf-8"), _START_CRC) for n in ngram_sizes]
+        )
+        hashes.append(crc32(str(len(verb)).encode("utf-8"), _LEN_CRC))
+        hashes.append(crc32(str(vowels).encode("utf-8"), _VOW_NUM_CRC))
+        hashes.append(crc32(str(consonants).encode("utf-8"), _CONS_NUM_CRC))
+        hashes.append(crc32(ratio.encode("utf-8"), _VOW_CONS_RATIO_CRC))
+        indices.extend(sorted(set([h % n_features for h in hashes])))
+        indptr[i + 1] = len(indices)
+    return indptr, np.array(indices, dtype=np.int32)
+
+
+def hash_feature(feature: str, n_features: int = HASH_N_FEATURES) -> int:
+    """The column of a feature string in hash_verb_features"""
+    return crc32(feature.encode("utf-8")) % n_features
+
+
+def _analyze_verb(
+    verb: str, lang: LangCodeISO639_1, ngram_range: Tuple[int, int]
+) -> Tuple[str, range, int, int]:
+    """
+    Returns the normalized verb, the sizes of its n-grams and its numbers
+    of vowels and consonants
+    """
+    verb = _WHITE_SPACES.sub(" ", verb).lower()
+    min_n, max_n = ngram_range
+    vowel_counts, consonant_counts = _get_letter_counts(lang)
+    vowels = consonants = 0
+    for c in verb:
+        vowels += vowel_counts.get(c, 0)
+        consonants += consonant_counts.get(c, 0)
+    return (verb, range(min_n, min(max_n + 1, len(verb) + 1)), vowels, consonants)
+
+
+def _get_letter_counts(lang: LangCodeISO639_1) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    How much each letter adds to the numbers of vowels and of consonants,
+    i.e. how many times it is listed in ALPHABET[lang], so that counting
+    each letter of the verb once gives the same numbers as one str.count
+    per listed letter
+    """
+    try:
+        return _letter_counts[lang]
+    except KeyError:
+        # We chose 'en' as the default alphabet because EN is more standard,
+        # without accents or diactrics.
+        alphabet = ALPHABET[lang] if lang in ALPHABET else ALPHABET["en"]
+        counts = (
+            dict(Counter(alphabet["vowels"])),
+            dict(Counter(alphabet["consonants"])),
+        )
+        _letter_counts[lang] = counts
+        return counts
+
+
+def _get_vowel_consonant_ratio(vowels: int, consonants: int) -> str:
+    if consonants == 0:
+        return "N/A"
+    return str(round(vowels / consonants, 2))
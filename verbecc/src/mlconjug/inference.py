@@ -0,0 +1,509 @@
+"""
+NumPy inference engine for the template prediction models.
+
+mlconjug.export_model flattens a trained scikit-learn pipeline
+(CountVectorizer -> SelectFromModel -> SGDClassifier) into the vocabulary
+of the features kept by the feature selector, a weight matrix and the
+intercepts. A prediction then only needs extract_verb_features, one dict
+lookup per feature and a sum of weight rows, and scikit-learn is never
+imported.
+
+The scores are computed like SGDClassifier.predict_proba, i.e. one-vs-rest
+logistic scores normalized to sum to 1 (not a softmax), in the same order
+of operations as the pipeline, so that with float64 weights predictions are
+the same as the pipeline's.
+
+The weights can be stored more compactly, see InferenceModel.slim:
+quantized to float16, or to int8 with one scale per template, and/or
+sparse, i.e. only the non-zero weights of each row (most weights are zero).
+
+Files, next to the trained model zip:
+    inference_model-{lang}.json  format version, ngram_range, vocabulary
+                                 (the feature of each weight row, or its
+                                 column for hashed features, see
+                                 hash_n_features), templates (the template
+                                 of each column), how the weights are stored,
+                                 intercepts, int8 scales and the metadata of
+                                 the trained model
+    inference_model-{lang}.npy   the dense weights[n_features, n_templates],
+                                 loaded with mmap_mode="r"
+    or
+    inference_model-{lang}.npz   the dense weights or the sparse CSR weights
+                                 (data, indices, indptr), compressed or not,
+                                 loaded into memory
+"""
+
+import io
+from itertools import chain
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from importlib_resources import as_file, files
+import numpy as np
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+from verbecc.src.mlconjug.features import (
+    NGRAM_RANGE,
+    extract_verb_features,
+    hash_verb_features,
+)
+from verbecc.src.utils.file_utils import atomic_write_bytes, zip_bytes
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_MODEL_FORMAT_VERSION = 2
+
+MODELS_DIR = "data/models"
+
+WEIGHT_DTYPES = ("float64", "float16", "int8")
+
+# Verbs per predict_proba call in predict_many, which bounds
+# the temporary (verbs x templates) arrays of each batch
+BATCH_SIZE = 1024
+
+
+class SparseWeights:
+    """
+    Weight matrix in CSR format: the non-zero weights of row r are
+    data[indptr[r]:indptr[r + 1]], in the columns indices[indptr[r]:indptr[r + 1]]
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        indices: np.ndarray,
+        indptr: np.ndarray,
+        shape: Tuple[int, int],
+    ) -> None:
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+        self.dtype = data.dtype
+
+    @classmethod
+    def from_dense(cls, weights: np.ndarray) -> "SparseWeights":
+        rows, columns = np.nonzero(weights)
+        indptr = np.zeros(weights.shape[0] + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=weights.shape[0]), out=indptr[1:])
+        index_dtype = np.uint16 if weights.shape[1] <= 2**16 else np.int32
+        return cls(
+            weights[rows, columns],
+            columns.astype(index_dtype),
+            indptr,
+            (weights.shape[0], weights.shape[1]),
+        )
+
+    def to_dense(self) -> np.ndarray:
+        weights = np.zeros(self.shape, dtype=self.dtype)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        weights[rows, self.indices] = self.data
+        return weights
+
+    def sum_rows(self, rows: List[Sequence[int]]) -> np.ndarray:
+        """
+        The sum of the given rows for each list of rows, in float64, adding
+        the weights of each list in the same order as the dense rows
+        """
+        n_rows = np.array([len(r) for r in rows], dtype=np.intp)
+        all_rows = np.fromiter(
+            chain.from_iterable(rows), dtype=np.intp, count=int(n_rows.sum())
+        )
+        starts = self.indptr[all_rows]
+        lengths = self.indptr[all_rows + 1] - starts
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        positions += np.arange(len(positions))
+        n_columns = self.shape[1]
+        keys = np.repeat(np.repeat(np.arange(len(rows)), n_rows), lengths)
+        keys *= n_columns
+        keys += self.indices[positions]
+        # bincount adds the weights of each key in order
+        return np.bincount(
+            keys, weights=self.data[positions], minlength=len(rows) * n_columns
+        ).reshape(len(rows), n_columns)
+
+
+class InferenceModel:
+    def __init__(
+        self,
+        lang: LangCodeISO639_1,
+        vocabulary: Sequence[Union[str, int]],
+        templates: List[str],
+        weights: Union[np.ndarray, SparseWeights],
+        intercept: np.ndarray,
+        ngram_range: Tuple[int, int] = NGRAM_RANGE,
+        metadata: Optional[Dict[str, Any]] = None,
+        hash_n_features: Optional[int] = None,
+        scale: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        :param vocabulary: the feature of each weight row, i.e. feature
+            strings, or feature columns if hash_n_features is set
+        :param weights: the weight of each feature (rows) for each template
+            (columns), float64, float16 or int8
+        :param intercept: the float64 intercept of each template
+        :param hash_n_features: the n_features of hash_verb_features if the
+            model was trained with HashingFeatureVectorizer
+        :param scale: for int8 weights, the float64 scale of each template
+        """
+        if weights.shape != (len(vocabulary), len(templates)):
+            raise ValueError(
+                f"Weights shape {weights.shape} doesn't match "
+                f"{len(vocabulary)} features and {len(templates)} templates"
+            )
+        if (weights.dtype == np.int8) != (scale is not None):
+            raise ValueError("int8 weights need a scale, and only int8 weights")
+        self.lang = lang
+        self.vocabulary = vocabulary
+        self.templates = templates
+        self.weights = weights
+        self.intercept = intercept
+        self.ngram_range = ngram_range
+        self.metadata = metadata or {}
+        self.hash_n_features = hash_n_features
+        self.scale = scale
+        self._rows = {feature: i for i, feature in enumerate(vocabulary)}
+        if hash_n_features is not None:
+            # Weight row of each hashed column, -1 for unselected columns
+            self._hash_rows = np.full(hash_n_features, -1, dtype=np.intp)
+            self._hash_rows[np.array(vocabulary, dtype=np.intp)] = np.arange(
+                len(vocabulary)
+            )
+
+    @property
+    def dtype(self) -> str:
+        return str(self.weights.dtype)
+
+    @property
+    def sparse(self) -> bool:
+        return isinstance(self.weights, SparseWeights)
+
+    def slim(self, dtype: str = "float64", sparse: bool = False) -> "InferenceModel":
+        """
+        Returns this model with its weights stored as dtype: "float64",
+        "float16", or "int8" scaled so that each template's largest weight
+        is 127, and, if sparse, without the zero weights.
+        The engine, dtype and sparse are recorded in the "export" entry of
+        its metadata, so that its fingerprint (see prediction_cache) differs
+        from those of the trained model and of other exports.
+        """
+        if dtype not in WEIGHT_DTYPES:
+            raise ValueError(f"Invalid weights dtype {dtype}")
+        dense = self._get_float64_weights()
+        scale = None
+        if dtype == "int8":
+            scale = np.abs(dense).max(axis=0) / 127
+            scale[scale == 0] = 1.0
+            weights = np.round(dense / scale).astype(np.int8)
+        else:
+            weights = dense.astype(dtype)
+        return InferenceModel(
+            self.lang,
+            self.vocabulary,
+            self.templates,
+            SparseWeights.from_dense(weights) if sparse else weights,
+            self.intercept,
+            self.ngram_range,
+            dict(
+                self.metadata,
+                export={"engine": "numpy", "dtype": dtype, "sparse": sparse},
+            ),
+            self.hash_n_features,
+            scale,
+        )
+
+    def predict(self, verb: str) -> Tuple[str, float]:
+        """Same as TemplatePredictor.predict"""
+        return self.predict_many([verb])[0]
+
+    def predict_many(self, verbs: List[str]) -> List[Tuple[str, float]]:
+        """Same as TemplatePredictor.predict_many"""
+        ret: List[Tuple[str, float]] = []
+        for start in range(0, len(verbs), BATCH_SIZE):
+            proba = self.predict_proba(verbs[start : start + BATCH_SIZE])
+            for i, j in enumerate(proba.argmax(axis=1)):
+                ret.append((self.templates[j], float(proba[i, j])))
+        return ret
+
+    def predict_topk(self, verb: str, k: int) -> List[Tuple[str, float]]:
+        """Same as TemplatePredictor.predict_topk"""
+        return self.predict_topk_many([verb], k)[0]
+
+    def predict_topk_many(
+        self, verbs: List[str], k: int
+    ) -> List[List[Tuple[str, float]]]:
+        """Same as TemplatePredictor.predict_topk_many"""
+        ret: List[List[Tuple[str, float]]] = []
+        for start in range(0, len(verbs), BATCH_SIZE):
+            proba = self.predict_proba(verbs[start : start + BATCH_SIZE])
+            ret.extend(get_top_k(proba, self.templates, k))
+        return ret
+
+    def predict_proba(self, verbs: List[str]) -> np.ndarray:
+        """The probability of each template (columns) for each verb (rows)"""
+        proba = 1.0 / (1.0 + np.exp(-self.decision_function(verbs)))
+        proba /= proba.sum(axis=1)[:, np.newaxis]
+        return proba
+
+    def decision_function(self, verbs: List[str]) -> np.ndarray:
+        """
+        The score of each template (columns) for each verb (rows), before
+        the logistic function: the sum of the weight rows of the verb's
+        features, in the same order as the pipeline, plus the intercepts
+        """
+        rows = self._get_rows(verbs)
+        if isinstance(self.weights, SparseWeights):
+            scores = self.weights.sum_rows(rows)
+        else:
+            scores = np.empty((len(verbs), len(self.templates)))
+            for i, verb_rows in enumerate(rows):
+                scores[i] = self.weights[verb_rows].sum(axis=0, dtype=np.float64)
+        if self.scale is not None:
+            scores *= self.scale
+        scores += self.intercept
+        return scores
+
+    def _get_rows(self, verbs: List[str]) -> List[Sequence[int]]:
+        """The weight rows of the features of each verb, in ascending order"""
+        if self.hash_n_features is not None:
+            indptr, indices = hash_verb_features(
+                verbs, self.lang, self.ngram_range, self.hash_n_features
+            )
+            rows = self._hash_rows[indices]
+            return [r[r >= 0] for r in np.split(rows, indptr[1:-1])]
+        return [
+            sorted(
+                set(
+                    self._rows[feature]
+                    for feature in extract_verb_features(
+                        verb, self.lang, self.ngram_range
+                    )
+                    if feature in self._rows
+                )
+            )
+            for verb in verbs
+        ]
+
+    def _get_float64_weights(self) -> np.ndarray:
+        weights = self.weights
+        if isinstance(weights, SparseWeights):
+            weights = weights.to_dense()
+        weights = np.asarray(weights, dtype=np.float64)
+        if self.scale is not None:
+            weights = weights * self.scale
+        return weights
+
+
+def get_top_k(
+    proba: np.ndarray, templates: Sequence[str], k: int
+) -> List[List[Tuple[str, float]]]:
+    """
+    The k most probable templates of each row of proba and their probability,
+    from the most probable. Ties are in the order of templates, so that the
+    first is the argmax of the row.
+    """
+    k = min(k, proba.shape[1])
+    if k <= 0:
+        return [[] for _ in range(len(proba))]
+    top = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    ret = []
+    for i, columns in enumerate(top):
+        order = sorted(columns, key=lambda j: (-proba[i, j], j))
+        ret.append([(templates[j], float(proba[i, j])) for j in order])
+    return ret
+
+
+def get_models_dir() -> str:
+    """
+    The directory the models are saved to: config.model_dir if set, otherwise
+    the data/models directory of the package
+    """
+    if config.model_dir:
+        return config.model_dir
+    with as_file(files("verbecc") / MODELS_DIR) as directory:
+        return str(directory)
+
+
+def get_model_dirs() -> List[str]:
+    """
+    The directories the models are loaded from, in order: get_models_dir()
+    and, if config.model_dir is set, the data/models directory of the package
+    """
+    directories = [get_models_dir()]
+    if config.model_dir:
+        with as_file(files("verbecc") / MODELS_DIR) as directory:
+            directories.append(str(directory))
+    return directories
+
+
+def find_model_file(filename: str) -> Optional[str]:
+    """The path of filename in the first of get_model_dirs() that has it"""
+    for directory in get_model_dirs():
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def get_inference_model_json_filename(lang: LangCodeISO639_1) -> str:
+    return "inference_model-{}.json".format(lang)
+
+
+def get_inference_model_weights_filename(lang: LangCodeISO639_1, ext: str) -> str:
+    return "inference_model-{}.{}".format(lang, ext)
+
+
+def save_inference_model(
+    model: InferenceModel,
+    dtype: Optional[str] = None,
+    sparse: Optional[bool] = None,
+    compress: Optional[bool] = None,
+) -> None:
+    """
+    Saves model next to the trained models (see get_models_dir), with its
+    weights stored as set by config.ml_weights_dtype, ml_weights_sparse and
+    ml_weights_compress unless given
+    """
+    write_inference_model(
+        get_models_dir(),
+        model.slim(
+            config.ml_weights_dtype if dtype is None else dtype,
+            config.ml_weights_sparse if sparse is None else sparse,
+        ),
+        config.ml_weights_compress if compress is None else compress,
+    )
+
+
+def load_inference_model(lang: LangCodeISO639_1) -> Optional[InferenceModel]:
+    """
+    Returns the exported model of lang, or None if it hasn't been exported
+    (see export-verb-models) or is invalid. See get_model_dirs.
+    """
+    path = find_model_file(get_inference_model_json_filename(lang))
+    if path is None:
+        logger.info("No inference model lang=%s", lang)
+        return None
+    return read_inference_model(os.path.dirname(path), lang)
+
+
+def write_inference_model(
+    directory: str, model: InferenceModel, compress: bool = False
+) -> None:
+    """
+    Writes the files of model to directory. Dense uncompressed weights are
+    saved as .npy so that they can be memory-mapped, others as .npz.
+    """
+    weights = model.weights
+    if isinstance(weights, SparseWeights) or compress:
+        ext = "npz"
+        if isinstance(weights, SparseWeights):
+            arrays = {
+                "data": weights.data,
+                "indices": weights.indices,
+                "indptr": weights.indptr,
+            }
+        else:
+            arrays = {"weights": weights}
+        # Same layout as np.savez, written with zip_bytes so that the file
+        # doesn't depend on when it was written
+        data = zip_bytes(
+            {name + ".npy": _get_npy_bytes(a) for name, a in arrays.items()},
+            compress,
+        )
+    else:
+        ext = "npy"
+        data = _get_npy_bytes(weights)
+    path = os.path.join(
+        directory, get_inference_model_weights_filename(model.lang, ext)
+    )
+    atomic_write_bytes(path, data)
+    stale_ext = "npy" if ext == "npz" else "npz"
+    stale_path = os.path.join(
+        directory, get_inference_model_weights_filename(model.lang, stale_ext)
+    )
+    if os.path.exists(stale_path):
+        os.remove(stale_path)
+    # The json is written last, read_inference_model checks the weights against it
+    info = {
+        "format_version": INFERENCE_MODEL_FORMAT_VERSION,
+        "lang": str(model.lang),
+        "ngram_range": list(model.ngram_range),
+        "vocabulary": model.vocabulary,
+        "templates": model.templates,
+        "metadata": model.metadata,
+        "hash_n_features": model.hash_n_features,
+        "weights": {
+            "dtype": model.dtype,
+            "sparse": model.sparse,
+            "file": ext,
+        },
+        "intercept": [float(x) for x in model.intercept],
+        "scale": None if model.scale is None else [float(x) for x in model.scale],
+    }
+    path = os.path.join(directory, get_inference_model_json_filename(model.lang))
+    atomic_write_bytes(path, json.dumps(info, ensure_ascii=False).encode("utf-8"))
+    logger.info("Saved inference model lang=%s", model.lang)
+
+
+def read_inference_model(
+    directory: str, lang: LangCodeISO639_1
+) -> Optional[InferenceModel]:
+    """Reads the model of lang written to directory by write_inference_model"""
+    json_path = os.path.join(directory, get_inference_model_json_filename(lang))
+    try:
+        with open(json_path, "rb") as f:
+            info = json.loads(f.read())
+        if info.get("format_version") != INFERENCE_MODEL_FORMAT_VERSION:
+            logger.warning(
+                "Ignoring inference model %s with format version %s, expected %s",
+                json_path,
+                info.get("format_version"),
+                INFERENCE_MODEL_FORMAT_VERSION,
+            )
+            return None
+        weights_info = info["weights"]
+        weights_path = os.path.join(
+            directory,
+            get_inference_model_weights_filename(lang, weights_info["file"]),
+        )
+        weights: Union[np.ndarray, SparseWeights]
+        if weights_info["file"] == "npy":
+            weights = np.load(weights_path, mmap_mode="r")
+        else:
+            with np.load(weights_path) as npz:
+                if weights_info["sparse"]:
+                    weights = SparseWeights(
+                        npz["data"],
+                        npz["indices"],
+                        npz["indptr"],
+                        (len(info["vocabulary"]), len(info["templates"])),
+                    )
+                else:
+                    weights = npz["weights"]
+        if weights.dtype != np.dtype(weights_info["dtype"]):
+            raise ValueError(f"Unexpected weights dtype {weights.dtype}")
+        return InferenceModel(
+            lang,
+            info["vocabulary"],
+            info["templates"],
+            weights,
+            np.array(info["intercept"], dtype=np.float64),
+            tuple(info["ngram_range"]),
+            info["metadata"],
+            info["hash_n_features"],
+            None if info["scale"] is None else np.array(info["scale"]),
+        )
+    except FileNotFoundError:
+        logger.info("No inference model %s", json_path)
+    except Exception as ex:
+        logger.warning("Exception loading inference model %s: %s", json_path, ex)
+    return None
+
+
+def _get_npy_bytes(array: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    np.save(buf, np.ascontiguousarray(array), allow_pickle=False)
+    return buf.getvalue()
@@ -44,24 +44,44 @@ __author__ = ["Sekou Diao"]
 __credits__ = ["Sekou Diao", "Pierre Sarrazin", "Brett Tolbert"]
 
 
-import re
 from collections import defaultdict
 from functools import partial
-from importlib_resources import as_file, files
+from importlib import metadata
+import json
 import os
 import pickle
 import random
-from typing import Any, Dict, List, Tuple, Union
+import time
+from typing import Any, ContextManager, Dict, List, Optional, Tuple, Union
 from zipfile import ZipFile
 
+import numpy as np
+from scipy.sparse import csr_matrix
+import sklearn
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.feature_selection import SelectFromModel
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.svm import LinearSVC
 from sklearn.linear_model import SGDClassifier
 from sklearn.pipeline import Pipeline
 
-from verbecc.src.defs.constants.grammar_defines import ALPHABET
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.exceptions import ModelNotFoundError
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+from verbecc.src.mlconjug.features import (
+    HASH_N_FEATURES,
+    NGRAM_RANGE,
+    extract_verb_features,
+    hash_verb_features,
+)
+from verbecc.src.mlconjug.inference import (
+    InferenceModel,
+    find_model_file,
+    get_models_dir,
+    get_top_k,
+    save_inference_model,
+)
+from verbecc.src.utils.file_utils import atomic_write_bytes, file_lock, zip_bytes
 import logging
 
 from verbecc.src.defs.constants.config import DEVEL_MODE
@@ -83,25 +103,103 @@ Vectorizor = Union[CountVectorizer, Any]
 FeatureSelector = Union[SelectFromModel, Any]
 Classifier = Union[SGDClassifier, Any]
 
+# Bump when the saved model format changes, older models are then rejected
+# by load_model and have to be rebuilt with train-verb-models
+MODEL_FORMAT_VERSION = 1
+# Seed of the training data split and of the estimators, so that
+# train-verb-models builds the same models from the same data
+MODEL_SEED = 42
+MODEL_METADATA_FILENAME = "metadata.json"
+MODEL_VERBS_FILENAME = "verbs.json"
+# Pinned so that the pickled model doesn't change with the Python version's
+# default protocol
+MODEL_PICKLE_PROTOCOL = 4
+# Passes of SGDClassifier.partial_fit over the samples of an update_model
+UPDATE_EPOCHS = 10
+# Training verbs replayed with the new verbs of an update_model, so that the
+# classifier doesn't drift towards the new verbs' templates:
+# UPDATE_REPLAY_RATIO per new verb, at least UPDATE_REPLAY_MIN
+UPDATE_REPLAY_RATIO = 10
+UPDATE_REPLAY_MIN = 1000
+
 
 class TemplatePredictor:
     def __init__(
         self, verb_template_pairs: List[VerbTemplatePair], lang: LangCodeISO639_1
     ) -> None:
-        self.data_set = DataSet(verb_template_pairs)
+        """
+        Loads the trained model of lang. If it is missing, it is trained on
+        verb_template_pairs and saved, unless config.missing_model is "raise",
+        in which case ModelNotFoundError is raised.
+        """
         model = load_model(lang)
         if not model:
-            model = Model(lang=lang)
-            model.train(self.data_set.train_input, self.data_set.train_labels)
-            save_model(model)
+            if config.missing_model == "raise":
+                raise ModelNotFoundError(
+                    f"No trained model for lang={lang}, run train-verb-models"
+                )
+            with lock_model(lang):
+                # Another process may have trained it while this one waited
+                model = load_model(lang)
+                if not model:
+                    logger.warning("Training missing model lang=%s", lang)
+                    model = train_model(lang, verb_template_pairs)
+                    save_model(model)
+                    save_inference_model(export_model(model))
         self.model = model
         return
 
+    @classmethod
+    def from_model(cls, model: "Model") -> "TemplatePredictor":
+        """A predictor of an already trained model, e.g. for evaluating it"""
+        predictor = cls.__new__(cls)
+        predictor.model = model
+        return predictor
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.model.metadata
+
     def predict(self, verb: str) -> Tuple[str, float]:
-        prediction = self.model.predict([verb])[0]
-        prediction_score = self.model.pipeline.predict_proba([verb])[0][prediction]
-        template = self.data_set.templates[prediction]
-        return (template, prediction_score)
+        return self.predict_many([verb])[0]
+
+    @property
+    def templates(self) -> List[str]:
+        """The template of each column of predict_proba"""
+        return [self.model.templates[label] for label in self.model.pipeline.classes_]
+
+    def predict_many(self, verbs: List[str]) -> List[Tuple[str, float]]:
+        """
+        Predicts the template of each verb and its probability, with
+        a single pass of the pipeline over the whole batch
+        """
+        if not verbs:
+            return []
+        proba = self.predict_proba(verbs)
+        templates = self.templates
+        return [
+            (templates[j], float(proba[i, j]))
+            for i, j in enumerate(proba.argmax(axis=1))
+        ]
+
+    def predict_topk(self, verb: str, k: int) -> List[Tuple[str, float]]:
+        return self.predict_topk_many([verb], k)[0]
+
+    def predict_topk_many(
+        self, verbs: List[str], k: int
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Predicts the k most probable templates of each verb and their
+        probability, from the most probable (the template of predict_many),
+        with a single pass of the pipeline over the whole batch
+        """
+        if not verbs:
+            return []
+        return get_top_k(self.predict_proba(verbs), self.templates, k)
+
+    def predict_proba(self, verbs: List[str]) -> np.ndarray:
+        """The probability of each template (columns) for each verb (rows)"""
+        return self.model.pipeline.predict_proba(verbs)
 
 
 class Model:
@@ -115,6 +213,9 @@ class Model:
     :param feature_selector: scikit-learn Classifier with a fit_transform() method
     :param classifier: scikit-learn Classifier with a predict() method
     :param language: language of the corpus of verbs to be analyzed.
+    :param seed: random_state of the default feature selector and classifier.
+    :param features: the default vectorizer, "count" (CountVectorizer)
+        or "hashing" (HashingFeatureVectorizer), see config.ml_features.
     """
 
     def __init__(
@@ -123,15 +224,30 @@ class Model:
         feature_selector: FeatureSelector = None,
         classifier: Classifier = None,
         lang: LangCodeISO639_1 = LangCodeISO639_1.fr,
+        seed: Optional[int] = None,
+        features: str = "count",
     ) -> None:
         if not vectorizer:
-            vectorizer = CountVectorizer(
-                analyzer=partial(extract_verb_features, lang=lang, ngram_range=(2, 7)),
-                binary=True,
-            )
+            if features == "hashing":
+                vectorizer = HashingFeatureVectorizer(lang=lang)
+            elif features == "count":
+                vectorizer = CountVectorizer(
+                    analyzer=partial(
+                        extract_verb_features, lang=lang, ngram_range=NGRAM_RANGE
+                    ),
+                    binary=True,
+                )
+            else:
+                raise ValueError(f"Invalid features {features}")
         if not feature_selector:
             feature_selector = SelectFromModel(
-                LinearSVC(penalty="l1", max_iter=12000, dual=False, verbose=0)
+                LinearSVC(
+                    penalty="l1",
+                    max_iter=12000,
+                    dual=False,
+                    verbose=0,
+                    random_state=seed,
+                )
             )
         if not classifier:
             classifier = SGDClassifier(
@@ -141,6 +257,7 @@ class Model:
                 max_iter=40000,
                 alpha=1e-5,
                 verbose=0,
+                random_state=seed,
             )
 
         self.pipeline = Pipeline(
@@ -151,8 +268,31 @@ class Model:
             ]
         )
         self.lang = lang
+        # Template name of each label, set by train_model
+        self.templates: List[str] = []
+        # Build information saved alongside the model, set by train_model
+        self.metadata: Dict[str, Any] = {}
+        # Seconds taken by each phase of the last training, not saved
+        self.timings: Dict[str, float] = {}
+        # The verbs the model was built from by train_model (both splits) and
+        # those folded in by update_model since. Not pickled, they are saved
+        # next to the pickle, see load_model_verbs.
+        self.trained_pairs: List[VerbTemplatePair] = []
+        self.updated_pairs: List[VerbTemplatePair] = []
         return
 
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in ("timings", "trained_pairs", "updated_pairs"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.timings = {}
+        self.trained_pairs = []
+        self.updated_pairs = []
+
     def __repr__(self) -> str:
         return "{0}.{1}({2}, {3}, {4})".format(
             __name__, self.__class__.__name__, *sorted(self.pipeline.named_steps)
@@ -161,6 +301,8 @@ class Model:
     def train(self, samples: List[str], labels: List[int]) -> None:
         """
         Trains the pipeline on the supplied samples and labels.
+        Same as self.pipeline.fit, one step at a time so that the time taken
+        by each phase (vectorize, select, fit) is recorded in self.timings.
 
         :param samples: list[str].
             List of verbs.
@@ -168,7 +310,22 @@ class Model:
             List of verb template indices.
 
         """
-        self.pipeline = self.pipeline.fit(samples, labels)
+        vectorizer = self.pipeline.named_steps["vectorizer"]
+        feature_selector = self.pipeline.named_steps["feature_selector"]
+        classifier = self.pipeline.named_steps["classifier"]
+        t = time.perf_counter()
+        x = vectorizer.fit_transform(samples, labels)
+        self.timings["vectorize"] = time.perf_counter() - t
+        t = time.perf_counter()
+        x = feature_selector.fit_transform(x, labels)
+        self.timings["select"] = time.perf_counter() - t
+        t = time.perf_counter()
+        classifier.fit(x, labels)
+        self.timings["fit"] = time.perf_counter() - t
+        # Not needed for predictions and, as a set, pickled in
+        # a different order by each process (removed in scikit-learn 1.6)
+        if hasattr(vectorizer, "stop_words_"):
+            del vectorizer.stop_words_
         return
 
     def predict(self, verbs: List[str]) -> List[str]:
@@ -185,15 +342,51 @@ class Model:
         return prediction
 
 
+class HashingFeatureVectorizer(TransformerMixin, BaseEstimator):
+    """
+    Vectorizer hashing the features of verbs straight into a fixed number of
+    binary columns (see features.hash_verb_features). Unlike CountVectorizer
+    it has no vocabulary, so its memory doesn't grow with the number of verbs
+    and it transforms any batch without fitting.
+    """
+
+    def __init__(
+        self,
+        lang: LangCodeISO639_1 = LangCodeISO639_1.fr,
+        ngram_range: Tuple[int, int] = NGRAM_RANGE,
+        n_features: int = HASH_N_FEATURES,
+    ) -> None:
+        self.lang = lang
+        self.ngram_range = ngram_range
+        self.n_features = n_features
+
+    def fit(self, verbs: List[str], y: Any = None) -> "HashingFeatureVectorizer":
+        return self
+
+    def transform(self, verbs: List[str]) -> csr_matrix:
+        indptr, indices = hash_verb_features(
+            list(verbs), self.lang, self.ngram_range, self.n_features
+        )
+        return csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(indptr) - 1, self.n_features),
+        )
+
+
 class DataSet:
     """
     | This class holds and manages the data set.
     | Defines helper methodss for managing Machine Learning tasks like constructing a training and testing set.
     """
 
-    def __init__(self, verb_template_pairs: List[VerbTemplatePair]) -> None:
+    def __init__(
+        self, verb_template_pairs: List[VerbTemplatePair], seed: Optional[int] = None
+    ) -> None:
+        self._random = random.Random(seed)
         self.verbs = [pair[0] for pair in verb_template_pairs]
         self.templates = sorted(set([pair[1] for pair in verb_template_pairs]))
+        # Label (index in self.templates) of each template
+        self.template_labels = {t: i for i, t in enumerate(self.templates)}
         self.dict_conjug = self._construct_dict_conjug(verb_template_pairs)
         self._split_test_train()
         return
@@ -211,7 +404,7 @@ class DataSet:
             defaultdict mapping each template to one or more verbs e.g. {'aim:er': ['abaisser', ...]}
         """
         ret = defaultdict(list)
-        random.shuffle(verb_template_pairs)
+        self._random.shuffle(verb_template_pairs)
         for verb, template in verb_template_pairs:
             ret[template].append(verb)
         return ret
@@ -247,111 +440,313 @@ class DataSet:
                     train_set.append((verb, template))
                 for verb in lverbs[index:]:
                     test_set.append((verb, template))
-        random.shuffle(train_set)
-        random.shuffle(test_set)
+        self._random.shuffle(train_set)
+        self._random.shuffle(test_set)
         self.train_input: List[str] = [elmt[0] for elmt in train_set]
         self.train_labels: List[int] = [
-            self.templates.index(elmt[1]) for elmt in train_set
+            self.template_labels[elmt[1]] for elmt in train_set
         ]
         self.test_input: List[str] = [elmt[0] for elmt in test_set]
         self.test_labels: List[int] = [
-            self.templates.index(elmt[1]) for elmt in test_set
+            self.template_labels[elmt[1]] for elmt in test_set
         ]
 
 
-def extract_verb_features(
-    verb: str, lang: LangCodeISO639_1, ngram_range: Tuple[int, int]
-) -> List[str]:
+def get_model_zip_filename(lang: LangCodeISO639_1) -> str:
+    return "trained_model-{}.zip".format(lang)
+
+
+def get_model_lock_filename(lang: LangCodeISO639_1) -> str:
+    return "trained_model-{}.lock".format(lang)
+
+
+def lock_model(lang: LangCodeISO639_1) -> ContextManager[None]:
+    """
+    Lock held, by one process at a time, while the model of lang is trained
+    or saved in get_models_dir(), see TemplatePredictor
     """
-    | Custom Vectorizer optimized for extracting verbs features.
-    | The Vectorizer subclasses sklearn.feature_extraction.text.CountVectorizer .
-    | As in Indo-European languages verbs are inflected by adding a morphological suffix,
-     the vectorizer extracts verb endings and produces a vector representation of the verb with binary features.
+    return file_lock(os.path.join(get_models_dir(), get_model_lock_filename(lang)))
 
-    | To enhance the results of the feature extration, several other features have been included:
 
-    | The features are the verb's ending n-grams, starting n-grams, length of the verb, number of vowels,
-     number of consonants and the ratio of vowels over consonants.
+def get_model_pickle_filename(lang: LangCodeISO639_1) -> str:
+    return "trained_model-{0}.pickle".format(lang)
 
-    :param verb: string.
-        Verb to vectorize.
-    :param lang: LangCodeISO639_1.
-        Language to analyze.
-    :param ngram_range: tuple.
-        The range of the ngram sliding window.
-    :return: list[str].
-        List of the most salient features of the verb for the task of finding it's conjugation's class.
 
+def train_model(
+    lang: LangCodeISO639_1,
+    verb_template_pairs: List[VerbTemplatePair],
+    seed: int = MODEL_SEED,
+    features: Optional[str] = None,
+) -> Model:
+    """
+    Trains the model of lang on the training split of verb_template_pairs
+    and records its accuracy on the test split in model.metadata
+    :param features: see Model, defaults to config.ml_features
     """
-    _white_spaces = re.compile(r"\s\s+")
-    verb = _white_spaces.sub(" ", verb)
-    verb = verb.lower()
-    verb_len = len(verb)
-    length_feature = "LEN={0}".format(str(verb_len))
-    min_n, max_n = ngram_range
-    final_ngrams = [
-        "END={0}".format(verb[-n:]) for n in range(min_n, min(max_n + 1, verb_len + 1))
+    features = features or config.ml_features
+    data_set = DataSet(list(verb_template_pairs), seed=seed)
+    model = Model(lang=lang, seed=seed, features=features)
+    model.train(data_set.train_input, data_set.train_labels)
+    model.templates = data_set.templates
+    model.trained_pairs = sorted(verb_template_pairs)
+    accuracy = None
+    if data_set.test_input:
+        accuracy = float(
+            model.pipeline.score(data_set.test_input, data_set.test_labels)
+        )
+    model.metadata = {
+        "format_version": MODEL_FORMAT_VERSION,
+        "lang": str(lang),
+        "verbecc_version": get_verbecc_version(),
+        "sklearn_version": sklearn.__version__,
+        "seed": seed,
+        "features": features,
+        "n_verbs": len(data_set.verbs),
+        "n_templates": len(data_set.templates),
+        "n_train": len(data_set.train_input),
+        "n_test": len(data_set.test_input),
+        "accuracy": accuracy,
+    }
+    return model
+
+
+def update_model(
+    model: Model,
+    new_verb_template_pairs: List[VerbTemplatePair],
+    epochs: int = UPDATE_EPOCHS,
+) -> None:
+    """
+    Folds new (or re-templated) verbs into a trained model in place with
+    SGDClassifier.partial_fit, in seconds instead of the minutes of
+    train_model: the vectorizer and feature selector are not refitted, the
+    new verbs are vectorized against the existing features. A seeded sample
+    of the model's training verbs is replayed with them.
+    Raises ValueError if a template of the new verbs isn't one of the
+    model's, the model then has to be rebuilt with train_model.
+    """
+    labels = {t: i for i, t in enumerate(model.templates)}
+    new_templates = sorted(set(t for _, t in new_verb_template_pairs) - set(labels))
+    if new_templates:
+        raise ValueError(f"New templates {new_templates}, rebuild the model")
+    if not new_verb_template_pairs:
+        return
+    seed = model.metadata.get("seed", MODEL_SEED)
+    rand = random.Random(seed)
+    new_verbs = set(v for v, _ in new_verb_template_pairs)
+    data_set = DataSet(list(model.trained_pairs), seed=seed)
+    replay = [
+        (v, data_set.templates[label])
+        for v, label in zip(data_set.train_input, data_set.train_labels)
+        if v not in new_verbs
     ]
-    initial_ngrams = [
-        "START={0}".format(verb[:n]) for n in range(min_n, min(max_n + 1, verb_len + 1))
+    n_replay = max(
+        UPDATE_REPLAY_MIN, UPDATE_REPLAY_RATIO * len(new_verb_template_pairs)
+    )
+    samples = list(new_verb_template_pairs) + rand.sample(
+        replay, min(n_replay, len(replay))
+    )
+    x = model.pipeline[:-1].transform([v for v, _ in samples])
+    y = np.array([labels[t] for _, t in samples])
+    classifier = model.pipeline.named_steps["classifier"]
+    t = time.perf_counter()
+    for _ in range(epochs):
+        order = list(range(len(samples)))
+        rand.shuffle(order)
+        classifier.partial_fit(x[order], y[order])
+    model.timings = {"update": time.perf_counter() - t}
+    model.updated_pairs = sorted(
+        {**dict(model.updated_pairs), **dict(new_verb_template_pairs)}.items()
+    )
+    model.metadata = {
+        **model.metadata,
+        "n_verbs": len(get_model_verbs(model)),
+        "n_updates": model.metadata.get("n_updates", 0) + 1,
+        "n_updated_verbs": len(model.updated_pairs),
+        "trained_accuracy": model.metadata.get(
+            "trained_accuracy", model.metadata.get("accuracy")
+        ),
+        "accuracy": get_held_out_accuracy(model),
+    }
+
+
+def get_model_verbs(model: Model) -> Dict[str, str]:
+    """The template of each verb the model was built or updated with"""
+    return {**dict(model.trained_pairs), **dict(model.updated_pairs)}
+
+
+def get_new_verb_template_pairs(
+    model: Model, verb_template_pairs: List[VerbTemplatePair]
+) -> List[VerbTemplatePair]:
+    """The verbs which are new to the model or have a different template"""
+    known = get_model_verbs(model)
+    return sorted((v, t) for v, t in set(verb_template_pairs) if known.get(v) != t)
+
+
+def get_held_out_accuracy(model: Model) -> Optional[float]:
+    """
+    The accuracy of the model on the test split of the verbs it was built
+    from by train_model, except the verbs updated since
+    """
+    data_set = DataSet(
+        list(model.trained_pairs), seed=model.metadata.get("seed", MODEL_SEED)
+    )
+    updated = set(v for v, _ in model.updated_pairs)
+    test = [
+        (v, data_set.templates[label])
+        for v, label in zip(data_set.test_input, data_set.test_labels)
+        if v not in updated
     ]
-    if lang not in ALPHABET:
-        lang = "en"  # We chose 'en' as the default alphabet because EN is more standard, without accents or diactrics.
-    vowels = sum(verb.count(c) for c in ALPHABET[lang]["vowels"])
-    vowels_number = "VOW_NUM={0}".format(vowels)
-    consonants = sum(verb.count(c) for c in ALPHABET[lang]["consonants"])
-    consonants_number = "CONS_NUM={0}".format(consonants)
-    if consonants == 0:
-        vow_cons_ratio = "V/C=N/A"
+    if not test:
+        return None
+    labels = {t: i for i, t in enumerate(model.templates)}
+    return float(
+        model.pipeline.score([v for v, _ in test], [labels[t] for _, t in test])
+    )
+
+
+def export_model(model: Model) -> InferenceModel:
+    """
+    Flattens the pipeline of a trained model into an InferenceModel:
+    only the features kept by the feature selector, and the classifier's
+    coefficients as a weight matrix, with one column per template (see inference)
+    """
+    vectorizer = model.pipeline.named_steps["vectorizer"]
+    feature_selector = model.pipeline.named_steps["feature_selector"]
+    classifier = model.pipeline.named_steps["classifier"]
+    support = feature_selector.get_support(indices=True)
+    hash_n_features = None
+    if isinstance(vectorizer, HashingFeatureVectorizer):
+        vocabulary: List[Union[str, int]] = [int(i) for i in support]
+        hash_n_features = vectorizer.n_features
+        ngram_range = vectorizer.ngram_range
     else:
-        vow_cons_ratio = "V/C={0}".format(round(vowels / consonants, 2))
-    final_ngrams.extend(initial_ngrams)
-    final_ngrams.extend(
-        (length_feature, vowels_number, consonants_number, vow_cons_ratio)
+        feature_names = vectorizer.get_feature_names_out()
+        vocabulary = [str(feature_names[i]) for i in support]
+        ngram_range = getattr(vectorizer.analyzer, "keywords", {}).get(
+            "ngram_range", NGRAM_RANGE
+        )
+    coef = classifier.coef_
+    intercept = classifier.intercept_
+    if coef.shape[0] == 1:
+        # Binary classifiers have a single decision function, for classes_[1].
+        # Negating it for classes_[0] gives the same predictions and scores.
+        coef = np.vstack([-coef, coef])
+        intercept = np.concatenate([-intercept, intercept])
+    templates = [model.templates[label] for label in classifier.classes_]
+    return InferenceModel(
+        model.lang,
+        vocabulary,
+        templates,
+        np.ascontiguousarray(coef.T),
+        np.asarray(intercept, dtype=np.float64),
+        ngram_range,
+        model.metadata,
+        hash_n_features,
     )
-    return final_ngrams
 
 
-def get_model_zip_filename(lang: LangCodeISO639_1) -> str:
-    return "data/models/trained_model-{}.zip".format(lang)
+def get_verbecc_version() -> str:
+    try:
+        return metadata.version("verbecc")
+    except metadata.PackageNotFoundError:
+        return "unknown"
 
 
-def get_model_pickle_filename(lang: LangCodeISO639_1) -> str:
-    return "trained_model-{0}.pickle".format(lang)
+def get_model_zip_bytes(model: Model) -> bytes:
+    """
+    The zip file of model and its metadata. The same model always gives
+    the same bytes, see file_utils.zip_bytes.
+    """
+    members = {
+        MODEL_METADATA_FILENAME: (json.dumps(model.metadata, indent=2) + "\n").encode(
+            "utf-8"
+        ),
+        get_model_pickle_filename(model.lang): pickle.dumps(
+            model, protocol=MODEL_PICKLE_PROTOCOL
+        ),
+    }
+    if model.trained_pairs:
+        members[MODEL_VERBS_FILENAME] = json.dumps(
+            {"trained": model.trained_pairs, "updated": model.updated_pairs},
+            ensure_ascii=False,
+        ).encode("utf-8")
+    return zip_bytes(members)
 
 
 def save_model(model: Model) -> None:
-    pickle_filename = get_model_pickle_filename(model.lang)
-    with open(pickle_filename, "wb") as f:
-        pickle.dump(model, f)
-    zip_filename = get_model_zip_filename(model.lang)
-    zip_path = files("verbecc") / zip_filename
-    with as_file(zip_path) as f:
-        with ZipFile(f, mode="w") as zf:
-            zf.write(pickle_filename)
-            logger.info(
-                "Saved model pickle filename %s to zip filename %s.",
-                pickle_filename,
-                zip_filename,
-            )
-    os.remove(pickle_filename)
+    """Saves model to get_models_dir(), replacing the saved model atomically"""
+    zip_path = os.path.join(get_models_dir(), get_model_zip_filename(model.lang))
+    atomic_write_bytes(zip_path, get_model_zip_bytes(model))
+    logger.info("Saved model to zip filename %s.", zip_path)
+
+
+def load_model_metadata(lang: LangCodeISO639_1) -> Optional[Dict[str, Any]]:
+    """Returns the build information of the saved model of lang, if any"""
+    zip_filename = find_model_file(get_model_zip_filename(lang))
+    if zip_filename is None:
+        return None
+    try:
+        with ZipFile(zip_filename) as zf:
+            return json.loads(zf.read(MODEL_METADATA_FILENAME))
+    except Exception as ex:
+        logger.warning("Exception loading model metadata %s: %s", zip_filename, ex)
+    return None
 
 
-def load_model(lang: LangCodeISO639_1) -> Model:
+def load_model_verbs(
+    lang: LangCodeISO639_1,
+) -> Optional[Tuple[List[VerbTemplatePair], List[VerbTemplatePair]]]:
+    """
+    Returns the verbs the saved model of lang was built from by train_model
+    and those folded in by update_model since (see Model.trained_pairs),
+    if they were saved
+    """
+    zip_filename = find_model_file(get_model_zip_filename(lang))
+    if zip_filename is None:
+        return None
+    try:
+        with ZipFile(zip_filename) as zf:
+            if MODEL_VERBS_FILENAME not in zf.namelist():
+                return None
+            verbs = json.loads(zf.read(MODEL_VERBS_FILENAME))
+    except Exception as ex:
+        logger.warning("Exception loading model verbs %s: %s", zip_filename, ex)
+        return None
+    return (
+        [(v, t) for v, t in verbs["trained"]],
+        [(v, t) for v, t in verbs["updated"]],
+    )
+
+
+def load_model(lang: LangCodeISO639_1) -> Optional[Model]:
+    """
+    Returns the saved model of lang, from the first of get_model_dirs() that
+    has one, or None if there is none or it can't be loaded
+    """
     model = None
-    zip_filename = get_model_zip_filename(lang)
+    zip_filename = find_model_file(get_model_zip_filename(lang))
+    if zip_filename is None:
+        logger.info("No saved model lang=%s", lang)
+        return None
     try:
-        zip_path = files("verbecc") / zip_filename
-        with as_file(zip_path) as f:
-            with ZipFile(f) as zf:
-                pickle_filename = get_model_pickle_filename(lang)
-                with zf.open(pickle_filename, "r") as model_pickle:
-                    model = pickle.loads(model_pickle.read())
-                    logger.info(
-                        "Loaded model pickle filename %s from zip filename %s",
-                        pickle_filename,
-                        zip_filename,
-                    )
+        with ZipFile(zip_filename) as zf:
+            model_metadata = json.loads(zf.read(MODEL_METADATA_FILENAME))
+            if model_metadata.get("format_version") != MODEL_FORMAT_VERSION:
+                logger.warning(
+                    "Ignoring model %s with format version %s, expected %s",
+                    zip_filename,
+                    model_metadata.get("format_version"),
+                    MODEL_FORMAT_VERSION,
+                )
+                return None
+            pickle_filename = get_model_pickle_filename(lang)
+            with zf.open(pickle_filename, "r") as model_pickle:
+                model = pickle.loads(model_pickle.read())
+                logger.info(
+                    "Loaded model pickle filename %s from zip filename %s",
+                    pickle_filename,
+                    zip_filename,
+                )
     except Exception as ex:
         logger.warning(
             "Exception loading model %s: %s", zip_filename, ex, exc_info=True
@@ -0,0 +1,120 @@
+"""
+Cache of ML template predictions, shared by the Verbs of all languages and
+keyed by (lang, model fingerprint, query, variant), so that repeated lookups
+of the same unknown verb don't run the model again and a model loaded in
+place of another (e.g. after update-verb-models and InflectorRegistry.release)
+doesn't get the other's predictions. The query is the infinitive lower-cased
+without accents and the variant "" for the predictions of the model, or the
+lower-cased infinitive and the template filter applied for the predictions
+resolved by Verbs._predict_compatible_templates.
+
+If config.prediction_cache_file is set, the cached predictions are saved
+to it at exit and reloaded once the model of their language is loaded.
+The predictions of each language are saved with a fingerprint of the
+model that made them and are only reloaded for the same model.
+"""
+
+import atexit
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from verbecc.src.defs.constants import config
+from verbecc.src.utils.bounded_cache import BoundedCache
+from verbecc.src.utils.file_utils import atomic_write_bytes, sha256_bytes
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_CACHE_FORMAT_VERSION = 2
+
+Prediction = Tuple[str, float]  # (template, score)
+PredictionCache = BoundedCache[Tuple[str, str, str, str], Prediction]
+
+_cache: Optional[PredictionCache] = None
+# fingerprint of the last model loaded of each lang
+_fingerprints: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def get_prediction_cache() -> Optional[PredictionCache]:
+    """
+    Returns the prediction cache, or None if it is disabled
+    (config.prediction_cache_size = 0)
+    """
+    global _cache
+    if config.prediction_cache_size <= 0:
+        return None
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = BoundedCache(
+                    config.prediction_cache_size, config.prediction_cache_policy
+                )
+                atexit.register(save_prediction_cache)
+    return _cache
+
+
+def get_model_fingerprint(metadata: Dict[str, Any]) -> str:
+    return sha256_bytes(json.dumps(metadata, sort_keys=True).encode("utf-8"))
+
+
+def load_persisted_predictions(lang: str, model_fingerprint: str) -> int:
+    """
+    Called when the model of lang is loaded: adds the predictions of lang
+    saved in config.prediction_cache_file by the same model to the cache.
+    Returns the number of predictions added.
+    """
+    lang = str(lang)
+    _fingerprints[lang] = model_fingerprint
+    cache = get_prediction_cache()
+    if cache is None or not config.prediction_cache_file:
+        return 0
+    saved = _read_prediction_cache_file(config.prediction_cache_file)
+    entry = saved.get(lang)
+    if not entry or entry["model"] != model_fingerprint:
+        return 0
+    count = 0
+    for query, variant, template, score in entry["predictions"]:
+        key = (lang, model_fingerprint, query, variant)
+        if key not in cache:
+            cache.put(key, (template, score))
+            count += 1
+    logger.info("Loaded %d cached predictions lang=%s", count, lang)
+    return count
+
+
+def save_prediction_cache() -> None:
+    """
+    Saves the cached predictions to config.prediction_cache_file.
+    Only the predictions of the last model loaded of each language are saved.
+    The saved predictions of languages whose model wasn't loaded are kept.
+    """
+    path = config.prediction_cache_file
+    if _cache is None or not path:
+        return
+    saved = _read_prediction_cache_file(path)
+    for lang, fingerprint in _fingerprints.items():
+        saved[lang] = {"model": fingerprint, "predictions": []}
+    for (lang, fingerprint, query, variant), (template, score) in _cache.items():
+        if _fingerprints.get(lang) == fingerprint:
+            saved[lang]["predictions"].append([query, variant, template, score])
+    data = {"format_version": PREDICTION_CACHE_FORMAT_VERSION, "langs": saved}
+    try:
+        atomic_write_bytes(path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+    except OSError as ex:
+        logger.warning("Exception saving prediction cache %s: %s", path, ex)
+
+
+def _read_prediction_cache_file(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as ex:
+        logger.warning("Exception loading prediction cache %s: %s", path, ex)
+        return {}
+    if data.get("format_version") != PREDICTION_CACHE_FORMAT_VERSION:
+        return {}
+    return data["langs"]
@@ -0,0 +1,206 @@
+"""
+Rule-based template prediction, without NumPy or scikit-learn: the template
+of a verb is the most common template of the known verbs that share its
+longest ending (see config.ml_engine = "suffix_trie" and
+config.ml_suffix_trie_min_support).
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+from verbecc.src.utils.string_utils import strip_accents
+
+SUFFIX_TRIE_FORMAT_VERSION = 1
+
+
+class SuffixTrieNode:
+    """
+    The known verbs ending with one suffix: children are keyed by the letter
+    before the suffix, ranked are the templates of the verbs, the most common
+    first, and count is the number of verbs
+    """
+
+    __slots__ = ("children", "ranked", "count")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "SuffixTrieNode"] = {}
+        self.ranked: Tuple[Tuple[str, int], ...] = ()
+        self.count = 0
+
+
+class SuffixMatch:
+    """
+    The longest suffix of a verb shared with known verbs, the most common
+    template of those verbs (ties broken by name), the number of them with
+    that template (support) and the number of them (count)
+    """
+
+    def __init__(self, suffix: str, template: str, support: int, count: int) -> None:
+        self.suffix = suffix
+        self.template = template
+        self.support = support
+        self.count = count
+
+    @property
+    def score(self) -> float:
+        return self.support / self.count
+
+    def __repr__(self) -> str:
+        return "SuffixMatch({!r}, {!r}, {}, {})".format(
+            self.suffix, self.template, self.support, self.count
+        )
+
+
+class SuffixTriePredictor:
+    """
+    Predicts the template of a verb from the known (infinitive, template)
+    pairs, built at load time in a trie of reversed infinitives
+    (without accents, like the queries of Verbs). The score of a prediction
+    is the share of the verbs with the matched suffix that have the template.
+    Has the prediction methods of TemplatePredictor and InferenceModel but
+    predict_proba.
+    """
+
+    def __init__(
+        self,
+        verb_template_pairs: List[Tuple[str, str]],
+        lang: LangCodeISO639_1,
+    ) -> None:
+        self.lang = lang
+        self._root = SuffixTrieNode()
+        counts: Dict[SuffixTrieNode, Dict[str, int]] = {}
+        for verb, template in verb_template_pairs:
+            node = self._root
+            path = [node]
+            for c in self._get_key(verb):
+                node = node.children.setdefault(c, SuffixTrieNode())
+                path.append(node)
+            for node in path:
+                node_counts = counts.setdefault(node, {})
+                node_counts[template] = node_counts.get(template, 0) + 1
+        for node, node_counts in counts.items():
+            node.ranked = tuple(
+                sorted(node_counts.items(), key=lambda item: (-item[1], item[0]))
+            )
+            node.count = sum(node_counts.values())
+        self.templates = sorted(set(t for _, t in verb_template_pairs))
+        self.metadata: Dict[str, Any] = {
+            "engine": "suffix_trie",
+            "format_version": SUFFIX_TRIE_FORMAT_VERSION,
+            "lang": str(lang),
+            "n_verbs": len(verb_template_pairs),
+            "n_templates": len(self.templates),
+            "n_nodes": len(counts),
+        }
+
+    @staticmethod
+    def _get_key(verb: str) -> str:
+        return strip_accents(verb.lower())[::-1]
+
+    def _find_node(self, verb: str) -> Tuple[SuffixTrieNode, int]:
+        """The node of the longest known suffix of verb and its length"""
+        node = self._root
+        depth = 0
+        for c in self._get_key(verb):
+            child = node.children.get(c)
+            if child is None:
+                break
+            node = child
+            depth += 1
+        return node, depth
+
+    def match(self, verb: str) -> Optional[SuffixMatch]:
+        """None if there are no known verbs"""
+        node, depth = self._find_node(verb)
+        if not node.ranked:
+            return None
+        template, support = node.ranked[0]
+        suffix = strip_accents(verb.lower())
+        return SuffixMatch(suffix[len(suffix) - depth :], template, support, node.count)
+
+    def predict(self, verb: str) -> Tuple[str, float]:
+        node, _ = self._find_node(verb)
+        template, support = node.ranked[0]
+        return template, support / node.count
+
+    def predict_many(self, verbs: List[str]) -> List[Tuple[str, float]]:
+        return [self.predict(verb) for verb in verbs]
+
+    def predict_topk(self, verb: str, k: int) -> List[Tuple[str, float]]:
+        """
+        The k most common templates of the verbs with the longest suffix, then
+        of the verbs with shorter suffixes if there are fewer than k
+        """
+        path = [self._root]
+        for c in self._get_key(verb):
+            child = path[-1].children.get(c)
+            if child is None:
+                break
+            path.append(child)
+        ret: List[Tuple[str, float]] = []
+        seen = set()
+        for node in reversed(path):
+            for template, support in node.ranked:
+                if len(ret) >= k:
+                    return ret
+                if template not in seen:
+                    seen.add(template)
+                    ret.append((template, support / node.count))
+        return ret
+
+    def predict_topk_many(
+        self, verbs: List[str], k: int
+    ) -> List[List[Tuple[str, float]]]:
+        return [self.predict_topk(verb, k) for verb in verbs]
+
+
+class SuffixTriePrefilter:
+    """
+    Predicts templates with the SuffixTriePredictor where it is reliable, i.e.
+    when at least min_support known verbs share the matched suffix and they
+    all have the same template, and with predictor (the ML model) otherwise.
+    The verbs left to the ML model are predicted in one batch.
+    """
+
+    def __init__(
+        self, prefilter: SuffixTriePredictor, predictor: Any, min_support: int
+    ) -> None:
+        self.prefilter = prefilter
+        self.predictor = predictor
+        self.min_support = min_support
+        self.metadata: Dict[str, Any] = dict(
+            predictor.metadata,
+            prefilter=dict(prefilter.metadata, min_support=min_support),
+        )
+
+    @property
+    def templates(self) -> List[str]:
+        return self.predictor.templates
+
+    def predict(self, verb: str) -> Tuple[str, float]:
+        return self.predict_many([verb])[0]
+
+    def predict_many(self, verbs: List[str]) -> List[Tuple[str, float]]:
+        ret: List[Optional[Tuple[str, float]]] = []
+        rest = []
+        for i, verb in enumerate(verbs):
+            m = self.prefilter.match(verb)
+            if m is not None and m.support >= self.min_support and m.score == 1.0:
+                ret.append((m.template, m.score))
+            else:
+                ret.append(None)
+                rest.append(i)
+        if rest:
+            for i, prediction in zip(
+                rest, self.predictor.predict_many([verbs[i] for i in rest])
+            ):
+                ret[i] = prediction
+        return cast(List[Tuple[str, float]], ret)
+
+    def predict_topk(self, verb: str, k: int) -> List[Tuple[str, float]]:
+        return self.predictor.predict_topk(verb, k)
+
+    def predict_topk_many(
+        self, verbs: List[str], k: int
+    ) -> List[List[Tuple[str, float]]]:
+        return self.predictor.predict_topk_many(verbs, k)
@@ -7,19 +7,76 @@ try:
 except ImportError:
     import xml.etree.ElementTree as etree
 from importlib_resources import as_file, files
+from importlib_resources.abc import Traversable
 
 # import gzip
+import json
+import logging
 import os
 
 # import tempfile
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from verbecc.src.defs.types.data.conjugation_template import ConjugationTemplate
-from verbecc.src.defs.types.data.conjugations import Conjugations
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.data.conjugations import Conjugations, LazyConjugations
 from verbecc.src.defs.types.exceptions import ConjugationsParserError
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1
 from verbecc.src.parsers.conjugation_template_parser import ConjugationTemplateParser
-from verbecc.src.parsers.parser import Parser
+from verbecc.src.parsers.parser import Parser, release_element
+from verbecc.src.parsers import snapshot
+from verbecc.src.utils.file_utils import sha256_file
+
+logger = logging.getLogger(__name__)
+
+VALIDATED_CHECKSUMS_FILENAME = "validated-checksums.json"
+
+
+def load_validated_checksums() -> Dict[str, str]:
+    """
+    Returns a map of conjugations XML filename to the SHA-256 the file
+    had when it was DTD-validated at build time (see validate-verb-xml).
+    """
+    source = files("verbecc.data.xml.conjugations").joinpath(
+        VALIDATED_CHECKSUMS_FILENAME
+    )
+    try:
+        with as_file(source) as fp:
+            with open(fp, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_validated_checksums(
+    checksums: Dict[str, str], path: Optional[str] = None
+) -> None:
+    """
+    Records checksums, merged into the ones already recorded at path,
+    so that validating some of the files keeps the others'.
+
+    :param path: file to write, default is the package's validated-checksums.json,
+        which load_validated_checksums reads
+    """
+    if path is None:
+        source = files("verbecc.data.xml.conjugations").joinpath(
+            VALIDATED_CHECKSUMS_FILENAME
+        )
+        with as_file(source) as fp:
+            _write_validated_checksums(checksums, str(fp))
+    else:
+        _write_validated_checksums(checksums, path)
+
+
+def _write_validated_checksums(checksums: Dict[str, str], path: str) -> None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checksums = {**json.load(f), **checksums}
+    except (OSError, ValueError):
+        pass
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(checksums, f, indent=4, sort_keys=True)
+        f.write("\n")
 
 
 class ConjugationsParser(Parser):
@@ -27,47 +84,93 @@ class ConjugationsParser(Parser):
         self.lang = lang
 
     def parse(self) -> Conjugations:
-        templates: List[ConjugationTemplate] = []
-        parser = etree.XMLParser(
-            dtd_validation=True, encoding="utf-8", remove_blank_text=True, remove_comments=True  # type: ignore
-        )
-        source = files("verbecc.data.xml.conjugations").joinpath(
+        with as_file(self._get_source()) as fp:
+            if config.lazy_templates:
+                sources = snapshot.load_or_parse(
+                    f"conjugations-index-{self.lang}", str(fp), self._index_xml
+                )
+                return LazyConjugations(self.lang, sources, self._parse_template)
+            templates = snapshot.load_or_parse(
+                f"conjugations-{self.lang}", str(fp), self._parse_xml
+            )
+        return Conjugations(self.lang, templates)
+
+    def validate(self) -> str:
+        """
+        Fully DTD-validates the conjugations XML file and returns its SHA-256,
+        which is recorded at build time so that config.xml_validation="checksum"
+        can skip DTD validation at runtime.
+        """
+        with as_file(self._get_source()) as fp:
+            for _ in self._iter_templates(str(fp), dtd_validation=True):
+                pass
+            return sha256_file(str(fp))
+
+    def _get_source(self) -> Traversable:
+        return files("verbecc.data.xml.conjugations").joinpath(
             f"conjugations-{self.lang}.xml"
         )
-        with as_file(source) as fp:
-            """
-            with gzip.open(fp, "rt") as zf:
-                with tempfile.NamedTemporaryFile(
-                    prefix=f"/tmp/conjugations-{lang}.xml.out.",
-                    suffix=".xml",
-                    mode="wt+",
-                    encoding="utf-8",
-                    delete=True,
-                ) as tf:
-                    next(zf)  # Skips the first line (gzip header plus xml header)
-                    # Regenerate xml header
-                    tf.write('<?xml version="1.0" encoding="utf-8"?>' + os.linesep)
-                    for line in zf:
-                        # there are some null bytes at the end that must be stripped
-                        for byte in line:
-                            if not byte.endswith("\x00"):
-                                tf.write(byte)
-                    tf.flush()
-                    tree = etree.parse(
-                        tf.name,
-                        parser,  # type: ignore
-                    )
-            """
-            tree = etree.parse(fp, parser)  # type: ignore
-            root = tree.getroot()
-            root_tag = "conjugation-{}".format(self.lang)
-            if root.tag != root_tag:
+
+    def _needs_dtd_validation(self, fp: str) -> bool:
+        if config.xml_validation != "checksum":
+            return True
+        checksum = load_validated_checksums().get(os.path.basename(fp))
+        if checksum is not None and checksum == sha256_file(fp):
+            return False
+        logger.warning(
+            "%s does not match its validated checksum, using DTD validation", fp
+        )
+        return True
+
+    def _parse_template(self, source: bytes) -> ConjugationTemplate:
+        """Builds a ConjugationTemplate from a <template> element indexed by _index_xml"""
+        return ConjugationTemplateParser(lang=self.lang).parse(etree.fromstring(source))
+
+    def _parse_xml(self, fp: str) -> List[ConjugationTemplate]:
+        template_parser = ConjugationTemplateParser(lang=self.lang)
+        templates = [template_parser.parse(elem) for elem in self._iter_templates(fp)]
+        return sorted(templates, key=lambda x: x.name)
+
+    def _index_xml(self, fp: str) -> List[Tuple[str, bytes]]:
+        """
+        Returns a list of (template name, serialized <template> element)
+        for LazyConjugations. The whole file is still DTD-validated.
+        """
+        return [
+            (
+                str(elem.get("name")),
+                etree.tostring(elem, encoding="utf-8", with_tail=False),
+            )
+            for elem in self._iter_templates(fp)
+        ]
+
+    def _iter_templates(
+        self, fp: str, dtd_validation: Optional[bool] = None
+    ) -> Iterator[etree._Element]:
+        """
+        Streams the <template> elements with iterparse, so only one template
+        element is held in memory at a time instead of the whole document tree.
+
+        :param dtd_validation: default depends on config.xml_validation
+        """
+        if dtd_validation is None:
+            dtd_validation = self._needs_dtd_validation(fp)
+        root_tag = "conjugation-{}".format(self.lang)
+        context = etree.iterparse(
+            fp,
+            events=("end",),
+            tag="template",
+            dtd_validation=dtd_validation,
+            encoding="utf-8",
+            remove_blank_text=True,
+            remove_comments=True,
+        )
+        for _, elem in context:
+            if elem.getparent().tag != root_tag:
                 raise ConjugationsParserError(
                     "Root XML Tag {} Not Found".format(root_tag)
                 )
-            for child in root:
-                if child.tag == "template":
-                    templates.append(
-                        ConjugationTemplateParser(lang=self.lang).parse(child)
-                    )
-        return Conjugations(self.lang, sorted(templates, key=lambda x: x.name))
+            yield elem
+            release_element(elem)
+        if context.root is None or context.root.tag != root_tag:
+            raise ConjugationsParserError("Root XML Tag {} Not Found".format(root_tag))
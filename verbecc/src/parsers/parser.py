@@ -11,3 +11,16 @@ class Parser(ABC):
     @abstractmethod
     def parse(elem: etree._Element) -> Element:
         pass
+
+
+def release_element(elem: etree._Element) -> None:
+    """
+    Frees an element (and any preceding siblings) once it has been
+    converted to Python objects during an iterparse, so that the
+    partially built lxml tree never holds more than one element at a time.
+    """
+    elem.clear(keep_tail=False)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
@@ -0,0 +1,123 @@
+"""
+Binary snapshots of parsed XML data.
+
+Parsing the verbs and conjugations XML files (DTD validation plus
+building thousands of Verb / ConjugationTemplate objects) takes
+a significant amount of time for each language. The first parse of
+each file stores the resulting objects in a pickle in the cache
+directory (see config.cache_dir), keyed by the SHA-256 of the XML file,
+so that subsequent loads only need to unpickle the snapshot.
+
+A snapshot is only used if both its format version and the hash of
+the XML file it was built from match. Increment SNAPSHOT_FORMAT_VERSION
+whenever the parsers or the parsed data types change in a way that
+makes existing snapshots stale.
+"""
+
+import gc
+import logging
+import os
+import pickle
+from typing import Any, Callable, Optional, TypeVar
+
+from verbecc.src.defs.constants import config
+from verbecc.src.utils.file_utils import (
+    atomic_write_bytes,
+    get_cache_dir,
+    sha256_file,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 3
+SNAPSHOT_MAGIC = b"VERBECC-SNAPSHOT\n"
+
+T = TypeVar("T")
+
+
+def get_snapshot_path(name: str, source_sha256: str) -> str:
+    """
+    E.g. name='verbs-fr' -> '<cache_dir>/snapshots/verbs-fr.1f2e3d4c5b6a7980.v1.pickle'
+    """
+    return os.path.join(
+        get_cache_dir(),
+        "snapshots",
+        "{}.{}.v{}.pickle".format(name, source_sha256[:16], SNAPSHOT_FORMAT_VERSION),
+    )
+
+
+def load_snapshot(name: str, source_sha256: str) -> Optional[Any]:
+    """
+    Returns the snapshot data or None if there is no valid snapshot
+    or the cache directory can't be used (e.g. it can't be created)
+    """
+    try:
+        path = get_snapshot_path(name, source_sha256)
+        with open(path, "rb") as f:
+            buf = f.read()
+    except OSError:
+        return None
+    if not buf.startswith(SNAPSHOT_MAGIC):
+        logger.warning("Ignoring snapshot %s: bad header", path)
+        return None
+    # Unpickling creates tens of thousands of small objects; suspending
+    # the cyclic garbage collector meanwhile more than halves the load time.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        snapshot = pickle.loads(buf[len(SNAPSHOT_MAGIC) :])
+    except Exception as ex:
+        logger.warning("Ignoring snapshot %s: %s", path, ex)
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if (
+        snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION
+        or snapshot.get("source_sha256") != source_sha256
+    ):
+        logger.warning("Ignoring snapshot %s: stale", path)
+        return None
+    logger.info("Loaded snapshot %s", path)
+    return snapshot["data"]
+
+
+def save_snapshot(name: str, source_sha256: str, data: Any) -> None:
+    """
+    Failure to write the snapshot (e.g. read-only cache directory)
+    is logged but otherwise ignored.
+    """
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "source_sha256": source_sha256,
+        "name": name,
+        "data": data,
+    }
+    try:
+        path = get_snapshot_path(name, source_sha256)
+        atomic_write_bytes(
+            path,
+            SNAPSHOT_MAGIC + pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        logger.info("Saved snapshot %s", path)
+    except OSError as ex:
+        logger.warning("Unable to save snapshot %s: %s", name, ex)
+
+
+def load_or_parse(name: str, source_path: str, parse: Callable[[str], T]) -> T:
+    """
+    Returns the snapshot of source_path if there is a valid one,
+    otherwise calls parse(source_path) and saves the result as a snapshot.
+
+    :param name: snapshot name, e.g. 'verbs-fr'
+    :param source_path: path of the XML file the snapshot is built from
+    :param parse: function which parses the XML file
+    """
+    if not config.snapshots:
+        return parse(source_path)
+    source_sha256 = sha256_file(source_path)
+    data = load_snapshot(name, source_sha256)
+    if data is None:
+        data = parse(source_path)
+        save_snapshot(name, source_sha256, data)
+    return data
@@ -7,16 +7,28 @@ except ImportError:
 from importlib_resources import as_file, files
 
 # import gzip
+import logging
 import os
 
 # import tempfile
 from typing import List
 
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.types.data.mapped_verbs import (
+    VERB_TABLE_FORMAT_VERSION,
+    MappedVerbs,
+    write_verb_table,
+)
 from verbecc.src.defs.types.data.verb import Verb
 from verbecc.src.defs.types.data.verbs import Verbs
 from verbecc.src.defs.types.exceptions import VerbsParserError
 from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+from verbecc.src.parsers import snapshot
+from verbecc.src.parsers.parser import release_element
 from verbecc.src.parsers.verb_parser import VerbParser
+from verbecc.src.utils.file_utils import get_cache_dir, sha256_file
+
+logger = logging.getLogger(__name__)
 
 
 class VerbsParser:
@@ -24,40 +36,57 @@ class VerbsParser:
         self.lang = lang
 
     def parse(self) -> Verbs:
-        ret: List[Verb] = []
-        parser = etree.XMLParser(encoding="utf-8", remove_blank_text=True, remove_comments=True)  # type: ignore
         source = files("verbecc.data.xml.verbs").joinpath(
             "verbs-{}.xml".format(self.lang)
         )
         with as_file(source) as fp:
-            """
-            with gzip.open(fp, "rt") as zf:
-                with tempfile.NamedTemporaryFile(
-                    prefix=f"/tmp/verbs-{lang}.xml.out.",
-                    suffix=".xml",
-                    mode="wt+",
-                    encoding="utf-8",
-                    delete=True,
-                ) as tf:
-                    next(zf)  # Skips the first line (gzip header plus xml header)
-                    # Regenerate xml header
-                    tf.write('<?xml version="1.0" encoding="utf-8"?>' + os.linesep)
-                    for line in zf:
-                        # there are some null bytes at the end that must be stripped
-                        for byte in line:
-                            if not byte.endswith("\x00"):
-                                tf.write(byte)
-                    tf.flush()
-                    tree = etree.parse(tf.name, parser)  # type: ignore
-            """
-            tree = etree.parse(fp, parser)  # type: ignore
-            root = tree.getroot()
-            root_tag = "verbs-{}".format(self.lang)
-            if root.tag != root_tag:
-                raise VerbsParserError("Root XML Tag {} Not Found".format(root_tag))
-            for child in root:
-                if child.tag == "v":
-                    ret.append(VerbParser().parse(child))  # type: ignore
+            if config.mmap_verbs:
+                try:
+                    return MappedVerbs(self.lang, self._get_verb_table(str(fp)))
+                except OSError as ex:
+                    logger.warning("Unable to map verb table: %s", ex)
+            verbs = snapshot.load_or_parse(
+                "verbs-{}".format(self.lang), str(fp), self._parse_xml
+            )
+        return Verbs(self.lang, verbs)
+
+    def _get_verb_table(self, fp: str) -> str:
+        """Returns the path of the verb table built from fp, building it if necessary"""
+        path = os.path.join(
+            get_cache_dir(),
+            "tables",
+            "verbs-{}.{}.v{}.table".format(
+                self.lang, sha256_file(fp)[:16], VERB_TABLE_FORMAT_VERSION
+            ),
+        )
+        if not os.path.exists(path):
+            verbs = snapshot.load_or_parse(
+                "verbs-{}".format(self.lang), fp, self._parse_xml
+            )
+            write_verb_table(path, verbs)
+        return path
 
-            ret = sorted(ret, key=lambda v: v.infinitive)
-            return Verbs(self.lang, ret)
+    def _parse_xml(self, fp: str) -> List[Verb]:
+        """
+        Streams the <v> elements with iterparse, so only one verb element
+        is held in memory at a time instead of the whole document tree.
+        """
+        ret: List[Verb] = []
+        root_tag = "verbs-{}".format(self.lang)
+        context = etree.iterparse(
+            fp,
+            events=("end",),
+            tag="v",
+            encoding="utf-8",
+            remove_blank_text=True,
+            remove_comments=True,
+        )
+        verb_parser = VerbParser()
+        for _, elem in context:
+            if elem.getparent().tag != root_tag:
+                raise VerbsParserError("Root XML Tag {} Not Found".format(root_tag))
+            ret.append(verb_parser.parse(elem))
+            release_element(elem)
+        if context.root is None or context.root.tag != root_tag:
+            raise VerbsParserError("Root XML Tag {} Not Found".format(root_tag))
+        return sorted(ret, key=lambda v: v.infinitive)
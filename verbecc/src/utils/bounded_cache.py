@@ -0,0 +1,81 @@
+from collections import OrderedDict
+import threading
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+CACHE_POLICIES = ("lru", "fifo")
+
+
+class BoundedCache(Generic[K, V]):
+    """
+    Thread-safe cache holding at most maxsize entries.
+
+    When full, adding an entry evicts the least recently used one
+    (policy="lru") or the oldest one (policy="fifo").
+    Hits, misses and evictions are counted, see stats().
+    """
+
+    def __init__(self, maxsize: int, policy: str = "lru") -> None:
+        if maxsize <= 0:
+            raise ValueError(f"Invalid cache maxsize {maxsize}")
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Invalid cache policy {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> Optional[V]:
+        """Returns the value of key, or None if it isn't cached"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            if self.policy == "lru":
+                self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            if key in self._entries:
+                if self.policy == "lru":
+                    self._entries.move_to_end(key)
+            elif len(self._entries) >= self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            self._entries[key] = value
+
+    def items(self) -> List[Tuple[K, V]]:
+        """The cached entries, from the first to be evicted to the last"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self) -> None:
+        """Removes all the entries and resets the stats"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
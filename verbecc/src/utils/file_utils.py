@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+import hashlib
+import io
+import os
+import secrets
+import time
+from typing import Dict, Iterator
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+
+from verbecc.src.defs.constants import config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+# Timestamp of the members of the zip files written by zip_bytes,
+# the earliest a zip file can record
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def get_cache_dir() -> str:
+    """
+    Returns the directory used for verbecc's on-disk caches
+    (e.g. parsed XML snapshots), creating it if necessary.
+    See config.cache_dir
+    """
+    os.makedirs(config.cache_dir, exist_ok=True)
+    return config.cache_dir
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return sha256_bytes(f.read())
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """
+    Writes data to a temporary file in the destination directory and then
+    renames it over path, so that concurrent readers (e.g. other worker
+    processes) never observe a partially written file.
+    The file gets the same permissions as one created with open().
+    """
+    dir_name = os.path.dirname(path) or "."
+    os.makedirs(dir_name, exist_ok=True)
+    while True:
+        tmp_path = os.path.join(
+            dir_name,
+            "{}.{}.tmp".format(os.path.basename(path), secrets.token_hex(8)),
+        )
+        try:
+            # like open(), the kernel applies the process umask to 0o666
+            fd = os.open(
+                tmp_path,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                0o666,
+            )
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Holds an exclusive lock on path (created if needed), waiting for any other
+    process or thread holding it, e.g. so that only one process at a time
+    writes a file that others would otherwise write concurrently
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after 10 seconds
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def zip_bytes(members: Dict[str, bytes], compress: bool = False) -> bytes:
+    """
+    Returns a zip file of members, a dict of file name: data, which only
+    depends on members: the members are written in order with a fixed
+    timestamp and permissions, so that the same data gives the same bytes.
+    """
+    buf = io.BytesIO()
+    with ZipFile(buf, mode="w") as zf:
+        for name, data in members.items():
+            info = ZipInfo(name, date_time=ZIP_DATE_TIME)
+            info.compress_type = ZIP_DEFLATED if compress else ZIP_STORED
+            info.external_attr = 0o644 << 16
+            zf.writestr(info, data)
+    return buf.getvalue()
@@ -4,6 +4,8 @@ import unicodedata
 
 
 def strip_accents(s: str) -> str:
+    if s.isascii():
+        return s  # nothing to strip, skip normalizing
     return "".join(
         c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn"
     )
@@ -1,20 +1,248 @@
-from verbecc.src.conjugator.conjugator import Conjugator, SUPPORTED_LANGUAGES
-
-
-def train_models() -> None:
-    print("Begin model training")
-    for i, l in enumerate(SUPPORTED_LANGUAGES.keys()):
-        print(f"Training model {i+1} of {len(SUPPORTED_LANGUAGES.keys())} lang={l}")
-        print("Please be patient, this could take a while...")
-        cg = Conjugator(lang=l)
-        if l == "fr":
-            c = cg.conjugate("etre")
-        elif l == "it":
-            c = cg.conjugate("essere")
-        elif l == "ro":
-            c = cg.conjugate("fi")
-        else:
-            c = cg.conjugate("ser")
-        print(f"lang={l} {c}")
-        print(f"Finished training model lang={l}")
-    print("Model training complete")
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from verbecc.src.defs.constants import config
+from verbecc.src.defs.constants.grammar_defines import SUPPORTED_LANGUAGES
+from verbecc.src.defs.types.lang_code import LangCodeISO639_1
+from verbecc.src.mlconjug.inference import save_inference_model
+from verbecc.src.parsers.conjugations_parser import (
+    ConjugationsParser,
+    save_validated_checksums,
+)
+from verbecc.src.parsers.verbs_parser import VerbsParser
+
+if TYPE_CHECKING:
+    from verbecc.src.mlconjug.mlconjug import Model
+
+
+def train_models(argv: Optional[List[str]] = None) -> None:
+    """
+    Build step: trains, saves and exports the template prediction model of every
+    language, so that conjugators only ever load them (see config.missing_model).
+    The languages are trained in parallel, one process each. The training split
+    and estimators are seeded with mlconjug.MODEL_SEED, so that the same data
+    gives byte-identical models.
+
+    Usage: train-verb-models [--jobs N] [--model-dir DIR] [lang ...]
+    """
+    parser = argparse.ArgumentParser(prog="train-verb-models")
+    _add_langs_argument(parser)
+    _add_model_dir_argument(parser)
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of languages trained at once, defaults to the number of CPUs",
+    )
+    args = parser.parse_args(argv)
+    _set_model_dir(args.model_dir)
+    jobs = min(args.jobs or os.cpu_count() or 1, len(args.langs))
+    print(f"Begin model training of {len(args.langs)} languages, {jobs} at a time")
+    print("Please be patient, this could take a while...")
+    t = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_train_model, l) for l in args.langs]
+        for future in as_completed(futures):
+            lang, metadata, timings = future.result()
+            print(
+                f"Finished training model lang={lang} "
+                + " ".join(f"{phase}={s:.1f}s" for phase, s in timings.items())
+                + f" {metadata}"
+            )
+    print(f"Model training complete in {time.perf_counter() - t:.1f}s")
+
+
+def _train_model(
+    lang: LangCodeISO639_1,
+) -> Tuple[LangCodeISO639_1, Dict[str, Any], Dict[str, float]]:
+    """
+    Trains, saves and exports the model of lang.
+    Returns (lang, model metadata, seconds taken by each phase).
+    """
+    from verbecc.src.mlconjug import mlconjug
+
+    t = time.perf_counter()
+    verbs = VerbsParser(lang).parse()
+    pairs = [(v.infinitive, v.template) for v in verbs]
+    timings = {"parse": time.perf_counter() - t}
+    model = mlconjug.train_model(lang, pairs)
+    timings.update(model.timings)
+    t = time.perf_counter()
+    _save_model(model)
+    timings["save"] = time.perf_counter() - t
+    return lang, model.metadata, timings
+
+
+def _save_model(model: "Model") -> None:
+    """
+    Saves and exports model, holding its lock so that a conjugator training
+    the same model at the same time doesn't interleave its files with these
+    """
+    from verbecc.src.mlconjug import mlconjug
+
+    with mlconjug.lock_model(model.lang):
+        mlconjug.save_model(model)
+        save_inference_model(mlconjug.export_model(model))
+
+
+def _add_model_dir_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--model-dir",
+        default=None,
+        help="directory the models are saved to, see config.model_dir",
+    )
+
+
+def _set_model_dir(model_dir: Optional[str]) -> None:
+    if model_dir:
+        config.model_dir = model_dir
+        # For the worker processes, which may not be forked from this one
+        os.environ["VERBECC_MODEL_DIR"] = model_dir
+
+
+def _add_langs_argument(parser: argparse.ArgumentParser) -> None:
+    """The languages to build, all by default"""
+    parser.add_argument(
+        "langs",
+        nargs="*",
+        type=_parse_lang,
+        default=list(SUPPORTED_LANGUAGES.keys()),
+        metavar="lang",
+    )
+
+
+def _parse_lang(value: str) -> LangCodeISO639_1:
+    # Not argparse choices, which rejects the default list with nargs="*"
+    if value not in SUPPORTED_LANGUAGES:
+        raise argparse.ArgumentTypeError(
+            f"invalid lang {value}, choose from {', '.join(SUPPORTED_LANGUAGES)}"
+        )
+    return LangCodeISO639_1(value)
+
+
+def update_models(argv: Optional[List[str]] = None) -> None:
+    """
+    Build step: brings the saved models up to date with the verbs files in
+    seconds, by folding the verbs added or re-templated since each model was
+    built into it (see mlconjug.update_model). A model is rebuilt from
+    scratch instead, like with train-verb-models, if:
+    - it is missing or doesn't have the verbs it was built from
+    - a verb has a template the model doesn't know
+    - it has been updated --rebuild-every times since it was built
+    - the update lowers its held-out accuracy by more than
+      --max-accuracy-drop below the accuracy it was built with
+
+    Usage: update-verb-models [--rebuild-every N] [--max-accuracy-drop X]
+        [--model-dir DIR] [lang ...]
+    """
+    parser = argparse.ArgumentParser(prog="update-verb-models")
+    _add_langs_argument(parser)
+    _add_model_dir_argument(parser)
+    parser.add_argument("--rebuild-every", type=int, default=10)
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.005)
+    args = parser.parse_args(argv)
+    _set_model_dir(args.model_dir)
+    for lang in args.langs:
+        print(
+            _update_model(lang, args.rebuild_every, args.max_accuracy_drop),
+            flush=True,
+        )
+
+
+def _update_model(
+    lang: LangCodeISO639_1, rebuild_every: int, max_accuracy_drop: float
+) -> str:
+    """Updates or rebuilds the model of lang, returns what was done"""
+    from verbecc.src.mlconjug import mlconjug
+
+    model = mlconjug.load_model(lang)
+    verbs = mlconjug.load_model_verbs(lang) if model else None
+    if model is None or verbs is None:
+        return _rebuild_model(lang, "no saved model verbs")
+    model.trained_pairs, model.updated_pairs = verbs
+    pairs = [(v.infinitive, v.template) for v in VerbsParser(lang).parse()]
+    new_pairs = mlconjug.get_new_verb_template_pairs(model, pairs)
+    if not new_pairs:
+        return f"Model lang={lang} is up to date"
+    if model.metadata.get("n_updates", 0) >= rebuild_every:
+        return _rebuild_model(lang, f"{rebuild_every} updates since built")
+    try:
+        mlconjug.update_model(model, new_pairs)
+    except ValueError as ex:
+        return _rebuild_model(lang, str(ex))
+    accuracy = model.metadata["accuracy"]
+    trained_accuracy = model.metadata["trained_accuracy"]
+    if (
+        accuracy is not None
+        and trained_accuracy is not None
+        and accuracy < trained_accuracy - max_accuracy_drop
+    ):
+        return _rebuild_model(
+            lang,
+            f"held-out accuracy {accuracy:.4f} after update, "
+            f"built with {trained_accuracy:.4f}",
+        )
+    _save_model(model)
+    return (
+        f"Updated model lang={lang} with {len(new_pairs)} verbs "
+        f"in {model.timings['update']:.1f}s, held-out accuracy {accuracy}"
+    )
+
+
+def _rebuild_model(lang: LangCodeISO639_1, reason: str) -> str:
+    print(f"Rebuilding model lang={lang}: {reason}", flush=True)
+    _, metadata, timings = _train_model(lang)
+    return f"Rebuilt model lang={lang} in {sum(timings.values()):.1f}s {metadata}"
+
+
+def export_models(argv: Optional[List[str]] = None) -> None:
+    """
+    Exports the trained models for the NumPy inference engine
+    (see config.ml_engine), without retraining them
+
+    Usage: export-verb-models [--model-dir DIR] [lang ...]
+    """
+    from verbecc.src.mlconjug import mlconjug
+
+    parser = argparse.ArgumentParser(prog="export-verb-models")
+    _add_langs_argument(parser)
+    _add_model_dir_argument(parser)
+    args = parser.parse_args(argv)
+    _set_model_dir(args.model_dir)
+    for l in args.langs:
+        model = mlconjug.load_model(l)
+        if model is None:
+            print(f"No trained model lang={l}, run train-verb-models")
+            continue
+        with mlconjug.lock_model(l):
+            save_inference_model(mlconjug.export_model(model))
+        print(f"Exported model lang={l}")
+
+
+def validate_xml(argv: Optional[List[str]] = None) -> None:
+    """
+    Build step: DTD-validates the conjugations XML files and records their
+    checksums, so that at runtime config.xml_validation="checksum" only needs
+    to verify the checksum instead of re-validating the unchanged files.
+    The checksums of the languages not validated are kept.
+
+    Usage: validate-verb-xml [--output PATH] [lang ...]
+    """
+    parser = argparse.ArgumentParser(prog="validate-verb-xml")
+    _add_langs_argument(parser)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="file the checksums are saved to, defaults to the package's "
+        "validated-checksums.json",
+    )
+    args = parser.parse_args(argv)
+    checksums = {}
+    for lang in args.langs:
+        print(f"Validating conjugations-{lang}.xml")
+        checksums[f"conjugations-{lang}.xml"] = ConjugationsParser(lang).validate()
+    save_validated_checksums(checksums, args.output)
+    print("Validated checksums saved")